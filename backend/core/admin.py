@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse, path
-from django.http import HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseRedirect
+from django.conf import settings
 from django.contrib import messages
 from django.shortcuts import render
 from .models import (
@@ -9,12 +10,14 @@ from .models import (
     LocalizedElement, Category, Tag, Archive, TextWidget, Comment, EmailLog
 )
 from .tasks import send_newsletter_task, send_test_newsletter_task
+from .comment_pipeline import moderate_comments
+from .utils.locks import newsletter_send_lock
 import re
 
 
 @admin.register(Newsletter)
 class NewsletterAdmin(admin.ModelAdmin):
-    list_display = ['title', 'subject', 'status', 'published', 'available_in_english', 'available_in_spanish', 'sent_at', 'published_at', 'featured_image_preview', 'preview_link', 'created_at']
+    list_display = ['title', 'subject', 'status', 'published', 'available_in_english', 'available_in_spanish', 'scheduled_send_at', 'sent_at', 'published_at', 'featured_image_preview', 'preview_link', 'created_at']
     list_filter = ['status', 'published', 'category', 'tags', 'available_in_english', 'available_in_spanish', 'created_at', 'published_at', 'sent_at']
     search_fields = ['title', 'subject', 'content', 'slug', 'category__name__english', 'tags__name__english']
     prepopulated_fields = {'slug': ('title',)}
@@ -22,7 +25,7 @@ class NewsletterAdmin(admin.ModelAdmin):
     date_hierarchy = 'published_at'
     actions = ['delete_selected', 'send_newsletter', 'send_test_newsletter']
     list_per_page = 25
-    readonly_fields = ['send_key', 'sent_at', 'created_at', 'updated_at', 'published_at']
+    readonly_fields = ['send_key', 'sent_at', 'prewarmed_at', 'created_at', 'updated_at', 'published_at']
     
     fieldsets = (
         ('Basic Information', {
@@ -44,7 +47,7 @@ class NewsletterAdmin(admin.ModelAdmin):
             'fields': ('featured_image',)
         }),
         ('Sending Information', {
-            'fields': ('send_key', 'sent_at'),
+            'fields': ('scheduled_send_at', 'prewarmed_at', 'send_key', 'sent_at'),
             'classes': ('collapse',)
         }),
     )
@@ -93,6 +96,10 @@ class NewsletterAdmin(admin.ModelAdmin):
             messages.warning(request, "This newsletter has already been sent.")
             return
         
+        if newsletter_send_lock(newsletter.send_key).is_locked():
+            messages.warning(request, "This newsletter is already being sent.")
+            return
+        
         # Queue the task
         send_newsletter_task.delay(newsletter.send_key)
         messages.success(request, f"Newsletter '{newsletter.title}' has been queued for sending.")
@@ -118,6 +125,12 @@ class NewsletterAdmin(admin.ModelAdmin):
         messages.success(request, f"Test newsletter '{newsletter.title}' has been queued for sending to {admin_email}.")
     
     send_test_newsletter.short_description = "Send test newsletter to admin"
+    
+    def save_model(self, request, obj, form, change):
+        """Restart the pre-warm phase when the scheduled send time changes"""
+        if 'scheduled_send_at' in form.changed_data:
+            obj.prewarmed_at = None
+        super().save_model(request, obj, form, change)
 
     def get_urls(self):
         """Add custom URLs for admin actions"""
@@ -138,6 +151,12 @@ class NewsletterAdmin(admin.ModelAdmin):
             messages.error(request, "Newsletter not found.")
             return HttpResponseRedirect(reverse('admin:core_newsletter_changelist'))
         
+        # Sent newsletters have a stored rendering; show it as-is
+        if newsletter.sent_at:
+            rendered = newsletter.rendered_emails.first()
+            if rendered is not None:
+                return HttpResponse(rendered.html)
+        
         # Create dummy unsubscribe and view URLs for preview
         dummy_unsub = "#preview-unsubscribe"
         dummy_view = f"{settings.PUBLIC_FRONTEND_URL}{settings.NEWSLETTER_VIEW_PATH}/{newsletter.slug}"
@@ -164,10 +183,10 @@ class NewsletterAdmin(admin.ModelAdmin):
 
 @admin.register(EmailLog)
 class EmailLogAdmin(admin.ModelAdmin):
-    list_display = ['newsletter', 'recipient', 'status', 'provider_message_id', 'created_at']
+    list_display = ['newsletter', 'recipient', 'status', 'provider_message_id', 'delivered_at', 'opened_at', 'created_at']
     list_filter = ['status', 'created_at', 'newsletter']
     search_fields = ['newsletter__title', 'recipient__email', 'provider_message_id']
-    readonly_fields = ['newsletter', 'recipient', 'status', 'provider_message_id', 'error', 'created_at']
+    readonly_fields = ['newsletter', 'recipient', 'status', 'provider_message_id', 'error', 'delivered_at', 'opened_at', 'created_at']
     date_hierarchy = 'created_at'
     list_per_page = 50
     
@@ -206,7 +225,7 @@ class PodcastEpisodeAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Media', {
-            'fields': ('facebook_url', 'youtube_url', 'spotify_url', 'cover_image')
+            'fields': ('facebook_url', 'youtube_url', 'spotify_url', 'cover_image', 'audio_url', 'audio_size')
         }),
         ('Metadata', {
             'fields': ('duration',),
@@ -289,10 +308,11 @@ def generate_slug(text):
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'name_id', 'slug', 'count', 'is_active', 'created_at']
+    list_display = ['name', 'name_id', 'slug', 'count', 'count_english', 'count_spanish', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['name__english', 'name__spanish', 'slug']
-    list_editable = ['count', 'is_active']
+    list_editable = ['is_active']
+    readonly_fields = ['count', 'count_english', 'count_spanish']
     list_per_page = 25
     
     def name_id(self, obj):
@@ -332,7 +352,8 @@ class ArchiveAdmin(admin.ModelAdmin):
     list_display = ['month', 'year', 'count', 'is_active', 'created_at']
     list_filter = ['is_active', 'year', 'month', 'created_at']
     search_fields = ['year', 'month']
-    list_editable = ['count', 'is_active']
+    list_editable = ['is_active']
+    readonly_fields = ['count']
     list_per_page = 25
     
     def get_month_display(self, obj):
@@ -387,20 +408,37 @@ class TextWidgetAdmin(admin.ModelAdmin):
     image_preview.short_description = "Image"
 
 
+class LikelySpamFilter(admin.SimpleListFilter):
+    """Split comments on the COMMENT_SPAM_THRESHOLD spam score"""
+    title = "likely spam"
+    parameter_name = 'likely_spam'
+
+    def lookups(self, request, model_admin):
+        return [('yes', "Yes"), ('no', "No")]
+
+    def queryset(self, request, queryset):
+        threshold = getattr(settings, 'COMMENT_SPAM_THRESHOLD', 5)
+        if self.value() == 'yes':
+            return queryset.filter(spam_score__gte=threshold)
+        if self.value() == 'no':
+            return queryset.filter(spam_score__lt=threshold)
+        return queryset
+
+
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     """Admin interface for Comment model"""
     list_display = [
         'author_name', 'content_preview', 'content_type', 'content_title',
-        'created_at', 'is_approved'
+        'created_at', 'spam_score', 'is_approved'
     ]
     list_filter = [
-        'is_approved', 'created_at', 'podcast_episode', 'newsletter'
+        'is_approved', LikelySpamFilter, 'created_at', 'podcast_episode', 'newsletter'
     ]
     search_fields = [
         'author_name', 'author_email', 'content', 'podcast_episode__title', 'newsletter__title'
     ]
-    readonly_fields = ['created_at']
+    readonly_fields = ['created_at', 'spam_score']
     list_editable = ['is_approved']
     actions = ['approve_comments', 'reject_comments']
     
@@ -413,7 +451,7 @@ class CommentAdmin(admin.ModelAdmin):
             'description': 'Comment must be associated with either a podcast episode or newsletter'
         }),
         ('Moderation', {
-            'fields': ('is_approved', 'created_at'),
+            'fields': ('is_approved', 'spam_score', 'created_at'),
             'classes': ('collapse',)
         }),
     )
@@ -439,13 +477,13 @@ class CommentAdmin(admin.ModelAdmin):
     
     def approve_comments(self, request, queryset):
         """Approve selected comments"""
-        updated = queryset.update(is_approved=True)
+        updated = moderate_comments(queryset.values_list('id', flat=True), True)
         self.message_user(request, f"{updated} comment(s) were successfully approved.")
     approve_comments.short_description = "Approve selected comments"
     
     def reject_comments(self, request, queryset):
         """Reject selected comments"""
-        updated = queryset.update(is_approved=False)
+        updated = moderate_comments(queryset.values_list('id', flat=True), False)
         self.message_user(request, f"{updated} comment(s) were successfully rejected.")
     reject_comments.short_description = "Reject selected comments"
     
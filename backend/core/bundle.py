@@ -0,0 +1,199 @@
+"""
+Homepage bundle: several public collections in one response
+
+``/api/bundle/?include=newsletters,podcasts,categories,tags`` returns each
+requested collection under its own key instead of one request per
+endpoint. Newsletters and podcast episodes come as a first page (newest
+first, ``page_size``, ``category`` and ``language`` as on their list
+endpoints) with a ``next`` cursor link into that endpoint. Categories,
+tags, archives and text widgets are returned in full.
+
+``fields`` applies to every content collection at once: each one is
+projected onto the requested names its serializer has, and only names no
+included collection knows are rejected.
+
+Categories and tags are loaded once and shared: the same rows fill the
+``categories``/``tags`` collections and the nested category and tags of
+every newsletter and episode in the bundle.
+"""
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.http import urlencode
+from rest_framework.exceptions import ValidationError
+from .fieldsets import FIELDS_PARAM, requested_fields
+from .pagination import encode_cursor, get_page_size
+from .queries import (
+    newsletter_queryset, podcast_episode_queryset, category_queryset, tag_queryset,
+    text_widget_queryset, archive_queryset, filter_content
+)
+from .serializers import (
+    NewsletterListSerializer, PodcastEpisodeListSerializer, CategorySerializer,
+    TagSerializer, ArchiveSerializer, TextWidgetSerializer
+)
+
+INCLUDE_PARAM = 'include'
+
+BUNDLE_COLLECTIONS = ('newsletters', 'podcasts', 'categories', 'tags', 'archives', 'text_widgets')
+
+# collection -> (queryset, serializer, date field of the keyset, list endpoint)
+CONTENT_COLLECTIONS = {
+    'newsletters': (newsletter_queryset, NewsletterListSerializer, 'published_at', 'core:newsletter_list'),
+    'podcasts': (podcast_episode_queryset, PodcastEpisodeListSerializer, 'publish_date', 'core:podcast_episodes_list'),
+}
+
+
+def requested_collections(request):
+    """
+    Return the collection names requested with ?include=, in bundle order
+
+    Every collection is included when the parameter is missing.
+
+    Raises:
+        ValidationError: If an unknown collection was requested
+    """
+    raw = request.query_params.get(INCLUDE_PARAM, '')
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    if not names:
+        return list(BUNDLE_COLLECTIONS)
+    unknown = names - set(BUNDLE_COLLECTIONS)
+    if unknown:
+        raise ValidationError({INCLUDE_PARAM: f"Unknown collection(s): {', '.join(sorted(unknown))}."})
+    return [name for name in BUNDLE_COLLECTIONS if name in names]
+
+
+def content_fields(request, names):
+    """
+    Return {content collection: field names to serialize} for ?fields=
+
+    Raises:
+        ValidationError: If a field belongs to none of the included collections
+    """
+    requested = requested_fields(request)
+    available = {
+        name: set(CONTENT_COLLECTIONS[name][1].Meta.fields)
+        for name in CONTENT_COLLECTIONS if name in names
+    }
+    if not requested or not available:
+        return available
+    unknown = requested - set().union(*available.values())
+    if unknown:
+        raise ValidationError({FIELDS_PARAM: f"Unknown field(s): {', '.join(sorted(unknown))}."})
+    return {name: fields & requested for name, fields in available.items()}
+
+
+def _content_page(name, request, page_size, fields):
+    """Return (rows, next link) for the first keyset page of a content list"""
+    queryset_fn, serializer_class, date_field, url_name = CONTENT_COLLECTIONS[name]
+    # Same column projection as the list endpoint (see SparseFieldsetViewMixin)
+    columns = serializer_class.get_columns(fields) | {date_field, 'category'}
+    queryset = (
+        filter_content(queryset_fn(), request.query_params)
+        .select_related(None)
+        .prefetch_related(None)
+        .only(*columns)
+        .order_by(f'-{date_field}', '-id')
+    )
+    rows = list(queryset[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    params = {
+        key: request.query_params[key]
+        for key in ('category', 'language') if request.query_params.get(key)
+    }
+    params['cursor'] = encode_cursor([getattr(last, date_field).isoformat(), last.id])
+    params['page_size'] = page_size
+    return rows, f"{reverse(url_name)}?{urlencode(params)}"
+
+
+def _tag_links(model, rows):
+    """Return {content id: [tag ids]} read from the tags through table"""
+    field = model._meta.get_field('tags')
+    source, target = field.m2m_column_name(), field.m2m_reverse_name()
+    links = {row.id: [] for row in rows}
+    if links:
+        through = field.remote_field.through.objects.filter(**{f'{source}__in': list(links)})
+        for content_id, tag_id in through.values_list(source, target):
+            links[content_id].append(tag_id)
+    return links
+
+
+def _shared(queryset, needed_ids, include_active):
+    """Load the rows content needs, plus every active row if listed too"""
+    if not needed_ids and not include_active:
+        return []
+    condition = Q(id__in=needed_ids)
+    if include_active:
+        condition |= Q(is_active=True)
+    return list(queryset.filter(condition))
+
+
+def _attach_tags(row, tags):
+    # Fill the cache prefetch_related('tags') would, so obj.tags.all() runs no query
+    queryset = row.tags.all()
+    queryset._result_cache = tags
+    queryset._prefetch_done = True
+    row._prefetched_objects_cache = {'tags': queryset}
+
+
+def build_bundle(request, names):
+    """
+    Build the bundle payload for the requested collections
+
+    Args:
+        request: DRF request (filters, page_size and serializer context)
+        names: Collection names from requested_collections
+
+    Returns:
+        Dict of collection name to serialized data
+    """
+    context = {'request': request}
+    page_size = get_page_size(request)
+
+    pages = {}
+    tag_links = {}
+    for name, fields in content_fields(request, names).items():
+        rows, next_link = _content_page(name, request, page_size, fields)
+        pages[name] = (rows, next_link)
+        if rows:
+            tag_links[name] = _tag_links(type(rows[0]), rows)
+
+    content_rows = [row for rows, _ in pages.values() for row in rows]
+    category_ids = {row.category_id for row in content_rows if row.category_id}
+    tag_ids = {tag_id for links in tag_links.values() for ids in links.values() for tag_id in ids}
+    categories = _shared(category_queryset(), category_ids, 'categories' in names)
+    tags = _shared(tag_queryset(), tag_ids, 'tags' in names)
+
+    categories_by_id = {category.id: category for category in categories}
+    tag_order = {tag.id: index for index, tag in enumerate(tags)}
+    tags_by_id = {tag.id: tag for tag in tags}
+    for name, (rows, _) in pages.items():
+        for row in rows:
+            if row.category_id:
+                row.category = categories_by_id[row.category_id]
+            row_tag_ids = sorted(tag_links[name][row.id], key=tag_order.__getitem__)
+            _attach_tags(row, [tags_by_id[tag_id] for tag_id in row_tag_ids])
+
+    data = {}
+    for name in names:
+        if name in pages:
+            rows, next_link = pages[name]
+            serializer_class = CONTENT_COLLECTIONS[name][1]
+            data[name] = {
+                'next': next_link,
+                'results': serializer_class(rows, many=True, context=context).data,
+            }
+        elif name == 'categories':
+            active = [category for category in categories if category.is_active]
+            data[name] = CategorySerializer(active, many=True, context=context).data
+        elif name == 'tags':
+            active = [tag for tag in tags if tag.is_active]
+            data[name] = TagSerializer(active, many=True, context=context).data
+        elif name == 'archives':
+            data[name] = ArchiveSerializer(archive_queryset(), many=True, context=context).data
+        elif name == 'text_widgets':
+            widgets = text_widget_queryset().filter(is_active=True).order_by('order')
+            data[name] = TextWidgetSerializer(widgets, many=True, context=context).data
+    return data
@@ -0,0 +1,246 @@
+"""
+Versioned response cache for the public read endpoints
+
+Each content model has a version counter in the cache. Cached responses
+are keyed on the request plus the current versions of every model they
+were built from, so bumping a counter (see core.signals) makes the old
+entries unreachable immediately without scanning or deleting keys.
+"""
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers, quote_etag
+)
+from django.utils.http import http_date
+
+VERSION_KEY_PREFIX = 'content-version'
+RESPONSE_KEY_PREFIX = 'api-response'
+CHANGED_AT_KEY_PREFIX = 'content-changed-at'
+
+_MISSING = object()
+
+
+def _version_key(model):
+    return f"{VERSION_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+def _changed_at_key(model):
+    return f"{CHANGED_AT_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+def _initial_version():
+    # Seed from the clock so a counter lost to eviction never restarts at
+    # a value that older cached responses were keyed on
+    return int(time.time() * 1000)
+
+
+def get_content_versions(models):
+    """
+    Return the current version of each model in one cache round trip
+
+    Args:
+        models: Iterable of model classes
+
+    Returns:
+        Dict mapping model label to version number, or None if a version
+        cannot be read (cache unreachable or disabled)
+    """
+    keys = {_version_key(model): model._meta.label_lower for model in models}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, _initial_version(), None)
+        versions[key] = cache.get(key)
+        if versions[key] is None:
+            return None
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def bump_content_version(model):
+    """
+    Invalidate every cached response built from a model and record when
+    it changed (used for Last-Modified)
+
+    Writers call it through transaction.on_commit: bumping before the
+    commit lets a concurrent reader cache the old rows under the new
+    version.
+
+    Args:
+        model: Model class whose rows changed
+    """
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+    cache.set(_changed_at_key(model), time.time(), None)
+
+
+def get_or_compute(key, compute, timeout, lock_timeout=10, wait_timeout=2.0, poll_interval=0.05):
+    """
+    Return a cached value, letting only one caller compute it on a miss
+
+    Concurrent callers that miss while another one holds the compute lock
+    poll for its result instead of all hitting the database at once; if it
+    does not appear within wait_timeout they compute it themselves.
+
+    Args:
+        key: Cache key of the value
+        compute: Callable producing the value
+        timeout: Cache timeout for the value in seconds
+        lock_timeout: Lifetime of the compute lock in seconds
+        wait_timeout: How long a waiting caller polls before computing
+        poll_interval: Delay between polls in seconds
+
+    Returns:
+        The cached or freshly computed value
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f"{key}:compute-lock"
+    if cache.add(lock_key, 1, lock_timeout):
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+    return compute()
+
+
+def get_content_changed_at(models):
+    """
+    Return when each model last changed, as recorded by bump_content_version
+
+    A change time lost to eviction is restarted at the current time, so it
+    never moves backwards past a Last-Modified already served.
+
+    Args:
+        models: Iterable of model classes
+
+    Returns:
+        Dict mapping model label to a Unix timestamp, or None if a change
+        time cannot be read
+    """
+    keys = {_changed_at_key(model): model._meta.label_lower for model in models}
+    changed_at = cache.get_many(keys)
+    for key in keys.keys() - changed_at.keys():
+        cache.add(key, time.time(), None)
+        changed_at[key] = cache.get(key)
+        if changed_at[key] is None:
+            return None
+    return {keys[key]: value for key, value in changed_at.items()}
+
+
+class CachedResponseMixin:
+    """
+    Cache rendered GET responses keyed on content versions
+
+    Views set ``cache_models`` to every model their response is built
+    from. A hit returns the stored bytes without touching the database
+    or the serializer. Responses carry an ETag derived from the same
+    versions and a Last-Modified from the models' change times, so
+    revalidating clients get a 304 without a body. When the versions
+    cannot be read the response is neither cached nor revalidated early;
+    it gets an ETag of its body and no Last-Modified.
+    """
+    cache_models = ()
+
+    def get_response_cache_key(self, request, versions):
+        query = sorted((key, request.GET.getlist(key)) for key in request.GET)
+        raw = f"{request.path}|{query}|{sorted(versions.items())}"
+        return f"{RESPONSE_KEY_PREFIX}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    def get_last_modified(self):
+        """
+        Return the latest change to any model this response is built from
+
+        Uses the change times recorded by bump_content_version, which moves
+        with every version bump (saves, deletes and rollup UPDATEs alike).
+        Returns None if they cannot be read.
+        """
+        changed_at = get_content_changed_at(self.cache_models)
+        if not changed_at:
+            return None
+        return int(max(changed_at.values()))
+
+    def _not_modified(self, request, etag, last_modified):
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            self._set_validators(response, etag, last_modified)
+        return response
+
+    def _set_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept'])
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not self.cache_models:
+            return super().dispatch(request, *args, **kwargs)
+
+        versions = get_content_versions(self.cache_models)
+        if versions is None:
+            return self._dispatch_uncached(request, *args, **kwargs)
+        cache_key = self.get_response_cache_key(request, versions)
+        etag = quote_etag(cache_key.rsplit(':', 1)[1][:32])
+
+        cached = cache.get(cache_key)
+        if cached is not None:
+            content, content_type, last_modified = cached
+            not_modified = self._not_modified(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            response = HttpResponse(content, content_type=content_type)
+            self._set_validators(response, etag, last_modified)
+            return response
+
+        # The ETag is known before any query runs; a matching
+        # If-None-Match needs neither the database nor the serializer
+        if request.META.get('HTTP_IF_NONE_MATCH'):
+            not_modified = self._not_modified(request, etag, None)
+            if not_modified is not None:
+                return not_modified
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            if hasattr(response, 'render'):
+                response.render()
+            last_modified = self.get_last_modified()
+            self._set_validators(response, etag, last_modified)
+            cache.set(
+                cache_key,
+                (response.content, response['Content-Type'], last_modified),
+                getattr(settings, 'API_RESPONSE_CACHE_TIMEOUT', 300)
+            )
+            not_modified = self._not_modified(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+        return response
+
+    def _dispatch_uncached(self, request, *args, **kwargs):
+        # Without versions a version-derived ETag would never change, so
+        # validate against the rendered body instead
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            if hasattr(response, 'render'):
+                response.render()
+            etag = quote_etag(hashlib.md5(response.content).hexdigest())
+            self._set_validators(response, etag, None)
+            not_modified = self._not_modified(request, etag, None)
+            if not_modified is not None:
+                return not_modified
+        return response
@@ -0,0 +1,91 @@
+"""
+Cache backends
+
+FailSafeRedisCache is Django's RedisCache that degrades to a cache miss
+when Redis is unreachable instead of failing the request. After an error
+it stops talking to Redis for a short back-off so a dead server does not
+add a connect timeout to every cache call.
+"""
+import logging
+import time
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.redis import RedisCache
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+logger = logging.getLogger(__name__)
+
+REDIS_ERRORS = (RedisConnectionError, RedisTimeoutError)
+
+
+class FailSafeRedisCache(RedisCache):
+    """
+    RedisCache that treats an unavailable server as an empty cache
+
+    Extra OPTIONS:
+        RETRY_AFTER: Seconds to skip Redis after a connection error (default 5)
+    """
+
+    def __init__(self, server, params):
+        params = dict(params)
+        options = dict(params.get('OPTIONS', {}))
+        self._retry_after = options.pop('RETRY_AFTER', 5)
+        params['OPTIONS'] = options
+        super().__init__(server, params)
+        self._down_until = 0.0
+
+    def _is_down(self):
+        return time.monotonic() < self._down_until
+
+    def _mark_down(self, exc):
+        self._down_until = time.monotonic() + self._retry_after
+        logger.warning("Redis cache unavailable, falling back to no cache for %ss: %s", self._retry_after, exc)
+
+    def _call(self, method, fallback, *args, **kwargs):
+        if self._is_down():
+            return fallback
+        try:
+            return getattr(super(), method)(*args, **kwargs)
+        except REDIS_ERRORS as exc:
+            self._mark_down(exc)
+            return fallback
+
+    def get(self, key, default=None, version=None):
+        return self._call('get', default, key, default, version)
+
+    def get_many(self, keys, version=None):
+        return self._call('get_many', {}, keys, version)
+
+    def has_key(self, key, version=None):
+        return self._call('has_key', False, key, version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('set', None, key, value, timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # Report success while down so add()-based locks let callers proceed
+        return self._call('add', True, key, value, timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('touch', False, key, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._call('set_many', list(data), data, timeout, version)
+
+    def delete(self, key, version=None):
+        return self._call('delete', False, key, version)
+
+    def delete_many(self, keys, version=None):
+        return self._call('delete_many', None, keys, version)
+
+    def incr(self, key, delta=1, version=None):
+        # Behave like a missing key, which callers already handle
+        if self._is_down():
+            raise ValueError("Key '%s' not found" % key)
+        try:
+            return super().incr(key, delta, version)
+        except REDIS_ERRORS as exc:
+            self._mark_down(exc)
+            raise ValueError("Key '%s' not found" % key)
+
+    def clear(self):
+        return self._call('clear', False)
@@ -0,0 +1,218 @@
+"""
+Asynchronous ingest and moderation of public comments
+
+Submissions are validated on the request, stored as CommentSubmission
+rows and acknowledged with 202. The tasks.process_comment_queue beat
+task drains the queue with drain_comment_submissions, in batches:
+normalize, drop duplicates, score each comment for spam, then insert the
+rest as pending comments with one bulk INSERT. Likely spam is kept for the moderator, flagged by its score. Admin
+approve/reject actions go through moderate_comments in batches as well.
+"""
+import re
+from collections import Counter
+from django.conf import settings
+from django.db import transaction
+from .models import Comment, CommentSubmission, Newsletter, PodcastEpisode, comment_fingerprint, normalize_email
+from .rollups import refresh_comment_counts
+
+
+# Words that almost only show up in comment spam
+SPAM_KEYWORDS = (
+    'viagra', 'cialis', 'casino', 'betting', 'payday', 'loan', 'crypto', 'bitcoin', 'forex',
+    'seo services', 'backlinks', 'buy now', 'click here', 'free money', 'work from home',
+)
+_SPAM_KEYWORD_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, SPAM_KEYWORDS)) + r')\b')
+_LINK_RE = re.compile(r'https?://|www\.', re.IGNORECASE)
+_TAG_RE = re.compile(r'<\s*/?\s*[a-z][^>]*>', re.IGNORECASE)
+_REPEAT_RE = re.compile(r'(.)\1{5,}')
+
+
+def normalize_comment(payload):
+    """
+    Return the canonical comment fields of a queued submission
+
+    Args:
+        payload: Dict of submitted fields (content, author_name, author_email,
+            author_website, newsletter, podcast_episode)
+
+    Returns:
+        Dict of Comment field values, or None if the submission is unusable
+    """
+    if not isinstance(payload, dict):
+        return None
+    content = "\n".join(" ".join(line.split()) for line in str(payload.get('content') or '').strip().splitlines())
+    author_name = " ".join(str(payload.get('author_name') or '').split())
+    author_email = normalize_email(payload.get('author_email'))
+    website = (payload.get('author_website') or '').strip() or None
+    if website and not website.startswith(('http://', 'https://')):
+        website = 'https://' + website
+    newsletter_id = payload.get('newsletter')
+    podcast_episode_id = payload.get('podcast_episode')
+
+    if not 10 <= len(content) <= 2000 or len(author_name) < 2 or not author_email:
+        return None
+    if bool(newsletter_id) == bool(podcast_episode_id):
+        return None
+    return {
+        'content': content,
+        'author_name': author_name[:100],
+        'author_email': author_email,
+        'author_website': website,
+        'newsletter_id': newsletter_id,
+        'podcast_episode_id': podcast_episode_id,
+    }
+
+
+def spam_score(fields, submissions_from_ip=1):
+    """
+    Score how spam-like a normalized comment is (higher is worse)
+
+    Args:
+        fields: Result of normalize_comment
+        submissions_from_ip: Submissions from the same client in the batch
+    """
+    content = fields['content']
+    lowered = content.lower()
+    score = 0
+    links = len(_LINK_RE.findall(content))
+    score += 1 if links == 1 else 3 if links > 1 else 0
+    if links and fields['author_website']:
+        score += 1
+    # Whole words only: 'loan' must not match "loaned"
+    score += 2 * len(set(_SPAM_KEYWORD_RE.findall(lowered)))
+    if _TAG_RE.search(content):
+        score += 2
+    letters = [char for char in content if char.isalpha()]
+    if len(letters) >= 20 and sum(char.isupper() for char in letters) / len(letters) > 0.6:
+        score += 2
+    if _REPEAT_RE.search(content):
+        score += 1
+    if submissions_from_ip > 3:
+        score += 2
+    return score
+
+
+def process_comment_submissions(submissions):
+    """
+    Turn a batch of queued submissions into pending comments
+
+    Submissions are normalized and duplicates (within the batch or of
+    stored comments) are dropped. The rest are inserted as pending comments
+    with one bulk INSERT, each carrying its spam score; comments scoring at
+    least COMMENT_SPAM_THRESHOLD are counted as likely spam.
+
+    Args:
+        submissions: Iterable of (payload, client_ip) pairs
+
+    Returns:
+        Dict with the number of comments created, of those flagged as
+        likely spam, and of submissions dropped per reason
+    """
+    stats = {'created': 0, 'invalid': 0, 'duplicate': 0, 'spam': 0}
+    threshold = getattr(settings, 'COMMENT_SPAM_THRESHOLD', 5)
+
+    normalized = []
+    for payload, client_ip in submissions:
+        fields = normalize_comment(payload)
+        if fields is None:
+            stats['invalid'] += 1
+        else:
+            normalized.append((fields, client_ip))
+
+    # Content deleted or unpublished since it was submitted
+    live_targets = {
+        'newsletter_id': set(Newsletter.objects.filter(
+            published=True, id__in=[fields['newsletter_id'] for fields, _ in normalized if fields['newsletter_id']]
+        ).values_list('id', flat=True)),
+        'podcast_episode_id': set(PodcastEpisode.objects.filter(
+            published=True, id__in=[fields['podcast_episode_id'] for fields, _ in normalized if fields['podcast_episode_id']]
+        ).values_list('id', flat=True)),
+    }
+    for fields, _ in normalized:
+        fields['fingerprint'] = comment_fingerprint(
+            fields['newsletter_id'], fields['podcast_episode_id'], fields['author_email'], fields['content']
+        )
+    existing = set(Comment.objects.filter(
+        fingerprint__in=[fields['fingerprint'] for fields, _ in normalized]
+    ).values_list('fingerprint', flat=True))
+    per_ip = Counter(client_ip for _, client_ip in normalized if client_ip)
+
+    comments = []
+    for fields, client_ip in normalized:
+        target_field = 'newsletter_id' if fields['newsletter_id'] else 'podcast_episode_id'
+        if fields[target_field] not in live_targets[target_field]:
+            stats['invalid'] += 1
+            continue
+        if fields['fingerprint'] in existing:
+            stats['duplicate'] += 1
+            continue
+        existing.add(fields['fingerprint'])
+        score = spam_score(fields, per_ip[client_ip] if client_ip else 1)
+        if score >= threshold:
+            stats['spam'] += 1
+        comments.append(Comment(spam_score=score, is_approved=False, **fields))
+
+    # bulk_create skips Comment.save() and its full_clean(): the fields
+    # were validated on submit and normalized above
+    Comment.objects.bulk_create(comments)
+    stats['created'] = len(comments)
+    return stats
+
+
+def drain_comment_submissions(batch_size=500):
+    """
+    Process queued comment submissions in batches until the queue is empty
+
+    Args:
+        batch_size: Number of queued submissions claimed per transaction
+
+    Returns:
+        Dict with the totals of process_comment_submissions plus the
+        number of submissions consumed
+    """
+    totals = Counter()
+    while True:
+        with transaction.atomic():
+            batch = list(
+                CommentSubmission.objects.select_for_update(skip_locked=True)
+                .order_by('id')
+                .values_list('id', 'payload', 'client_ip')[:batch_size]
+            )
+            if not batch:
+                break
+
+            totals.update(process_comment_submissions(
+                (payload, client_ip) for _, payload, client_ip in batch
+            ))
+            CommentSubmission.objects.filter(id__in=[submission_id for submission_id, _, _ in batch]).delete()
+
+        totals['processed'] += len(batch)
+        if len(batch) < batch_size:
+            break
+
+    return dict(totals)
+
+
+def moderate_comments(comment_ids, approved, batch_size=500):
+    """
+    Approve or reject comments in batches, refreshing the stored counts
+
+    Each batch is one UPDATE plus one count refresh per affected table.
+
+    Args:
+        comment_ids: Iterable of Comment IDs
+        approved: True to approve, False to reject
+        batch_size: Number of comments updated per statement
+
+    Returns:
+        Number of comments updated
+    """
+    comment_ids = list(comment_ids)
+    updated = 0
+    for start in range(0, len(comment_ids), batch_size):
+        with transaction.atomic():
+            batch = Comment.objects.filter(id__in=comment_ids[start:start + batch_size])
+            targets = list(batch.values_list('newsletter_id', 'podcast_episode_id'))
+            updated += batch.update(is_approved=approved)
+            refresh_comment_counts(targets)
+    return updated
@@ -21,4 +21,12 @@ class EmailProvider(ABC):
         Returns:
             Provider message ID
         """
-        raise NotImplementedError 
\ No newline at end of file
+        raise NotImplementedError
+
+    def warm_up(self) -> None:
+        """
+        Open connections to the provider ahead of a send
+
+        Optional; providers without connection setup cost can keep the no-op.
+        """
+        return None
@@ -3,16 +3,22 @@ from .base import EmailProvider
 from .postmark import PostmarkProvider
 
 
+# Providers are reused within a worker process so their HTTP connections stay open
+_providers = {}
+
+
 def get_email_provider() -> EmailProvider:
     """
     Get email provider based on EMAIL_PROVIDER setting
     
     Returns:
-        EmailProvider instance
+        EmailProvider instance (shared per process)
     """
     provider_name = settings.EMAIL_PROVIDER.lower()
     
-    if provider_name == 'postmark':
-        return PostmarkProvider()
-    else:
-        raise ValueError(f"Unsupported email provider: {provider_name}") 
\ No newline at end of file
+    if provider_name not in _providers:
+        if provider_name == 'postmark':
+            _providers[provider_name] = PostmarkProvider()
+        else:
+            raise ValueError(f"Unsupported email provider: {provider_name}")
+    return _providers[provider_name] 
\ No newline at end of file
@@ -10,6 +10,19 @@ class PostmarkProvider(EmailProvider):
     def __init__(self):
         self.client = PostmarkClient(server_token=settings.EMAIL_API_KEY)
 
+    def warm_up(self) -> None:
+        """
+        Establish the HTTPS keep-alive connection to Postmark
+
+        Fetches the server details, which opens the pooled connection the
+        client session reuses for subsequent sends.
+        """
+        try:
+            self.client.server.get()
+        except Exception as e:
+            # Warm-up is best effort; the send path reconnects on demand
+            print(f"Postmark warm-up error: {e}")
+
     def send(self, *, to: str, subject: str, html: str, text: str, from_email: str, reply_to: Optional[str] = None) -> str:
         """
         Send email via Postmark
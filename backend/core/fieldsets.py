@@ -0,0 +1,102 @@
+"""
+Sparse fieldsets (?fields=) for the content endpoints
+
+``?fields=id,title,slug`` limits the serialized output to those fields
+and turns into ``.only()`` on the queryset, so columns (in particular the
+large rich-text ones) that no requested field reads are never loaded.
+Without the parameter the full serializer output is returned, still
+loading only the columns its fields read.
+"""
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+
+
+def requested_fields(request):
+    """
+    Return the set of field names requested with ?fields=, or None
+
+    Args:
+        request: DRF request (or None)
+    """
+    if request is None:
+        return None
+    raw = request.query_params.get(FIELDS_PARAM, '')
+    names = {name.strip() for name in raw.split(',') if name.strip()}
+    return names or None
+
+
+class SparseFieldsetMixin:
+    """
+    ModelSerializer mixin that drops fields not named in ?fields=
+
+    ``field_columns`` maps computed fields to the model columns they read;
+    fields that are model columns themselves need no entry. Fields whose
+    value comes from an annotation list it in ``field_annotations``.
+    """
+    field_columns = {}
+    field_annotations = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = requested_fields(self.context.get('request'))
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+    @classmethod
+    def select_fields(cls, requested):
+        """
+        Validate ?fields= against this serializer
+
+        Returns:
+            The requested field names, or every field when none were requested
+
+        Raises:
+            ValidationError: If an unknown field was requested
+        """
+        available = set(cls.Meta.fields)
+        if not requested:
+            return available
+        unknown = requested - available
+        if unknown:
+            raise ValidationError({FIELDS_PARAM: f"Unknown field(s): {', '.join(sorted(unknown))}."})
+        return requested
+
+    @classmethod
+    def get_columns(cls, field_names):
+        """Return the model columns needed to serialize the given fields"""
+        model_fields = {field.name for field in cls.Meta.model._meta.concrete_fields}
+        columns = set()
+        for name in field_names:
+            if name in cls.field_columns:
+                columns.update(cls.field_columns[name])
+            elif name in model_fields:
+                columns.add(name)
+        return columns
+
+
+class SparseFieldsetViewMixin:
+    """
+    View mixin applying the serializer's column projection to the queryset
+
+    ``required_columns`` are always loaded (e.g. the cursor pagination key).
+    Relations are only joined or prefetched when a requested field uses them.
+    """
+    required_columns = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        fields = serializer_class.select_fields(requested_fields(self.request))
+
+        columns = serializer_class.get_columns(fields) | set(self.required_columns)
+        if 'category' not in columns:
+            queryset = queryset.select_related(None)
+        if 'tags' not in fields:
+            queryset = queryset.prefetch_related(None)
+        for name in fields:
+            annotations = serializer_class.field_annotations.get(name)
+            if annotations:
+                queryset = queryset.annotate(**annotations)
+        return queryset.only(*columns)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.cache import bump_content_version
+from core.models import Newsletter, PodcastEpisode
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored plain-text title, snippet, word count and reading time for newsletters and podcast episodes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows written per bulk update'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model in (Newsletter, PodcastEpisode):
+            updated = 0
+            batch = []
+            for instance in model.objects.order_by('pk').iterator(chunk_size=batch_size):
+                instance.update_derived_text()
+                batch.append(instance)
+                if len(batch) >= batch_size:
+                    model.objects.bulk_update(batch, model.DERIVED_TEXT_FIELDS)
+                    updated += len(batch)
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, model.DERIVED_TEXT_FIELDS)
+                updated += len(batch)
+            # bulk_update sends no signals; invalidate cached API responses here
+            transaction.on_commit(lambda model=model: bump_content_version(model))
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ Updated derived text for {updated} {model._meta.verbose_name_plural}'
+            ))
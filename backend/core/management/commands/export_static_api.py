@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from core.static_export import export_static_api
+
+
+class Command(BaseCommand):
+    help = 'Pre-render every public API response to static JSON files (see core.static_export)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--root',
+            help='Target directory (default: settings.STATIC_EXPORT_ROOT)'
+        )
+
+    def handle(self, *args, **options):
+        written, removed = export_static_api(options['root'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Exported {written} files ({removed} stale removed)'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.rollups import rebuild_archives
+
+
+class Command(BaseCommand):
+    help = 'Recompute archive (year, month) counts from published newsletters and podcast episodes'
+
+    def handle(self, *args, **options):
+        updated = rebuild_archives()
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt archives ({updated} created or updated)'))
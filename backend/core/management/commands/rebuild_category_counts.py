@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.rollups import rebuild_category_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored category counts (total and per language) from published content'
+
+    def handle(self, *args, **options):
+        updated = rebuild_category_counts()
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt counts for {updated} categories'))
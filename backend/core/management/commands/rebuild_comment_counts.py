@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.rollups import rebuild_comment_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored approved comment counts of newsletters and podcast episodes'
+
+    def handle(self, *args, **options):
+        updated = rebuild_comment_counts()
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt comment counts for {updated} items'))
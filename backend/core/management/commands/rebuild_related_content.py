@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.related import refresh_related_content
+
+
+class Command(BaseCommand):
+    help = 'Recompute previous/next and related items of published newsletters and podcast episodes'
+
+    def handle(self, *args, **options):
+        changed = refresh_related_content()
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt related content ({changed} rows created, updated or deleted)'))
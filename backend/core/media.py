@@ -0,0 +1,187 @@
+"""
+Production serving of uploaded media files
+
+Replaces django.views.static.serve for MEDIA_URL:
+
+* ETag/Last-Modified from the file's stat, so revalidation is a 304
+* Cache-Control: a year and ``immutable`` for content-hashed file names
+  (``cover.3f2a9c1b.jpg``), MEDIA_MAX_AGE for everything else
+* Single byte ranges (206/416), honouring If-Range
+* MEDIA_SERVE_MODE ``x-accel-redirect`` (nginx) or ``x-sendfile``
+  (Apache/lighttpd) hands the transfer to the front server; otherwise
+  the file is streamed through FileResponse, which WSGI servers with
+  ``wsgi.file_wrapper`` (gunicorn) send with zero-copy sendfile()
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# 8-64 lowercase hex characters right before the extension, at least one
+# of them a letter, mark a content hash; all-digit runs are usually dates
+# (IMG_20240101.jpg) that a later upload may reuse
+HASHED_NAME_RE = re.compile(r'[._-](?=[0-9]*[a-f])[0-9a-f]{8,64}\.[A-Za-z0-9]+$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class RangeFile:
+    """
+    File object limited to one byte range
+
+    Keeps fileno() so gunicorn can sendfile() the range: it starts at the
+    descriptor's current offset and sends Content-Length bytes.
+    """
+
+    def __init__(self, path, start, length):
+        self.name = path
+        self._file = open(path, 'rb', buffering=0)
+        self._file.seek(start)
+        self._remaining = length
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        self._file.close()
+
+
+def parse_range(header, size):
+    """
+    Parse a Range header against a file size
+
+    Args:
+        header: Range header value, e.g. 'bytes=0-499'
+        size: File size in bytes
+
+    Returns:
+        (start, end) inclusive, None to serve the whole file (absent,
+        malformed or multi-range headers), or False if unsatisfiable
+    """
+    units, _, spec = (header or '').partition('=')
+    if units.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, dash, last = spec.strip().partition('-')
+    if not dash:
+        return None
+    try:
+        if first == '':
+            suffix = int(last)
+            if suffix <= 0:
+                return False
+            start, end = max(0, size - suffix), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else start
+            if start < 0 or end < start:
+                return None
+            if start >= size:
+                return False
+            end = min(end, size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if size == 0:
+        return False
+    return start, end
+
+
+def _range_applies(request, etag, last_modified):
+    """If-Range: only serve a range of the representation the client has"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _set_validators(response, path, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    if HASHED_NAME_RE.search(os.path.basename(path)):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=getattr(settings, 'MEDIA_MAX_AGE', 3600))
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a file below MEDIA_ROOT
+
+    Args:
+        request: GET or HEAD request
+        path: Path relative to MEDIA_ROOT
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Invalid media path")
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404("Media file not found")
+    if not os.path.isfile(full_path):
+        raise Http404("Media file not found")
+
+    size = stat.st_size
+    last_modified = int(stat.st_mtime)
+    etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return _set_validators(not_modified, path, etag, last_modified)
+
+    mode = getattr(settings, 'MEDIA_SERVE_MODE', '')
+    if mode == 'x-accel-redirect':
+        # nginx serves the internal location, including Range requests
+        prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(path.lstrip('/'))
+        return _set_validators(response, path, etag, last_modified)
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = full_path
+        return _set_validators(response, path, etag, last_modified)
+
+    byte_range = None
+    if 'HTTP_RANGE' in request.META and _range_applies(request, etag, last_modified):
+        byte_range = parse_range(request.META['HTTP_RANGE'], size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return _set_validators(response, path, etag, last_modified)
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    elif byte_range:
+        response = FileResponse(RangeFile(full_path, start, length), content_type=content_type)
+    else:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    response.block_size = STREAM_BLOCK_SIZE
+    if byte_range:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = length
+    return _set_validators(response, path, etag, last_modified)
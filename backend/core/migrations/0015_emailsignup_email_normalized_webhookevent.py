@@ -0,0 +1,50 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:41
+
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def populate_email_normalized(apps, schema_editor):
+    """Backfill the normalized email column for existing signups"""
+    EmailSignup = apps.get_model('core', 'EmailSignup')
+    EmailSignup.objects.update(email_normalized=Lower(Trim('email')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_add_send_key_unique_constraint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(default='postmark', max_length=20)),
+                ('payload', models.TextField(help_text='Raw request body as received from the provider')),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Webhook Event',
+                'verbose_name_plural': 'Webhook Events',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='delivered_at',
+            field=models.DateTimeField(blank=True, help_text='When the provider reported delivery', null=True),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='opened_at',
+            field=models.DateTimeField(blank=True, help_text='When the recipient first opened the email', null=True),
+        ),
+        migrations.AddField(
+            model_name='emailsignup',
+            name='email_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, help_text='Lower-cased email used for case-insensitive lookups', max_length=254),
+        ),
+        migrations.RunPython(populate_email_normalized, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_emailsignup_email_normalized_webhookevent'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emaillog',
+            name='provider_message_id',
+            field=models.CharField(blank=True, db_index=True, help_text="Provider's message ID", max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='emaillog',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('sent', 'Sent'), ('delivered', 'Delivered'), ('bounced', 'Bounced'), ('failed', 'Failed')], default='queued', max_length=20),
+        ),
+    ]
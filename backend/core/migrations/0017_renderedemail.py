@@ -0,0 +1,30 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_emaillog_provider_message_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderedEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(help_text='Content hash of the rendered HTML', max_length=64)),
+                ('html_gzip', models.BinaryField(help_text='Gzip-compressed browser version of the email')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('newsletter', models.ForeignKey(help_text='Newsletter this rendering belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='rendered_emails', to='core.newsletter')),
+            ],
+            options={
+                'verbose_name': 'Rendered Email',
+                'verbose_name_plural': 'Rendered Emails',
+                'ordering': ['-created_at', '-id'],
+                'unique_together': {('newsletter', 'version')},
+            },
+        ),
+    ]
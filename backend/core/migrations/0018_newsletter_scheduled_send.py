@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_renderedemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsletter',
+            name='prewarmed_at',
+            field=models.DateTimeField(blank=True, help_text='When preparation of the scheduled send started', null=True),
+        ),
+        migrations.AddField(
+            model_name='newsletter',
+            name='scheduled_send_at',
+            field=models.DateTimeField(blank=True, help_text='When the newsletter should be sent automatically', null=True),
+        ),
+    ]
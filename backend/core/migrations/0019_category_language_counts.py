@@ -0,0 +1,48 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:48
+
+from django.db import migrations, models
+
+
+def rebuild_category_counts(apps, schema_editor):
+    Category = apps.get_model('core', 'Category')
+    Newsletter = apps.get_model('core', 'Newsletter')
+    PodcastEpisode = apps.get_model('core', 'PodcastEpisode')
+    for category in Category.objects.all():
+        newsletters = Newsletter.objects.filter(category=category, published=True)
+        episodes = PodcastEpisode.objects.filter(category=category, published=True)
+        category.count = newsletters.count() + episodes.count()
+        category.count_english = (
+            newsletters.filter(available_in_english=True).count()
+            + episodes.filter(available_in_english=True).count()
+        )
+        category.count_spanish = (
+            newsletters.filter(available_in_spanish=True).count()
+            + episodes.filter(available_in_spanish=True).count()
+        )
+        category.save(update_fields=['count', 'count_english', 'count_spanish'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_newsletter_scheduled_send'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='count_english',
+            field=models.PositiveIntegerField(default=0, help_text='Number of published items available in English'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='count_spanish',
+            field=models.PositiveIntegerField(default=0, help_text='Number of published items available in Spanish'),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of published items in this category (maintained automatically)'),
+        ),
+        migrations.RunPython(rebuild_category_counts, migrations.RunPython.noop),
+    ]
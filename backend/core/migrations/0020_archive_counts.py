@@ -0,0 +1,38 @@
+# Generated by Django 4.2.23 on 2026-10-19 17:50
+
+from collections import Counter
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def rebuild_archives(apps, schema_editor):
+    Archive = apps.get_model('core', 'Archive')
+    Newsletter = apps.get_model('core', 'Newsletter')
+    PodcastEpisode = apps.get_model('core', 'PodcastEpisode')
+    counts = Counter()
+    for published_at in Newsletter.objects.filter(published=True, published_at__isnull=False).values_list('published_at', flat=True):
+        published_at = timezone.localtime(published_at)
+        counts[(published_at.year, published_at.month)] += 1
+    for publish_date in PodcastEpisode.objects.filter(published=True).values_list('publish_date', flat=True):
+        counts[(publish_date.year, publish_date.month)] += 1
+    for archive in Archive.objects.all():
+        archive.count = counts.pop((archive.year, archive.month), 0)
+        archive.save(update_fields=['count'])
+    for (year, month), count in counts.items():
+        Archive.objects.create(year=year, month=month, count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_category_language_counts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archive',
+            name='count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of published items in this month (maintained automatically)'),
+        ),
+        migrations.RunPython(rebuild_archives, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:00
+
+import math
+import re
+from html import unescape
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+# Frozen copies of core.utils.text as of this migration
+
+_BLOCK_BREAK_RE = re.compile(r'<\s*(br|/p|/div|/li|/h[1-6]|/blockquote|/tr)\b[^>]*>', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def plain_text(html):
+    if not html:
+        return ''
+    text = strip_tags(_BLOCK_BREAK_RE.sub(' ', html))
+    return _WHITESPACE_RE.sub(' ', unescape(text)).strip()
+
+
+def make_snippet(text, length):
+    if len(text) <= length:
+        return text
+    limit = max(length - 1, 0)
+    head = text[:limit]
+    if not text[limit].isspace():
+        boundary = max(head.rfind(' '), head.rfind('\n'), head.rfind('\t'))
+        if boundary > 0:
+            head = head[:boundary]
+    return head.rstrip() + '…'
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def reading_time_minutes(word_count):
+    if not word_count:
+        return 0
+    return max(1, math.ceil(word_count / 200))
+
+
+def populate_derived_text(apps, schema_editor):
+    Newsletter = apps.get_model('core', 'Newsletter')
+    PodcastEpisode = apps.get_model('core', 'PodcastEpisode')
+    for newsletter in Newsletter.objects.iterator():
+        newsletter.title_text = make_snippet(plain_text(newsletter.title), 200)
+        newsletter.excerpt_text = make_snippet(plain_text(newsletter.excerpt), 300)
+        newsletter.word_count = count_words(plain_text(newsletter.content))
+        newsletter.reading_time_minutes = reading_time_minutes(newsletter.word_count)
+        newsletter.save(update_fields=['title_text', 'excerpt_text', 'word_count', 'reading_time_minutes'])
+    for episode in PodcastEpisode.objects.iterator():
+        script = plain_text(episode.script)
+        episode.title_text = make_snippet(plain_text(episode.title), 200)
+        episode.script_snippet = make_snippet(script, 200)
+        episode.word_count = count_words(script)
+        episode.reading_time_minutes = reading_time_minutes(episode.word_count)
+        episode.save(update_fields=['title_text', 'script_snippet', 'word_count', 'reading_time_minutes'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_archive_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsletter',
+            name='excerpt_text',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Plain-text excerpt snippet', max_length=300),
+        ),
+        migrations.AddField(
+            model_name='newsletter',
+            name='reading_time_minutes',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Estimated reading time'),
+        ),
+        migrations.AddField(
+            model_name='newsletter',
+            name='title_text',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Title without formatting', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='newsletter',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Words in the content'),
+        ),
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='reading_time_minutes',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Estimated reading time of the script'),
+        ),
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='script_snippet',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Plain-text script preview', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='title_text',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Title without formatting', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Words in the script'),
+        ),
+        migrations.RunPython(populate_derived_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:03
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# (table, (title, summary, body) columns weighted A/B/C)
+SEARCH_TABLES = [
+    ('core_newsletter', ('title', 'excerpt', 'content')),
+    ('core_podcastepisode', ('title', 'description', 'script')),
+]
+LANGUAGES = [('english', 'search_vector_en'), ('spanish', 'search_vector_es')]
+
+
+def _weighted_vector(config, columns):
+    parts = [
+        f"setweight(to_tsvector('{config}', regexp_replace(coalesce(NEW.{column}, ''), '<[^>]+>', ' ', 'g')), '{weight}')"
+        for column, weight in zip(columns, 'ABC')
+    ]
+    return ' || '.join(parts)
+
+
+def create_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, columns in SEARCH_TABLES:
+        assignments = '\n'.join(
+            f"    NEW.{vector_column} := {_weighted_vector(config, columns)};"
+            for config, vector_column in LANGUAGES
+        )
+        schema_editor.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+            {assignments}
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+        """)
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table}")
+        schema_editor.execute(f"""
+            CREATE TRIGGER {table}_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {', '.join(columns)} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+        """)
+        for _, vector_column in LANGUAGES:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{vector_column}_gin ON {table} USING GIN ({vector_column})"
+            )
+        # Fire the trigger once for existing rows
+        schema_editor.execute(f"UPDATE {table} SET title = title")
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, _ in SEARCH_TABLES:
+        for _, vector_column in LANGUAGES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{vector_column}_gin")
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table}")
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_derived_text_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsletter',
+            name='search_vector_en',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='newsletter',
+            name='search_vector_es',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='search_vector_en',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='search_vector_es',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
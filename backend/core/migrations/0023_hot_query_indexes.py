@@ -0,0 +1,57 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_search_vectors'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['newsletter', '-created_at'], name='comment_nl_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['podcast_episode', '-created_at'], name='comment_pod_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailsignup',
+            index=models.Index(condition=models.Q(('bounce', False), ('is_active', True), ('is_subscribed', True)), fields=['-created_at', 'id'], name='emailsignup_audience_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-published_at', '-id'], name='newsletter_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(condition=models.Q(('published', True)), fields=['category', '-published_at'], name='newsletter_pub_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(condition=models.Q(('available_in_spanish', True), ('published', True)), fields=['-published_at', '-id'], name='newsletter_pub_spanish_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['updated_at'], name='newsletter_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='podcastepisode',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-publish_date', '-id'], name='podcast_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='podcastepisode',
+            index=models.Index(condition=models.Q(('published', True)), fields=['category', '-publish_date'], name='podcast_pub_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='podcastepisode',
+            index=models.Index(condition=models.Q(('available_in_spanish', True), ('published', True)), fields=['-publish_date', '-id'], name='podcast_pub_spanish_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='podcastepisode',
+            index=models.Index(fields=['updated_at'], name='podcast_updated_idx'),
+        ),
+    ]
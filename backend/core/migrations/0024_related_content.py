@@ -0,0 +1,96 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:12
+
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of the core.related scoring as of this migration: shared tags
+# score 2 points each, a shared category 1 point
+TAG_WEIGHT = 2
+CATEGORY_WEIGHT = 1
+
+
+def compute_related_content(model, date_field, count):
+    rows = sorted(
+        model.objects.filter(published=True)
+        .exclude(**{f'{date_field}__isnull': True})
+        .values_list(date_field, 'id', 'category_id')
+    )
+    position = {item_id: index for index, (_, item_id, _) in enumerate(rows)}
+
+    tags_field = model._meta.get_field('tags')
+    source, target = tags_field.m2m_column_name(), tags_field.m2m_reverse_name()
+    item_tags = defaultdict(set)
+    tag_items = defaultdict(list)
+    links = tags_field.remote_field.through.objects.filter(**{f'{source}__in': list(position)})
+    for item_id, tag_id in links.values_list(source, target):
+        item_tags[item_id].add(tag_id)
+        tag_items[tag_id].append(item_id)
+    category_items = defaultdict(list)
+    for _, item_id, category_id in rows:
+        if category_id is not None:
+            category_items[category_id].append(item_id)
+
+    computed = {}
+    for index, (_, item_id, category_id) in enumerate(rows):
+        scores = Counter()
+        for tag_id in item_tags[item_id]:
+            for other_id in tag_items[tag_id]:
+                scores[other_id] += TAG_WEIGHT
+        if category_id is not None:
+            for other_id in category_items[category_id]:
+                scores[other_id] += CATEGORY_WEIGHT
+        scores.pop(item_id, None)
+        related = sorted(scores, key=lambda other_id: (-scores[other_id], -position[other_id]))[:count]
+        computed[item_id] = (
+            rows[index - 1][1] if index > 0 else None,
+            rows[index + 1][1] if index + 1 < len(rows) else None,
+            related,
+        )
+    return computed
+
+
+def populate_related_content(apps, schema_editor):
+    RelatedContent = apps.get_model('core', 'RelatedContent')
+    count = getattr(settings, 'RELATED_CONTENT_COUNT', 4)
+    for content_type, model_name, date_field in (
+        ('newsletter', 'Newsletter', 'published_at'),
+        ('podcast', 'PodcastEpisode', 'publish_date'),
+    ):
+        computed = compute_related_content(apps.get_model('core', model_name), date_field, count)
+        # The table is new, so every row is an insert
+        RelatedContent.objects.bulk_create([
+            RelatedContent(
+                content_type=content_type, object_id=object_id,
+                previous_id=previous_id, next_id=next_id, related_ids=related_ids
+            )
+            for object_id, (previous_id, next_id, related_ids) in computed.items()
+        ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedContent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(choices=[('newsletter', 'Newsletter'), ('podcast', 'Podcast episode')], max_length=20)),
+                ('object_id', models.PositiveIntegerField(help_text='Newsletter or podcast episode id')),
+                ('previous_id', models.PositiveIntegerField(blank=True, help_text='Next older item by publication date', null=True)),
+                ('next_id', models.PositiveIntegerField(blank=True, help_text='Next newer item by publication date', null=True)),
+                ('related_ids', models.JSONField(blank=True, default=list, help_text='Most related item ids, best first')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Related Content',
+                'verbose_name_plural': 'Related Content',
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(populate_related_content, migrations.RunPython.noop),
+    ]
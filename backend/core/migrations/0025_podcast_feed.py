@@ -0,0 +1,108 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:16
+
+import datetime
+import mimetypes
+import re
+from html import unescape
+from io import StringIO
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.feedgenerator import rfc2822_date
+from django.utils.html import strip_tags
+from django.utils.xmlutils import SimplerXMLGenerator
+
+# Frozen copy of core.podcast_feed.render_feed_item as of this migration
+
+_BLOCK_BREAK_RE = re.compile(r'<\s*(br|/p|/div|/li|/h[1-6]|/blockquote|/tr)\b[^>]*>', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def plain_text(html):
+    if not html:
+        return ''
+    text = strip_tags(_BLOCK_BREAK_RE.sub(' ', html))
+    return _WHITESPACE_RE.sub(' ', unescape(text)).strip()
+
+
+def _absolute_url(url):
+    if url.startswith(('http://', 'https://')):
+        return url
+    base = getattr(settings, 'BASE_URL', '') or 'http://localhost:8000'
+    return f"{base.rstrip('/')}{url}"
+
+
+def episode_link(slug):
+    base = settings.PUBLIC_FRONTEND_URL.rstrip('/')
+    path = getattr(settings, 'PODCAST_VIEW_PATH', '/podcast').strip('/')
+    return f"{base}/{path}/{slug}"
+
+
+def render_feed_item(episode):
+    out = StringIO()
+    handler = SimplerXMLGenerator(out, 'utf-8', short_empty_elements=True)
+    title = episode.title_text or plain_text(episode.title)
+    summary = plain_text(episode.description)
+
+    handler.startElement('item', {})
+    handler.addQuickElement('title', title)
+    handler.addQuickElement('link', episode_link(episode.slug))
+    handler.addQuickElement('guid', f"podcast-episode-{episode.pk}", {'isPermaLink': 'false'})
+    if episode.publish_date:
+        published = datetime.datetime.combine(episode.publish_date, datetime.time(), tzinfo=datetime.timezone.utc)
+        handler.addQuickElement('pubDate', rfc2822_date(published))
+    handler.addQuickElement('description', episode.description)
+    if episode.audio_url:
+        mime_type = mimetypes.guess_type(episode.audio_url)[0] or 'audio/mpeg'
+        handler.addQuickElement('enclosure', '', {
+            'url': episode.audio_url,
+            'length': str(episode.audio_size or 0),
+            'type': mime_type,
+        })
+    handler.addQuickElement('itunes:title', title)
+    handler.addQuickElement('itunes:summary', summary)
+    if episode.episode_number:
+        handler.addQuickElement('itunes:episode', str(episode.episode_number))
+    if episode.duration:
+        handler.addQuickElement('itunes:duration', episode.duration)
+    if episode.cover_image:
+        try:
+            handler.addQuickElement('itunes:image', '', {'href': _absolute_url(episode.cover_image.url)})
+        except ValueError:
+            pass
+    handler.addQuickElement('itunes:explicit', 'false')
+    handler.endElement('item')
+    return out.getvalue()
+
+
+def render_feed_items(apps, schema_editor):
+    PodcastEpisode = apps.get_model('core', 'PodcastEpisode')
+    episodes = list(PodcastEpisode.objects.all())
+    for episode in episodes:
+        episode.feed_item = render_feed_item(episode)
+    PodcastEpisode.objects.bulk_update(episodes, ['feed_item'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_related_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='audio_size',
+            field=models.PositiveBigIntegerField(default=0, help_text='Size of the audio file in bytes (RSS enclosure length)'),
+        ),
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='audio_url',
+            field=models.URLField(blank=True, help_text='Public URL of the audio file, used as the RSS feed enclosure'),
+        ),
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='feed_item',
+            field=models.TextField(blank=True, default='', editable=False, help_text='RSS feed item XML'),
+        ),
+        migrations.RunPython(render_feed_items, migrations.RunPython.noop),
+    ]
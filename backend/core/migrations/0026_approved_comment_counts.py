@@ -0,0 +1,57 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:19
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_comment_counts(apps, schema_editor):
+    Comment = apps.get_model('core', 'Comment')
+    for model_name, target_field in (('Newsletter', 'newsletter'), ('PodcastEpisode', 'podcast_episode')):
+        counts = (
+            Comment.objects.filter(**{target_field: OuterRef('pk')}, is_approved=True)
+            .order_by()
+            .values(target_field)
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        apps.get_model('core', model_name).objects.update(
+            approved_comment_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_podcast_feed'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_nl_approved_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_pod_approved_idx',
+        ),
+        migrations.AddField(
+            model_name='newsletter',
+            name='approved_comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Approved comments'),
+        ),
+        migrations.AddField(
+            model_name='podcastepisode',
+            name='approved_comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Approved comments'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['newsletter', '-created_at', '-id'], name='comment_nl_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['podcast_episode', '-created_at', '-id'], name='comment_pod_approved_idx'),
+        ),
+        migrations.RunPython(populate_comment_counts, migrations.RunPython.noop),
+    ]
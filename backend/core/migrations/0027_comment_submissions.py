@@ -0,0 +1,57 @@
+# Generated by Django 4.2.23 on 2026-10-19 18:23
+
+import hashlib
+from django.db import migrations, models
+
+
+def comment_fingerprint(newsletter_id, podcast_episode_id, author_email, content):
+    # Frozen copy of core.models.comment_fingerprint as of this migration
+    text = " ".join((content or "").lower().split())
+    email = (author_email or "").strip().lower()
+    raw = f"{newsletter_id}|{podcast_episode_id}|{email}|{text}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def populate_fingerprints(apps, schema_editor):
+    Comment = apps.get_model('core', 'Comment')
+    comments = list(Comment.objects.only('newsletter_id', 'podcast_episode_id', 'author_email', 'content'))
+    for comment in comments:
+        comment.fingerprint = comment_fingerprint(
+            comment.newsletter_id, comment.podcast_episode_id, comment.author_email, comment.content
+        )
+    Comment.objects.bulk_update(comments, ['fingerprint'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_approved_comment_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField(help_text='Validated comment fields as submitted')),
+                ('client_ip', models.GenericIPAddressField(blank=True, null=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Comment Submission',
+                'verbose_name_plural': 'Comment Submissions',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Duplicate detection hash', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='spam_score',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Heuristic spam score'),
+        ),
+        migrations.RunPython(populate_fingerprints, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,16 @@
+import gzip
+import hashlib
 import uuid
 from django.db import models
 from django.utils import timezone
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from ckeditor.fields import RichTextField
+from .utils.text import plain_text, make_snippet, count_words, reading_time_minutes
+from .podcast_feed import FEED_ITEM_SOURCES, render_feed_item
+
+EXCERPT_SNIPPET_LENGTH = 300
+SCRIPT_SNIPPET_LENGTH = 200
 
 
 def get_current_date():
@@ -36,7 +44,9 @@ class Category(models.Model):
         help_text="Localized category name"
     )
     slug = models.SlugField(unique=True, max_length=100)
-    count = models.PositiveIntegerField(default=0, help_text="Number of items in this category")
+    count = models.PositiveIntegerField(default=0, help_text="Number of published items in this category (maintained automatically)")
+    count_english = models.PositiveIntegerField(default=0, help_text="Number of published items available in English")
+    count_spanish = models.PositiveIntegerField(default=0, help_text="Number of published items available in Spanish")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -83,7 +93,7 @@ class Archive(models.Model):
     """Model for archive entries"""
     month = models.PositiveIntegerField(help_text="Month (1-12)")
     year = models.PositiveIntegerField(help_text="Year")
-    count = models.PositiveIntegerField(default=0, help_text="Number of items in this archive")
+    count = models.PositiveIntegerField(default=0, help_text="Number of published items in this month (maintained automatically)")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -154,6 +164,16 @@ class TextWidget(models.Model):
         return None
 
 
+def _update_derived_text_on_save(instance, save_kwargs):
+    """Refresh derived text before save, widening update_fields when its sources change"""
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is None:
+        instance.update_derived_text()
+    elif instance.DERIVED_TEXT_SOURCES & set(update_fields):
+        instance.update_derived_text()
+        save_kwargs['update_fields'] = set(update_fields) | set(instance.DERIVED_TEXT_FIELDS)
+
+
 class Newsletter(models.Model):
     """Model for newsletter articles"""
     STATUS_CHOICES = [
@@ -171,6 +191,8 @@ class Newsletter(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft', help_text="Newsletter status")
     published = models.BooleanField(default=False)
     sent_at = models.DateTimeField(blank=True, null=True, help_text="When newsletter was sent to subscribers")
+    scheduled_send_at = models.DateTimeField(blank=True, null=True, help_text="When the newsletter should be sent automatically")
+    prewarmed_at = models.DateTimeField(blank=True, null=True, help_text="When preparation of the scheduled send started")
     send_key = models.CharField(max_length=50, unique=True, default="", help_text="Unique key for sending operations")
     category = models.ForeignKey(
         Category, 
@@ -195,12 +217,47 @@ class Newsletter(models.Model):
         default=False,
         help_text="Content is available in Spanish"
     )
+    # Plain-text fields derived from the rich text on save (see update_derived_text)
+    title_text = models.CharField(max_length=200, blank=True, default="", editable=False, help_text="Title without formatting")
+    excerpt_text = models.CharField(max_length=EXCERPT_SNIPPET_LENGTH, blank=True, default="", editable=False, help_text="Plain-text excerpt snippet")
+    word_count = models.PositiveIntegerField(default=0, editable=False, help_text="Words in the content")
+    reading_time_minutes = models.PositiveSmallIntegerField(default=0, editable=False, help_text="Estimated reading time")
+    # Maintained from comment changes (see core.rollups.refresh_comment_counts)
+    approved_comment_count = models.PositiveIntegerField(default=0, editable=False, help_text="Approved comments")
+    # Full-text search vectors, maintained by database triggers on PostgreSQL (see core.search)
+    search_vector_en = SearchVectorField(null=True, editable=False)
+    search_vector_es = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(blank=True, null=True)
     
+    # Source fields of the derived plain-text fields
+    DERIVED_TEXT_SOURCES = {'title', 'excerpt', 'content'}
+    DERIVED_TEXT_FIELDS = ['title_text', 'excerpt_text', 'word_count', 'reading_time_minutes']
+    
     class Meta:
         ordering = ['-published_at', '-created_at']
+        # Partial indexes for the public list: published rows newest first,
+        # optionally narrowed to a category or to Spanish content
+        indexes = [
+            models.Index(
+                fields=['-published_at', '-id'],
+                condition=models.Q(published=True),
+                name='newsletter_published_idx'
+            ),
+            models.Index(
+                fields=['category', '-published_at'],
+                condition=models.Q(published=True),
+                name='newsletter_pub_category_idx'
+            ),
+            models.Index(
+                fields=['-published_at', '-id'],
+                condition=models.Q(published=True, available_in_spanish=True),
+                name='newsletter_pub_spanish_idx'
+            ),
+            # Max('updated_at') for the section lastmod in sitemaps.render_index
+            models.Index(fields=['updated_at'], name='newsletter_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -214,8 +271,16 @@ class Newsletter(models.Model):
         elif not self.published:
             self.published_at = None
             self.status = 'draft'
+        _update_derived_text_on_save(self, kwargs)
         super().save(*args, **kwargs)
     
+    def update_derived_text(self):
+        """Recompute the plain-text title, excerpt snippet and reading stats"""
+        self.title_text = make_snippet(plain_text(self.title), 200)
+        self.excerpt_text = make_snippet(plain_text(self.excerpt), EXCERPT_SNIPPET_LENGTH)
+        self.word_count = count_words(plain_text(self.content))
+        self.reading_time_minutes = reading_time_minutes(self.word_count)
+    
     @property
     def featured_image_url(self):
         """Return the featured image URL if available"""
@@ -259,6 +324,8 @@ class PodcastEpisode(models.Model):
     cover_image = models.ImageField(upload_to='podcast_covers/', blank=True, null=True, help_text="Episode cover image")
     episode_number = models.PositiveIntegerField(unique=True, blank=True, null=True, help_text="Episode number (optional)")
     duration = models.CharField(max_length=20, blank=True, help_text="Duration in format: HH:MM:SS")
+    audio_url = models.URLField(blank=True, help_text="Public URL of the audio file, used as the RSS feed enclosure")
+    audio_size = models.PositiveBigIntegerField(default=0, help_text="Size of the audio file in bytes (RSS enclosure length)")
     category = models.ForeignKey(
         Category, 
         on_delete=models.SET_NULL, 
@@ -283,17 +350,77 @@ class PodcastEpisode(models.Model):
         default=False,
         help_text="Content is available in Spanish"
     )
+    # Plain-text fields derived from the rich text on save (see update_derived_text)
+    title_text = models.CharField(max_length=200, blank=True, default="", editable=False, help_text="Title without formatting")
+    script_snippet = models.CharField(max_length=SCRIPT_SNIPPET_LENGTH, blank=True, default="", editable=False, help_text="Plain-text script preview")
+    word_count = models.PositiveIntegerField(default=0, editable=False, help_text="Words in the script")
+    reading_time_minutes = models.PositiveSmallIntegerField(default=0, editable=False, help_text="Estimated reading time of the script")
+    # Maintained from comment changes (see core.rollups.refresh_comment_counts)
+    approved_comment_count = models.PositiveIntegerField(default=0, editable=False, help_text="Approved comments")
+    # Full-text search vectors, maintained by database triggers on PostgreSQL (see core.search)
+    search_vector_en = SearchVectorField(null=True, editable=False)
+    search_vector_es = SearchVectorField(null=True, editable=False)
+    # Pre-rendered RSS <item>, re-rendered when the episode is saved (see core.podcast_feed)
+    feed_item = models.TextField(blank=True, default="", editable=False, help_text="RSS feed item XML")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Source fields of the derived plain-text fields
+    DERIVED_TEXT_SOURCES = {'title', 'script'}
+    DERIVED_TEXT_FIELDS = ['title_text', 'script_snippet', 'word_count', 'reading_time_minutes']
+    
     class Meta:
         ordering = ['-publish_date']
+        # Same shapes as the newsletter indexes, on publish_date
+        indexes = [
+            models.Index(
+                fields=['-publish_date', '-id'],
+                condition=models.Q(published=True),
+                name='podcast_published_idx'
+            ),
+            models.Index(
+                fields=['category', '-publish_date'],
+                condition=models.Q(published=True),
+                name='podcast_pub_category_idx'
+            ),
+            models.Index(
+                fields=['-publish_date', '-id'],
+                condition=models.Q(published=True, available_in_spanish=True),
+                name='podcast_pub_spanish_idx'
+            ),
+            # Max('updated_at') for the section lastmod in sitemaps.render_index
+            models.Index(fields=['updated_at'], name='podcast_updated_idx'),
+        ]
     
     def __str__(self):
         if self.episode_number:
             return f"Episode {self.episode_number}: {self.title}"
         return self.title
     
+    def save(self, *args, **kwargs):
+        _update_derived_text_on_save(self, kwargs)
+        update_fields = kwargs.get('update_fields')
+        creating = self.pk is None
+        if update_fields is None:
+            if not creating:
+                self.feed_item = render_feed_item(self)
+        elif FEED_ITEM_SOURCES & set(update_fields):
+            self.feed_item = render_feed_item(self)
+            kwargs['update_fields'] = set(update_fields) | {'feed_item'}
+        super().save(*args, **kwargs)
+        if creating and update_fields is None:
+            # The item's guid is built from the primary key
+            self.feed_item = render_feed_item(self)
+            PodcastEpisode.objects.filter(pk=self.pk).update(feed_item=self.feed_item)
+    
+    def update_derived_text(self):
+        """Recompute the plain-text title, script snippet and reading stats"""
+        script = plain_text(self.script)
+        self.title_text = make_snippet(plain_text(self.title), 200)
+        self.script_snippet = make_snippet(script, SCRIPT_SNIPPET_LENGTH)
+        self.word_count = count_words(script)
+        self.reading_time_minutes = reading_time_minutes(self.word_count)
+    
     @property
     def cover_image_url(self):
         """Return the cover image URL if available"""
@@ -324,9 +451,54 @@ class PodcastEpisode(models.Model):
         return self.available_in_english and self.available_in_spanish
 
 
+def normalize_email(email):
+    """Return the canonical form of an email address used for lookups"""
+    return (email or "").strip().lower()
+
+
+def comment_fingerprint(newsletter_id, podcast_episode_id, author_email, content):
+    """Return the hash identifying repeated submissions of one comment"""
+    text = " ".join((content or "").lower().split())
+    raw = f"{newsletter_id}|{podcast_episode_id}|{normalize_email(author_email)}|{text}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class RelatedContent(models.Model):
+    """
+    Precomputed neighbours and related items of a published newsletter or
+    podcast episode, embedded in its detail response (see core.related)
+    """
+    CONTENT_TYPE_CHOICES = [
+        ('newsletter', 'Newsletter'),
+        ('podcast', 'Podcast episode'),
+    ]
+    
+    content_type = models.CharField(max_length=20, choices=CONTENT_TYPE_CHOICES)
+    object_id = models.PositiveIntegerField(help_text="Newsletter or podcast episode id")
+    previous_id = models.PositiveIntegerField(blank=True, null=True, help_text="Next older item by publication date")
+    next_id = models.PositiveIntegerField(blank=True, null=True, help_text="Next newer item by publication date")
+    related_ids = models.JSONField(default=list, blank=True, help_text="Most related item ids, best first")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['content_type', 'object_id']
+        verbose_name = "Related Content"
+        verbose_name_plural = "Related Content"
+    
+    def __str__(self):
+        return f"{self.content_type} {self.object_id}"
+
+
 class EmailSignup(models.Model):
     """Model for email newsletter signups"""
     email = models.EmailField(unique=True)
+    email_normalized = models.CharField(
+        max_length=254,
+        db_index=True,
+        editable=False,
+        default="",
+        help_text="Lower-cased email used for case-insensitive lookups"
+    )
     first_name = models.CharField(max_length=100, blank=True)
     last_name = models.CharField(max_length=100, blank=True)
     is_active = models.BooleanField(default=True)
@@ -342,11 +514,23 @@ class EmailSignup(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        # Newsletter send audience (see core.tasks.get_audience)
+        indexes = [
+            models.Index(
+                fields=['-created_at', 'id'],
+                condition=models.Q(is_subscribed=True, bounce=False, is_active=True),
+                name='emailsignup_audience_idx'
+            ),
+        ]
     
     def __str__(self):
         name = f"{self.first_name} {self.last_name}".strip()
         return f"{name} ({self.email})" if name else self.email
     
+    def save(self, *args, **kwargs):
+        self.email_normalized = normalize_email(self.email)
+        super().save(*args, **kwargs)
+    
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
@@ -375,6 +559,9 @@ class Comment(models.Model):
         default=False,
         help_text="Whether this comment has been approved for display"
     )
+    # Set by the ingest pipeline (see core.comment_pipeline)
+    spam_score = models.PositiveSmallIntegerField(default=0, editable=False, help_text="Heuristic spam score")
+    fingerprint = models.CharField(max_length=64, blank=True, default="", editable=False, db_index=True, help_text="Duplicate detection hash")
     
     # Foreign key relationships - only one should be set
     podcast_episode = models.ForeignKey(
@@ -406,6 +593,19 @@ class Comment(models.Model):
                 name='comment_must_belong_to_one_content_type'
             )
         ]
+        # Approved comments of one item, newest first (CommentListView keyset)
+        indexes = [
+            models.Index(
+                fields=['newsletter', '-created_at', '-id'],
+                condition=models.Q(is_approved=True),
+                name='comment_nl_approved_idx'
+            ),
+            models.Index(
+                fields=['podcast_episode', '-created_at', '-id'],
+                condition=models.Q(is_approved=True),
+                name='comment_pod_approved_idx'
+            ),
+        ]
     
     def __str__(self):
         content_type = "Podcast" if self.podcast_episode else "Newsletter"
@@ -430,6 +630,9 @@ class Comment(models.Model):
     
     def save(self, *args, **kwargs):
         self.full_clean()  # Run validation before saving
+        self.fingerprint = comment_fingerprint(
+            self.newsletter_id, self.podcast_episode_id, self.author_email, self.content
+        )
         super().save(*args, **kwargs)
 
 
@@ -438,6 +641,8 @@ class EmailLog(models.Model):
     STATUS_CHOICES = [
         ('queued', 'Queued'),
         ('sent', 'Sent'),
+        ('delivered', 'Delivered'),
+        ('bounced', 'Bounced'),
         ('failed', 'Failed'),
     ]
     
@@ -454,8 +659,10 @@ class EmailLog(models.Model):
         help_text="Recipient of the email"
     )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
-    provider_message_id = models.CharField(max_length=255, blank=True, null=True, help_text="Provider's message ID")
+    provider_message_id = models.CharField(max_length=255, blank=True, null=True, db_index=True, help_text="Provider's message ID")
     error = models.TextField(blank=True, null=True, help_text="Error message if sending failed")
+    delivered_at = models.DateTimeField(blank=True, null=True, help_text="When the provider reported delivery")
+    opened_at = models.DateTimeField(blank=True, null=True, help_text="When the recipient first opened the email")
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -463,4 +670,77 @@ class EmailLog(models.Model):
         unique_together = ['newsletter', 'recipient']
     
     def __str__(self):
-        return f"{self.newsletter.title} -> {self.recipient.email} ({self.status})"
\ No newline at end of file
+        return f"{self.newsletter.title} -> {self.recipient.email} ({self.status})"
+
+
+class RenderedEmail(models.Model):
+    """Final rendered newsletter email stored once per newsletter version"""
+    newsletter = models.ForeignKey(
+        Newsletter,
+        on_delete=models.CASCADE,
+        related_name='rendered_emails',
+        help_text="Newsletter this rendering belongs to"
+    )
+    version = models.CharField(max_length=64, help_text="Content hash of the rendered HTML")
+    html_gzip = models.BinaryField(help_text="Gzip-compressed browser version of the email")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at', '-id']
+        unique_together = ['newsletter', 'version']
+        verbose_name = "Rendered Email"
+        verbose_name_plural = "Rendered Emails"
+    
+    def __str__(self):
+        return f"{self.newsletter.slug} ({self.version[:12]})"
+    
+    @staticmethod
+    def cache_key(slug):
+        """Cache key under which the latest rendering of a newsletter is kept"""
+        return f"rendered_email:{slug}"
+    
+    @classmethod
+    def store(cls, newsletter, html):
+        """Compress and persist the rendered HTML, returning the stored row"""
+        data = html.encode('utf-8')
+        rendered, _ = cls.objects.get_or_create(
+            newsletter=newsletter,
+            version=hashlib.sha256(data).hexdigest(),
+            defaults={'html_gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+        )
+        return rendered
+    
+    @property
+    def html(self):
+        """Return the decompressed HTML"""
+        return gzip.decompress(bytes(self.html_gzip)).decode('utf-8')
+
+
+class CommentSubmission(models.Model):
+    """Validated public comment waiting for the ingest pipeline (see core.comment_pipeline)"""
+    payload = models.JSONField(help_text="Validated comment fields as submitted")
+    client_ip = models.GenericIPAddressField(blank=True, null=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        verbose_name = "Comment Submission"
+        verbose_name_plural = "Comment Submissions"
+    
+    def __str__(self):
+        return f"Comment submission #{self.pk} ({self.received_at})"
+
+
+class WebhookEvent(models.Model):
+    """Raw email provider webhook payload waiting to be processed"""
+    provider = models.CharField(max_length=20, default='postmark')
+    payload = models.TextField(help_text="Raw request body as received from the provider")
+    received_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        verbose_name = "Webhook Event"
+        verbose_name_plural = "Webhook Events"
+    
+    def __str__(self):
+        return f"{self.provider} event #{self.pk} ({self.received_at})"
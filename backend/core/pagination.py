@@ -0,0 +1,199 @@
+"""
+Pagination for the public content list endpoints
+
+Two modes share one response shape:
+
+* page/page_size (default): OFFSET pagination with an exact ``count``,
+  kept for existing clients.
+* cursor: keyset pagination on a (date, id) pair. Every page costs the
+  same regardless of depth and no COUNT(*) runs unless the client asks
+  for ``include_count=true``, in which case a cached total is returned.
+"""
+import base64
+import hashlib
+import json
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from .cache import get_or_compute
+
+DEFAULT_PAGE_SIZE = 6
+
+
+def get_page_size(request, default=DEFAULT_PAGE_SIZE):
+    """Return the requested page size, clamped to 1..API_MAX_PAGE_SIZE"""
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 50)
+    try:
+        page_size = int(request.query_params.get('page_size', default))
+    except (ValueError, TypeError):
+        page_size = default
+    return min(max(1, page_size), max_page_size)
+
+
+def encode_cursor(position, reverse=False):
+    """
+    Encode a keyset position as an opaque URL-safe token
+
+    Args:
+        position: List of JSON-serializable key values (e.g. [date, id])
+        reverse: True for a cursor that walks back towards newer items
+    """
+    payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode a token produced by encode_cursor
+
+    Returns:
+        (position, reverse) tuple
+
+    Raises:
+        ValidationError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        position = payload['p']
+        reverse = bool(payload.get('r'))
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+    if not isinstance(position, list):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+    return position, reverse
+
+
+def cached_count(queryset, request):
+    """
+    Return the row count of a filtered list, cached briefly per filter set
+
+    Args:
+        queryset: Filtered queryset to count
+        request: Request whose filter params identify the list
+    """
+    params = sorted(
+        (key, value) for key, value in request.query_params.items()
+        if key not in ('cursor', 'page', 'page_size', 'include_count')
+    )
+    digest = hashlib.sha256(f"{request.path}?{params}".encode()).hexdigest()
+    return get_or_compute(
+        f"list-count:{digest}",
+        queryset.count,
+        getattr(settings, 'API_COUNT_CACHE_TIMEOUT', 60)
+    )
+
+
+class ContentListPaginationMixin:
+    """
+    Offset or keyset pagination for ListAPIViews of dated content
+
+    Subclasses set ``cursor_ordering`` to the (date field, 'id') pair the
+    keyset walks, newest first, and may override ``default_page_size``.
+    """
+    cursor_ordering = ()
+    default_page_size = DEFAULT_PAGE_SIZE
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor':
+            return self.cursor_list(request, queryset)
+        return self.offset_list(request, queryset)
+
+    def offset_list(self, request, queryset):
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+        except (ValueError, TypeError):
+            page = 1
+        page_size = get_page_size(request, self.default_page_size)
+
+        total_count = queryset.count()
+        start = (page - 1) * page_size
+        end = start + page_size
+
+        def link(target_page):
+            # Keep the filter params (category, content_type, ...) of the request
+            params = request.query_params.copy()
+            params['page'] = target_page
+            params['page_size'] = page_size
+            return f"?{params.urlencode()}"
+
+        serializer = self.get_serializer(queryset[start:end], many=True)
+        return Response({
+            'count': total_count,
+            'next': link(page + 1) if end < total_count else None,
+            'previous': link(page - 1) if page > 1 else None,
+            'results': serializer.data
+        })
+
+    def cursor_list(self, request, queryset):
+        page_size = get_page_size(request, self.default_page_size)
+        date_field, id_field = self.cursor_ordering
+        token = request.query_params.get('cursor')
+        position, reverse = decode_cursor(token) if token else (None, False)
+
+        if position is not None:
+            date_value, id_value = self.parse_cursor_position(queryset.model, position)
+            # Rows strictly after the position in the walk direction
+            lookup = 'gt' if reverse else 'lt'
+            queryset = queryset.filter(
+                Q(**{f'{date_field}__{lookup}': date_value})
+                | Q(**{date_field: date_value, f'{id_field}__{lookup}': id_value})
+            )
+
+        if reverse:
+            queryset = queryset.order_by(date_field, id_field)
+        else:
+            queryset = queryset.order_by(f'-{date_field}', f'-{id_field}')
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        def link(row, towards_newer):
+            params = request.query_params.copy()
+            params['cursor'] = encode_cursor(self.cursor_position(row), reverse=towards_newer)
+            params['page_size'] = page_size
+            params.pop('pagination', None)
+            params.pop('page', None)
+            return f"?{params.urlencode()}"
+
+        more_older = has_more if not reverse else position is not None
+        more_newer = has_more if reverse else position is not None
+        data = {
+            'next': link(rows[-1], False) if rows and more_older else None,
+            'previous': link(rows[0], True) if rows and more_newer else None,
+            'results': self.get_serializer(rows, many=True).data,
+        }
+        if request.query_params.get('include_count', '').lower() in ('1', 'true'):
+            data = {'count': cached_count(self.get_queryset(), request), **data}
+        return Response(data)
+
+    def parse_cursor_position(self, model, position):
+        """
+        Convert a decoded cursor position back to typed key values
+
+        Raises:
+            ValidationError: If the position does not match cursor_ordering
+        """
+        date_field, id_field = self.cursor_ordering
+        is_datetime = isinstance(model._meta.get_field(date_field), models.DateTimeField)
+        try:
+            date_value, id_value = position
+            date_value = (parse_datetime if is_datetime else parse_date)(date_value)
+            id_value = int(id_value)
+        except (ValueError, TypeError):
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        if date_value is None:
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        return date_value, id_value
+
+    def cursor_position(self, row):
+        """Return the JSON-serializable keyset position of a row"""
+        date_field, id_field = self.cursor_ordering
+        return [getattr(row, date_field).isoformat(), getattr(row, id_field)]
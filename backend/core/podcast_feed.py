@@ -0,0 +1,141 @@
+"""
+Podcast RSS feed with iTunes tags
+
+Every episode keeps its own pre-rendered ``<item>`` element in
+``PodcastEpisode.feed_item``, re-rendered only when that episode is saved
+(see PodcastEpisode.save). A feed request concatenates the stored
+fragments of published episodes between the channel header and footer,
+so no episode is serialized at request time. The view caches the result
+on the podcast content version and serves it with ETag/Last-Modified.
+"""
+import datetime
+import mimetypes
+from io import StringIO
+from django.conf import settings
+from django.urls import reverse
+from django.utils.feedgenerator import rfc2822_date
+from django.utils.xmlutils import SimplerXMLGenerator
+from .utils.text import plain_text
+
+ITUNES_NS = 'http://www.itunes.com/dtds/podcast-1.0.dtd'
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+CONTENT_TYPE = 'application/rss+xml; charset=utf-8'
+
+# PodcastEpisode fields the rendered <item> is built from
+FEED_ITEM_SOURCES = {
+    'title', 'slug', 'description', 'publish_date', 'cover_image', 'episode_number',
+    'duration', 'audio_url', 'audio_size',
+}
+
+
+def _absolute_url(url):
+    if url.startswith(('http://', 'https://')):
+        return url
+    base = getattr(settings, 'BASE_URL', '') or 'http://localhost:8000'
+    return f"{base.rstrip('/')}{url}"
+
+
+def episode_link(slug):
+    """Return the frontend URL of a podcast episode page"""
+    base = settings.PUBLIC_FRONTEND_URL.rstrip('/')
+    path = getattr(settings, 'PODCAST_VIEW_PATH', '/podcast').strip('/')
+    return f"{base}/{path}/{slug}"
+
+
+def _publish_datetime(value):
+    # Episodes only have a date; publish them at midnight UTC
+    return datetime.datetime.combine(value, datetime.time(), tzinfo=datetime.timezone.utc)
+
+
+def render_feed_item(episode):
+    """
+    Render the RSS <item> element of one episode
+
+    Args:
+        episode: PodcastEpisode instance
+
+    Returns:
+        The <item> XML as a string
+    """
+    out = StringIO()
+    handler = SimplerXMLGenerator(out, 'utf-8', short_empty_elements=True)
+    title = episode.title_text or plain_text(episode.title)
+    summary = plain_text(episode.description)
+
+    handler.startElement('item', {})
+    handler.addQuickElement('title', title)
+    handler.addQuickElement('link', episode_link(episode.slug))
+    handler.addQuickElement('guid', f"podcast-episode-{episode.pk}", {'isPermaLink': 'false'})
+    # Unsaved assignments may still be strings (e.g. publish_date="2025-12-31")
+    publish_date = episode._meta.get_field('publish_date').to_python(episode.publish_date)
+    if publish_date:
+        handler.addQuickElement('pubDate', rfc2822_date(_publish_datetime(publish_date)))
+    handler.addQuickElement('description', episode.description)
+    if episode.audio_url:
+        mime_type = mimetypes.guess_type(episode.audio_url)[0] or 'audio/mpeg'
+        handler.addQuickElement('enclosure', '', {
+            'url': episode.audio_url,
+            'length': str(episode.audio_size or 0),
+            'type': mime_type,
+        })
+    handler.addQuickElement('itunes:title', title)
+    handler.addQuickElement('itunes:summary', summary)
+    if episode.episode_number:
+        handler.addQuickElement('itunes:episode', str(episode.episode_number))
+    if episode.duration:
+        handler.addQuickElement('itunes:duration', episode.duration)
+    if episode.cover_image:
+        try:
+            handler.addQuickElement('itunes:image', '', {'href': _absolute_url(episode.cover_image.url)})
+        except ValueError:
+            pass
+    handler.addQuickElement('itunes:explicit', 'false')
+    handler.endElement('item')
+    return out.getvalue()
+
+
+def render_channel():
+    """
+    Render the feed up to the first <item> and the closing tags
+
+    Returns:
+        Tuple of (header, footer) strings
+    """
+    out = StringIO()
+    handler = SimplerXMLGenerator(out, 'utf-8', short_empty_elements=True)
+    handler.startDocument()
+    handler.startElement('rss', {'version': '2.0', 'xmlns:itunes': ITUNES_NS, 'xmlns:atom': ATOM_NS})
+    handler.startElement('channel', {})
+    handler.addQuickElement('title', settings.PODCAST_FEED_TITLE)
+    handler.addQuickElement('link', episode_link('').rstrip('/'))
+    handler.addQuickElement('atom:link', '', {
+        'href': _absolute_url(reverse('core:podcast_feed')), 'rel': 'self', 'type': 'application/rss+xml'
+    })
+    handler.addQuickElement('description', settings.PODCAST_FEED_DESCRIPTION)
+    handler.addQuickElement('language', settings.PODCAST_FEED_LANGUAGE)
+    handler.addQuickElement('itunes:author', settings.PODCAST_FEED_AUTHOR)
+    handler.addQuickElement('itunes:summary', settings.PODCAST_FEED_DESCRIPTION)
+    handler.addQuickElement('itunes:category', '', {'text': settings.PODCAST_FEED_CATEGORY})
+    if settings.PODCAST_FEED_IMAGE:
+        handler.addQuickElement('itunes:image', '', {'href': _absolute_url(settings.PODCAST_FEED_IMAGE)})
+    handler.addQuickElement('itunes:explicit', 'false')
+    if settings.PODCAST_FEED_OWNER_EMAIL:
+        handler.startElement('itunes:owner', {})
+        handler.addQuickElement('itunes:name', settings.PODCAST_FEED_AUTHOR)
+        handler.addQuickElement('itunes:email', settings.PODCAST_FEED_OWNER_EMAIL)
+        handler.endElement('itunes:owner')
+    return out.getvalue(), '</channel></rss>'
+
+
+def build_feed(items):
+    """
+    Put the feed together from pre-rendered <item> fragments
+
+    Args:
+        items: Iterable of <item> strings, newest first
+
+    Returns:
+        The feed as UTF-8 bytes
+    """
+    header, footer = render_channel()
+    return ''.join([header, *items, footer]).encode('utf-8')
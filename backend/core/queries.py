@@ -0,0 +1,73 @@
+"""
+Shared query plans for the public API
+
+List and detail endpoints (and anything else serializing the same
+models) build their querysets here so related categories, localized
+names and tags are always loaded in a fixed number of queries.
+"""
+from django.db.models import Prefetch
+from .models import Newsletter, PodcastEpisode, Category, Tag, TextWidget, Archive
+
+
+def category_queryset():
+    """Categories with their localized name"""
+    return Category.objects.select_related('name')
+
+
+def tag_queryset():
+    """Tags with their localized name"""
+    return Tag.objects.select_related('name')
+
+
+def text_widget_queryset():
+    """Text widgets with their localized title and content"""
+    return TextWidget.objects.select_related('title', 'content')
+
+
+def archive_queryset():
+    """Active archive months that contain published content"""
+    return Archive.objects.filter(is_active=True, count__gt=0)
+
+
+def newsletter_queryset():
+    """Published newsletters with category and tags loaded up front"""
+    return (
+        Newsletter.objects.filter(published=True)
+        .select_related('category__name')
+        .prefetch_related(Prefetch('tags', queryset=tag_queryset()))
+    )
+
+
+def podcast_episode_queryset():
+    """Published podcast episodes with category and tags loaded up front"""
+    return (
+        PodcastEpisode.objects.filter(published=True)
+        .select_related('category__name')
+        .prefetch_related(Prefetch('tags', queryset=tag_queryset()))
+    )
+
+
+def filter_content(queryset, params):
+    """
+    Apply the public list filters (?category=<slug>, ?language=) to a
+    newsletter or podcast episode queryset
+
+    Args:
+        queryset: Newsletter or PodcastEpisode queryset
+        params: Request query params
+    """
+    # Filter by category if specified
+    category_slug = params.get('category', '').strip()
+    if category_slug:
+        queryset = queryset.filter(category__slug=category_slug)
+    
+    # Filter by language if specified
+    language = params.get('language', '').lower()
+    if language == 'english':
+        queryset = queryset.filter(available_in_english=True)
+    elif language == 'spanish':
+        queryset = queryset.filter(available_in_spanish=True)
+    elif language == 'both':
+        queryset = queryset.filter(available_in_english=True, available_in_spanish=True)
+    
+    return queryset
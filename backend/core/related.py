@@ -0,0 +1,212 @@
+"""
+Precomputed previous/next and related items for detail pages
+
+For each published newsletter and podcast episode a RelatedContent row
+holds its neighbours by publication date and the ids of its most related
+items of the same type, scored by shared tags (2 points each) and a
+shared category (1 point). Rows are recomputed in the background after
+content changes. The whole set is scored in memory from three small
+queries, and only rows whose values changed are written.
+"""
+import logging
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from .cache import bump_content_version
+from .models import Newsletter, PodcastEpisode, RelatedContent
+
+logger = logging.getLogger(__name__)
+
+# content type -> (model, publication date field)
+RELATED_TYPES = {
+    'newsletter': (Newsletter, 'published_at'),
+    'podcast': (PodcastEpisode, 'publish_date'),
+}
+TAG_WEIGHT = 2
+CATEGORY_WEIGHT = 1
+SCHEDULED_KEY = 'related-content:scheduled:{}'
+
+
+def compute_related_content(model, date_field, count):
+    """
+    Compute neighbours and related items of every published item of a model
+
+    Args:
+        model: Newsletter or PodcastEpisode (or their historical models)
+        date_field: Publication date field
+        count: Number of related items per item
+
+    Returns:
+        Dict of item id to (previous_id, next_id, related_ids)
+    """
+    rows = sorted(
+        model.objects.filter(published=True)
+        .exclude(**{f'{date_field}__isnull': True})
+        .values_list(date_field, 'id', 'category_id')
+    )
+    position = {item_id: index for index, (_, item_id, _) in enumerate(rows)}
+
+    tags_field = model._meta.get_field('tags')
+    source, target = tags_field.m2m_column_name(), tags_field.m2m_reverse_name()
+    item_tags = defaultdict(set)
+    tag_items = defaultdict(list)
+    links = tags_field.remote_field.through.objects.filter(**{f'{source}__in': list(position)})
+    for item_id, tag_id in links.values_list(source, target):
+        item_tags[item_id].add(tag_id)
+        tag_items[tag_id].append(item_id)
+    category_items = defaultdict(list)
+    for _, item_id, category_id in rows:
+        if category_id is not None:
+            category_items[category_id].append(item_id)
+
+    computed = {}
+    for index, (_, item_id, category_id) in enumerate(rows):
+        scores = Counter()
+        for tag_id in item_tags[item_id]:
+            for other_id in tag_items[tag_id]:
+                scores[other_id] += TAG_WEIGHT
+        if category_id is not None:
+            for other_id in category_items[category_id]:
+                scores[other_id] += CATEGORY_WEIGHT
+        scores.pop(item_id, None)
+        # Best score first, then the most recent
+        related = sorted(scores, key=lambda other_id: (-scores[other_id], -position[other_id]))[:count]
+        computed[item_id] = (
+            rows[index - 1][1] if index > 0 else None,
+            rows[index + 1][1] if index + 1 < len(rows) else None,
+            related,
+        )
+    return computed
+
+
+def store_related_content(related_model, content_type, computed):
+    """
+    Write computed values, touching only rows that changed
+
+    Args:
+        related_model: RelatedContent (or its historical model)
+        content_type: 'newsletter' or 'podcast'
+        computed: Result of compute_related_content
+
+    Returns:
+        Number of rows created, updated or deleted
+    """
+    existing = {row.object_id: row for row in related_model.objects.filter(content_type=content_type)}
+    to_create = []
+    to_update = []
+    for object_id, (previous_id, next_id, related_ids) in computed.items():
+        row = existing.get(object_id)
+        if row is None:
+            to_create.append(related_model(
+                content_type=content_type, object_id=object_id,
+                previous_id=previous_id, next_id=next_id, related_ids=related_ids
+            ))
+        elif (row.previous_id, row.next_id, row.related_ids) != (previous_id, next_id, related_ids):
+            row.previous_id, row.next_id, row.related_ids = previous_id, next_id, related_ids
+            to_update.append(row)
+    stale = [row.id for object_id, row in existing.items() if object_id not in computed]
+
+    related_model.objects.bulk_create(to_create)
+    related_model.objects.bulk_update(to_update, ['previous_id', 'next_id', 'related_ids'])
+    related_model.objects.filter(id__in=stale).delete()
+    return len(to_create) + len(to_update) + len(stale)
+
+
+def refresh_related_content(content_types=None):
+    """
+    Recompute RelatedContent for the given content types (default: all)
+
+    Every item of a type is rescored on purpose rather than only the saved
+    one. A refresh covers all changes debounced into it, not one known
+    item. An edit also moves rows the item no longer reaches: dropping a
+    tag or category changes the lists of items that shared the old ones,
+    and a new date changes the neighbours at the old and the new position.
+    Finding those would need the state before the save. The recompute is
+    three queries plus in-memory scoring, and only changed rows are
+    written.
+
+    Returns:
+        Number of rows created, updated or deleted
+    """
+    count = getattr(settings, 'RELATED_CONTENT_COUNT', 4)
+    changed = 0
+    for content_type in content_types or RELATED_TYPES:
+        cache.delete(SCHEDULED_KEY.format(content_type))
+        model, date_field = RELATED_TYPES[content_type]
+        with transaction.atomic():
+            changed += store_related_content(
+                RelatedContent, content_type, compute_related_content(model, date_field, count)
+            )
+    if changed:
+        # bulk writes send no signals, so invalidate cached detail responses here
+        transaction.on_commit(lambda: bump_content_version(RelatedContent))
+    return changed
+
+
+def schedule_related_refresh(content_type):
+    """
+    Queue a refresh of one content type after the current transaction commits
+
+    Changes within RELATED_CONTENT_DELAY seconds of each other share one
+    refresh. If the task cannot be queued the refresh runs inline.
+    """
+    delay = getattr(settings, 'RELATED_CONTENT_DELAY', 10)
+    if not cache.add(SCHEDULED_KEY.format(content_type), 1, delay * 2):
+        return
+
+    def enqueue():
+        from .tasks import refresh_related_content_task
+        try:
+            refresh_related_content_task.apply_async(args=[content_type], countdown=delay)
+        except Exception:
+            logger.exception("Could not queue related content refresh, running it inline")
+            refresh_related_content([content_type])
+
+    transaction.on_commit(enqueue)
+
+
+def _summary(item, date_field):
+    date = getattr(item, date_field)
+    return {
+        'id': item.id,
+        'slug': item.slug,
+        'title': item.title,
+        'title_text': item.title_text,
+        date_field: date.isoformat() if date else None,
+    }
+
+
+def get_related_content(content_type, obj):
+    """
+    Return the previous, next and related items embedded in a detail response
+
+    Args:
+        content_type: 'newsletter' or 'podcast'
+        obj: Newsletter or PodcastEpisode instance
+    """
+    data = {'previous': None, 'next': None, 'related': []}
+    row = (
+        RelatedContent.objects.filter(content_type=content_type, object_id=obj.id)
+        .values_list('previous_id', 'next_id', 'related_ids')
+        .first()
+    )
+    if row is None:
+        return data
+    previous_id, next_id, related_ids = row
+    ids = {previous_id, next_id, *related_ids} - {None}
+    if not ids:
+        return data
+
+    model, date_field = RELATED_TYPES[content_type]
+    items = {
+        item.id: item
+        for item in model.objects.filter(id__in=ids, published=True)
+        .only('id', 'slug', 'title', 'title_text', date_field)
+    }
+    if previous_id in items:
+        data['previous'] = _summary(items[previous_id], date_field)
+    if next_id in items:
+        data['next'] = _summary(items[next_id], date_field)
+    data['related'] = [_summary(items[item_id], date_field) for item_id in related_ids if item_id in items]
+    return data
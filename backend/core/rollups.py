@@ -0,0 +1,268 @@
+"""
+Stored aggregate counts maintained from content changes
+
+The API serves these columns directly; they are refreshed by the
+handlers in core.signals and can be rebuilt with management commands.
+"""
+from collections import Counter
+from functools import reduce
+from operator import or_
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+from django.utils import timezone
+from .cache import bump_content_version
+from .models import Newsletter, PodcastEpisode, Category, Archive, Comment
+
+# Date that places published content in a (year, month) archive bucket
+ARCHIVE_DATE_FIELDS = {
+    Newsletter: 'published_at',
+    PodcastEpisode: 'publish_date',
+}
+
+# Comment foreign key of each model with an approved_comment_count
+COMMENT_TARGET_FIELDS = {
+    Newsletter: 'newsletter',
+    PodcastEpisode: 'podcast_episode',
+}
+
+
+def _published_in_category(model, **filters):
+    """Correlated subquery counting published items of the outer category"""
+    counts = (
+        model.objects.filter(category=OuterRef('pk'), published=True, **filters)
+        .order_by()
+        .values('category')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _category_count_expressions():
+    """Update expressions for Category.count and its per-language breakdown"""
+    return {
+        'count': (
+            _published_in_category(Newsletter)
+            + _published_in_category(PodcastEpisode)
+        ),
+        'count_english': (
+            _published_in_category(Newsletter, available_in_english=True)
+            + _published_in_category(PodcastEpisode, available_in_english=True)
+        ),
+        'count_spanish': (
+            _published_in_category(Newsletter, available_in_spanish=True)
+            + _published_in_category(PodcastEpisode, available_in_spanish=True)
+        ),
+    }
+
+
+def refresh_category_counts(category_ids):
+    """
+    Recompute stored counts for the given categories in one UPDATE
+
+    Args:
+        category_ids: Iterable of category IDs (None values are ignored)
+
+    Returns:
+        Number of categories updated
+    """
+    category_ids = {category_id for category_id in category_ids if category_id is not None}
+    if not category_ids:
+        return 0
+    with transaction.atomic():
+        updated = Category.objects.filter(pk__in=category_ids).update(**_category_count_expressions())
+    # The UPDATE sends no signal; invalidate responses embedding the counts
+    if updated:
+        transaction.on_commit(lambda: bump_content_version(Category))
+    return updated
+
+
+def rebuild_category_counts():
+    """
+    Recompute stored counts for every category
+
+    Returns:
+        Number of categories updated
+    """
+    with transaction.atomic():
+        updated = Category.objects.update(**_category_count_expressions())
+    transaction.on_commit(lambda: bump_content_version(Category))
+    return updated
+
+
+def archive_bucket(model, published, value):
+    """
+    Return the (year, month) archive bucket of an item
+
+    Args:
+        model: Newsletter or PodcastEpisode
+        published: Whether the item is published
+        value: Value of the model's archive date field
+
+    Returns:
+        (year, month) tuple, or None if the item is not in any archive
+    """
+    if not published or value is None:
+        return None
+    # Unsaved assignments may still be strings (e.g. publish_date="2025-12-31")
+    value = model._meta.get_field(ARCHIVE_DATE_FIELDS[model]).to_python(value)
+    if model is Newsletter:
+        value = timezone.localtime(value)
+    return (value.year, value.month)
+
+
+def _archive_counts(buckets=None):
+    """
+    Count published items per (year, month) with one GROUP BY per table
+
+    Args:
+        buckets: Optional iterable of (year, month) tuples to restrict to
+
+    Returns:
+        Counter mapping (year, month) to the number of published items
+    """
+    counts = Counter()
+    for model, date_field in ARCHIVE_DATE_FIELDS.items():
+        queryset = model.objects.filter(published=True, **{f'{date_field}__isnull': False})
+        if buckets is not None:
+            queryset = queryset.filter(reduce(or_, (
+                Q(**{f'{date_field}__year': year, f'{date_field}__month': month})
+                for year, month in buckets
+            )))
+        rows = (
+            queryset.order_by()
+            .annotate(year=ExtractYear(date_field), month=ExtractMonth(date_field))
+            .values('year', 'month')
+            .annotate(total=Count('pk'))
+        )
+        for row in rows:
+            counts[(row['year'], row['month'])] += row['total']
+    return counts
+
+
+def _store_archive_counts(counts, archives):
+    """Write counts onto existing archive rows and create rows for new buckets"""
+    changed = []
+    for bucket, archive in archives.items():
+        count = counts.get(bucket, 0)
+        if archive.count != count:
+            archive.count = count
+            changed.append(archive)
+    new = [
+        Archive(year=year, month=month, count=count)
+        for (year, month), count in counts.items()
+        if (year, month) not in archives and count
+    ]
+    if changed:
+        Archive.objects.bulk_update(changed, ['count'])
+    if new:
+        # A concurrent refresh may have created the same bucket meanwhile
+        Archive.objects.bulk_create(
+            new, update_conflicts=True, unique_fields=['month', 'year'], update_fields=['count']
+        )
+    return len(changed) + len(new)
+
+
+def refresh_archive_counts(buckets):
+    """
+    Recompute stored counts for the given archive buckets
+
+    Args:
+        buckets: Iterable of (year, month) tuples (None values are ignored)
+
+    Returns:
+        Number of archives created or updated
+    """
+    buckets = {bucket for bucket in buckets if bucket is not None}
+    if not buckets:
+        return 0
+    counts = _archive_counts(buckets)
+    with transaction.atomic():
+        archives = {
+            (archive.year, archive.month): archive
+            for archive in Archive.objects.select_for_update().filter(
+                reduce(or_, (Q(year=year, month=month) for year, month in buckets))
+            )
+        }
+        return _store_archive_counts(counts, archives)
+
+
+def rebuild_archives():
+    """
+    Recompute every archive from published content
+
+    Months without published content keep their row with a zero count.
+
+    Returns:
+        Number of archives created or updated
+    """
+    counts = _archive_counts()
+    with transaction.atomic():
+        archives = {
+            (archive.year, archive.month): archive
+            for archive in Archive.objects.select_for_update()
+        }
+        return _store_archive_counts(counts, archives)
+
+
+def _approved_comments(target_field):
+    """Correlated subquery counting approved comments of the outer item"""
+    counts = (
+        Comment.objects.filter(**{target_field: OuterRef('pk')}, is_approved=True)
+        .order_by()
+        .values(target_field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def refresh_comment_counts(targets):
+    """
+    Recompute approved_comment_count for the items comments belong to
+
+    One UPDATE per table. Queryset updates send no signals, so cached
+    responses of the updated model are invalidated here.
+
+    Args:
+        targets: Iterable of (newsletter_id, podcast_episode_id) pairs, e.g.
+            Comment.objects.values_list('newsletter_id', 'podcast_episode_id')
+
+    Returns:
+        Number of items updated
+    """
+    newsletter_ids = set()
+    podcast_episode_ids = set()
+    for newsletter_id, podcast_episode_id in targets:
+        newsletter_ids.add(newsletter_id)
+        podcast_episode_ids.add(podcast_episode_id)
+
+    updated = 0
+    for model, ids in ((Newsletter, newsletter_ids), (PodcastEpisode, podcast_episode_ids)):
+        ids.discard(None)
+        if not ids:
+            continue
+        with transaction.atomic():
+            count = model.objects.filter(pk__in=ids).update(
+                approved_comment_count=_approved_comments(COMMENT_TARGET_FIELDS[model])
+            )
+        if count:
+            transaction.on_commit(lambda model=model: bump_content_version(model))
+        updated += count
+    return updated
+
+
+def rebuild_comment_counts():
+    """
+    Recompute approved_comment_count for every newsletter and podcast episode
+
+    Returns:
+        Number of items updated
+    """
+    updated = 0
+    for model, target_field in COMMENT_TARGET_FIELDS.items():
+        with transaction.atomic():
+            updated += model.objects.update(approved_comment_count=_approved_comments(target_field))
+        transaction.on_commit(lambda model=model: bump_content_version(model))
+    return updated
@@ -0,0 +1,172 @@
+"""
+Full-text search over newsletters and podcast episodes
+
+On PostgreSQL each row carries stored tsvector columns per language
+(search_vector_en / search_vector_es), maintained by triggers and backed
+by GIN indexes (migration 0022). Queries are ranked with ts_rank and
+highlighted with ts_headline.
+
+Other databases (SQLite in development and tests) fall back to
+icontains matching with a simple weighted score and a highlighted
+excerpt built in Python.
+"""
+import re
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Func, Q, Value, TextField
+from django.utils.html import escape
+from .models import Newsletter, PodcastEpisode
+from .utils.text import plain_text
+
+# text search configuration and stored vector column per language
+SEARCH_LANGUAGES = {
+    'english': ('english', 'search_vector_en'),
+    'spanish': ('spanish', 'search_vector_es'),
+}
+
+# (title, summary, body) columns searched for each model, weighted A/B/C
+SEARCH_COLUMNS = {
+    Newsletter: ('title', 'excerpt', 'content'),
+    PodcastEpisode: ('title', 'description', 'script'),
+}
+
+SEARCH_TYPES = {
+    'newsletter': Newsletter,
+    'podcast': PodcastEpisode,
+}
+
+HEADLINE_OPTIONS = {
+    'start_sel': '<mark>',
+    'stop_sel': '</mark>',
+    'max_words': 35,
+    'min_words': 15,
+    'max_fragments': 2,
+    'fragment_delimiter': ' … ',
+}
+
+SNIPPET_RADIUS = 80
+
+
+class StripTags(Func):
+    """regexp_replace(expression, '<[^>]+>', ' ', 'g') so headlines contain no markup"""
+    function = 'regexp_replace'
+    output_field = TextField()
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, Value('<[^>]+>'), Value(' '), Value('g'), **extra)
+
+
+def _result(instance, kind, rank, snippet):
+    date = instance.published_at if kind == 'newsletter' else instance.publish_date
+    return {
+        'type': kind,
+        'id': instance.id,
+        'slug': instance.slug,
+        'title': instance.title_text,
+        'snippet': snippet,
+        'rank': round(float(rank), 6),
+        'date': date.isoformat() if date else None,
+    }
+
+
+def _postgres_search(model, kind, query_text, language, limit):
+    config, vector_column = SEARCH_LANGUAGES[language]
+    _, _, body = SEARCH_COLUMNS[model]
+    query = SearchQuery(query_text, config=config, search_type='websearch')
+    rows = (
+        model.objects.filter(published=True)
+        .filter(**{vector_column: query})
+        .annotate(
+            rank=SearchRank(F(vector_column), query),
+            headline=SearchHeadline(StripTags(F(body)), query, config=config, **HEADLINE_OPTIONS),
+        )
+        .only('id', 'slug', 'title_text', 'published_at' if kind == 'newsletter' else 'publish_date')
+        .order_by('-rank', '-id')[:limit]
+    )
+    return [_result(row, kind, row.rank, row.headline) for row in rows]
+
+
+def _highlight(text, terms):
+    """Return an escaped excerpt of text around the first match with terms wrapped in <mark>"""
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms if term in lowered]
+    start = max(0, min(positions) - SNIPPET_RADIUS) if positions else 0
+    excerpt = text[start:start + 2 * SNIPPET_RADIUS]
+    # One pass over the raw excerpt, so terms never match inside the markup
+    # or entities added for another term; longest first for overlaps
+    pattern = re.compile(
+        '|'.join(re.escape(term) for term in sorted(set(terms), key=len, reverse=True)), re.IGNORECASE
+    )
+    parts = []
+    end = 0
+    for match in pattern.finditer(excerpt):
+        parts.append(escape(excerpt[end:match.start()]))
+        parts.append(f"<mark>{escape(match.group())}</mark>")
+        end = match.end()
+    parts.append(escape(excerpt[end:]))
+    snippet = ''.join(parts)
+    prefix = '… ' if start > 0 else ''
+    suffix = ' …' if start + 2 * SNIPPET_RADIUS < len(text) else ''
+    return f"{prefix}{snippet}{suffix}"
+
+
+def _fallback_search(model, kind, query_text, limit):
+    # Web-search syntax is reduced to plain terms: quotes dropped, -exclusions ignored
+    terms = [term.strip('"').lower() for term in query_text.split() if not term.startswith('-')]
+    terms = [term for term in terms if term]
+    if not terms:
+        return []
+    columns = SEARCH_COLUMNS[model]
+    queryset = model.objects.filter(published=True)
+    for term in terms:
+        queryset = queryset.filter(
+            Q(**{f'{columns[0]}__icontains': term})
+            | Q(**{f'{columns[1]}__icontains': term})
+            | Q(**{f'{columns[2]}__icontains': term})
+        )
+
+    results = []
+    for instance in queryset:
+        texts = [plain_text(getattr(instance, column)) for column in columns]
+        lowered = [text.lower() for text in texts]
+        rank = sum(
+            weight * text.count(term)
+            for term in terms
+            for weight, text in zip((1.0, 0.4, 0.2), lowered)
+        )
+        # Prefer highlighting the body, then the summary, then the title
+        source = next(
+            (text for text, low in zip(texts[::-1], lowered[::-1]) if any(term in low for term in terms)),
+            texts[1]
+        )
+        results.append(_result(instance, kind, rank, _highlight(source, terms)))
+    results.sort(key=lambda item: (-item['rank'], -item['id']))
+    return results[:limit]
+
+
+def search_content(query_text, language='english', types=None, limit=20):
+    """
+    Search published newsletters and podcast episodes
+
+    Args:
+        query_text: Web-search style query (quoted phrases, -exclusions)
+        language: 'english' or 'spanish' text search configuration
+        types: Optional iterable of 'newsletter' / 'podcast'
+        limit: Maximum number of results
+
+    Returns:
+        List of result dicts ordered by rank, highest first
+    """
+    if language not in SEARCH_LANGUAGES:
+        language = 'english'
+    kinds = [kind for kind in (types or SEARCH_TYPES) if kind in SEARCH_TYPES]
+
+    results = []
+    for kind in kinds:
+        model = SEARCH_TYPES[kind]
+        if connection.vendor == 'postgresql':
+            results.extend(_postgres_search(model, kind, query_text, language, limit))
+        else:
+            results.extend(_fallback_search(model, kind, query_text, limit))
+    results.sort(key=lambda item: -item['rank'])
+    return results[:limit]
@@ -2,22 +2,40 @@ from rest_framework import serializers
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
-from .models import Newsletter, PodcastEpisode, EmailSignup, Category, Tag, Archive, Comment, TextWidget
+from .fieldsets import SparseFieldsetMixin
+from .related import get_related_content
+from .models import Newsletter, PodcastEpisode, EmailSignup, Category, Tag, Archive, Comment, CommentSubmission, TextWidget
 
+# Model columns read by computed fields (for ?fields= column projection)
+NEWSLETTER_FIELD_COLUMNS = {
+    'featured_image_url': ['featured_image'],
+    'available_languages': ['available_in_english', 'available_in_spanish'],
+    'is_multilingual': ['available_in_english', 'available_in_spanish'],
+}
+PODCAST_FIELD_COLUMNS = {
+    'cover_image_url': ['cover_image'],
+    'available_languages': ['available_in_english', 'available_in_spanish'],
+    'is_multilingual': ['available_in_english', 'available_in_spanish'],
+}
 
-class NewsletterSerializer(serializers.ModelSerializer):
+
+class NewsletterSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Newsletter model"""
+    field_columns = NEWSLETTER_FIELD_COLUMNS
     featured_image_url = serializers.SerializerMethodField()
     category = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
+    related_content = serializers.SerializerMethodField()
     
     class Meta:
         model = Newsletter
         fields = [
-            'id', 'title', 'slug', 'subject', 'preheader', 'content', 'excerpt', 
+            'id', 'title', 'title_text', 'slug', 'subject', 'preheader', 'content', 'excerpt', 
+            'excerpt_text', 'word_count', 'reading_time_minutes',
             'featured_image', 'featured_image_url', 'status', 'published', 'sent_at',
             'available_in_english', 'available_in_spanish', 'available_languages', 
-            'is_multilingual', 'created_at', 'updated_at', 'published_at', 'category', 'tags'
+            'is_multilingual', 'created_at', 'updated_at', 'published_at', 'category', 'tags',
+            'approved_comment_count', 'related_content'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'published_at', 'sent_at', 'featured_image_url', 'available_languages', 'is_multilingual']
     
@@ -64,10 +82,15 @@ class NewsletterSerializer(serializers.ModelSerializer):
             }
             for tag in obj.tags.all()
         ]
+    
+    def get_related_content(self, obj):
+        """Return previous/next and related newsletters"""
+        return get_related_content('newsletter', obj)
 
 
-class NewsletterListSerializer(serializers.ModelSerializer):
+class NewsletterListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Newsletter list view (minimal fields)"""
+    field_columns = NEWSLETTER_FIELD_COLUMNS
     featured_image_url = serializers.SerializerMethodField()
     category = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
@@ -75,10 +98,11 @@ class NewsletterListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Newsletter
         fields = [
-            'id', 'title', 'slug', 'subject', 'preheader', 'excerpt', 
+            'id', 'title', 'title_text', 'slug', 'subject', 'preheader', 'excerpt', 
+            'excerpt_text', 'reading_time_minutes',
             'featured_image_url', 'status', 'published_at', 'sent_at',
             'available_in_english', 'available_in_spanish', 'available_languages', 
-            'is_multilingual', 'category', 'tags'
+            'is_multilingual', 'category', 'tags', 'approved_comment_count'
         ]
         read_only_fields = ['id', 'published_at', 'sent_at', 'featured_image_url', 'available_languages', 'is_multilingual']
     
@@ -127,21 +151,24 @@ class NewsletterListSerializer(serializers.ModelSerializer):
         ]
 
 
-class PodcastEpisodeSerializer(serializers.ModelSerializer):
+class PodcastEpisodeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for PodcastEpisode model - includes script for detail view"""
+    field_columns = PODCAST_FIELD_COLUMNS
     cover_image_url = serializers.SerializerMethodField()
     category = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
+    related_content = serializers.SerializerMethodField()
     
     class Meta:
         model = PodcastEpisode
         fields = [
-            'id', 'title', 'slug', 'description', 'script', 
+            'id', 'title', 'title_text', 'slug', 'description', 'script', 
+            'word_count', 'reading_time_minutes',
             'publish_date', 'episode_number', 'duration', 
             'facebook_url', 'youtube_url', 'spotify_url',
             'cover_image', 'cover_image_url', 'published', 'available_in_english', 
             'available_in_spanish', 'available_languages', 'is_multilingual',
-            'created_at', 'updated_at', 'category', 'tags'
+            'created_at', 'updated_at', 'category', 'tags', 'approved_comment_count', 'related_content'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'cover_image_url', 'available_languages', 'is_multilingual']
     
@@ -171,38 +198,41 @@ class PodcastEpisodeSerializer(serializers.ModelSerializer):
                 'name_english': obj.category.name.english,
                 'name_spanish': obj.category.name.spanish,
                 'slug': obj.category.slug,
-                'count': obj.category.actual_count,
+                'count': obj.category.count,
                 'is_active': obj.category.is_active
             }
         return None
     
     def get_tags(self, obj):
         """Return tags data"""
-        if obj.tags.exists():
-            return [{
-                'id': tag.id,
-                'name_english': tag.name.english,
-                'name_spanish': tag.name.spanish,
-                'slug': tag.slug,
-                'is_active': tag.is_active
-            } for tag in obj.tags.all()]
-        return []
+        return [{
+            'id': tag.id,
+            'name_english': tag.name.english,
+            'name_spanish': tag.name.spanish,
+            'slug': tag.slug,
+            'is_active': tag.is_active
+        } for tag in obj.tags.all()]
+    
+    def get_related_content(self, obj):
+        """Return previous/next and related episodes"""
+        return get_related_content('podcast', obj)
 
 
-class PodcastEpisodeListSerializer(serializers.ModelSerializer):
+class PodcastEpisodeListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for PodcastEpisode list view (minimal fields, with script snippet)"""
+    field_columns = PODCAST_FIELD_COLUMNS
     cover_image_url = serializers.SerializerMethodField()
-    script_snippet = serializers.SerializerMethodField()
     category = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
     
     class Meta:
         model = PodcastEpisode
         fields = [
-            'id', 'title', 'slug', 'description', 'publish_date',
+            'id', 'title', 'title_text', 'slug', 'description', 'publish_date',
             'episode_number', 'duration', 'facebook_url', 'youtube_url', 
-            'spotify_url', 'cover_image_url', 'script_snippet', 'available_in_english', 
-            'available_in_spanish', 'available_languages', 'is_multilingual', 'category', 'tags'
+            'spotify_url', 'cover_image_url', 'script_snippet', 'reading_time_minutes', 'available_in_english', 
+            'available_in_spanish', 'available_languages', 'is_multilingual', 'category', 'tags',
+            'approved_comment_count'
         ]
     
     def get_cover_image_url(self, obj):
@@ -223,12 +253,6 @@ class PodcastEpisodeListSerializer(serializers.ModelSerializer):
                 return None
         return None
     
-    def get_script_snippet(self, obj):
-        """Return first 200 characters of script"""
-        if obj.script:
-            return obj.script[:200] + "..." if len(obj.script) > 200 else obj.script
-        return ""
-    
     def get_category(self, obj):
         """Return category data"""
         if obj.category:
@@ -237,22 +261,20 @@ class PodcastEpisodeListSerializer(serializers.ModelSerializer):
                 'name_english': obj.category.name.english,
                 'name_spanish': obj.category.name.spanish,
                 'slug': obj.category.slug,
-                'count': obj.category.actual_count,
+                'count': obj.category.count,
                 'is_active': obj.category.is_active
             }
         return None
     
     def get_tags(self, obj):
         """Return tags data"""
-        if obj.tags.exists():
-            return [{
-                'id': tag.id,
-                'name_english': tag.name.english,
-                'name_spanish': tag.name.spanish,
-                'slug': tag.slug,
-                'is_active': tag.is_active
-            } for tag in obj.tags.all()]
-        return []
+        return [{
+            'id': tag.id,
+            'name_english': tag.name.english,
+            'name_spanish': tag.name.spanish,
+            'slug': tag.slug,
+            'is_active': tag.is_active
+        } for tag in obj.tags.all()]
 
 
 class EmailSignupSerializer(serializers.ModelSerializer):
@@ -322,19 +344,14 @@ class CategorySerializer(serializers.ModelSerializer):
     """Serializer for Category model"""
     name_english = serializers.CharField(source='name.english', read_only=True)
     name_spanish = serializers.CharField(source='name.spanish', read_only=True)
-    count = serializers.SerializerMethodField()
     
     class Meta:
         model = Category
         fields = [
             'id', 'name_english', 'name_spanish', 'slug', 
-            'count', 'is_active', 'created_at'
+            'count', 'count_english', 'count_spanish', 'is_active', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at']
-    
-    def get_count(self, obj):
-        """Return the actual calculated count of items in this category"""
-        return obj.actual_count
+        read_only_fields = ['id', 'count', 'count_english', 'count_spanish', 'created_at']
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -361,7 +378,7 @@ class ArchiveSerializer(serializers.ModelSerializer):
             'id', 'month', 'month_name', 'year', 'count', 
             'is_active', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at'] 
+        read_only_fields = ['id', 'count', 'created_at'] 
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -432,17 +449,17 @@ class CommentCreateSerializer(serializers.ModelSerializer):
         return data
     
     def create(self, validated_data):
-        """Create comment with additional security measures"""
-        # Sanitize inputs
-        validated_data['content'] = validated_data['content'].strip()
-        validated_data['author_name'] = validated_data['author_name'].strip()
-        validated_data['author_email'] = validated_data['author_email'].strip().lower()
-        
-        if validated_data.get('author_website'):
-            validated_data['author_website'] = validated_data['author_website'].strip()
-        
-        # Create comment (approval will be handled by admin)
-        return super().create(validated_data) 
+        """Queue the comment for the ingest pipeline (see core.comment_pipeline)"""
+        client_ip = validated_data.pop('client_ip', None)
+        payload = {
+            'content': validated_data['content'],
+            'author_name': validated_data['author_name'],
+            'author_email': validated_data['author_email'],
+            'author_website': validated_data.get('author_website') or None,
+            'newsletter': getattr(validated_data.get('newsletter'), 'pk', None),
+            'podcast_episode': getattr(validated_data.get('podcast_episode'), 'pk', None),
+        }
+        return CommentSubmission.objects.create(payload=payload, client_ip=client_ip)
 
 
 class TextWidgetSerializer(serializers.ModelSerializer):
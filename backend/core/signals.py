@@ -0,0 +1,142 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .cache import bump_content_version
+from .models import Newsletter, PodcastEpisode, Category, Tag, Archive, TextWidget, LocalizedElement, Comment
+from .rollups import (
+    ARCHIVE_DATE_FIELDS, archive_bucket, refresh_archive_counts, refresh_category_counts, refresh_comment_counts
+)
+from .static_export import schedule_static_export
+from .related import schedule_related_refresh
+
+
+# RelatedContent.content_type of each content model
+RELATED_CONTENT_TYPES = {Newsletter: 'newsletter', PodcastEpisode: 'podcast'}
+
+
+def _archive_bucket_of(instance):
+    date_field = ARCHIVE_DATE_FIELDS[type(instance)]
+    return archive_bucket(type(instance), instance.published, getattr(instance, date_field))
+
+
+@receiver(pre_save, sender=Newsletter)
+@receiver(pre_save, sender=PodcastEpisode)
+def remember_previous_state(sender, instance, raw=False, **kwargs):
+    """Record the stored category and archive bucket so a move refreshes both sides"""
+    instance._previous_category_id = None
+    instance._previous_archive_bucket = None
+    instance._previous_published = False
+    if raw or instance.pk is None:
+        return
+    date_field = ARCHIVE_DATE_FIELDS[sender]
+    previous = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list('category_id', 'published', date_field)
+        .first()
+    )
+    if previous is not None:
+        category_id, published, date_value = previous
+        instance._previous_category_id = category_id
+        instance._previous_archive_bucket = archive_bucket(sender, published, date_value)
+        instance._previous_published = published
+
+
+@receiver(post_save, sender=Newsletter)
+@receiver(post_save, sender=PodcastEpisode)
+def update_rollups_on_save(sender, instance, raw=False, **kwargs):
+    """Keep category and archive counts in step with saved (and published/unpublished) content"""
+    if raw:
+        return
+    refresh_category_counts([instance.category_id, getattr(instance, '_previous_category_id', None)])
+    refresh_archive_counts([_archive_bucket_of(instance), getattr(instance, '_previous_archive_bucket', None)])
+    # Drafts are not in the static snapshot; publishing, editing or unpublishing live content is
+    if instance.published or getattr(instance, '_previous_published', False):
+        schedule_static_export()
+        schedule_related_refresh(RELATED_CONTENT_TYPES[sender])
+
+
+@receiver(post_delete, sender=Newsletter)
+@receiver(post_delete, sender=PodcastEpisode)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    """Keep category and archive counts in step with deleted content"""
+    refresh_category_counts([instance.category_id])
+    refresh_archive_counts([_archive_bucket_of(instance)])
+    if instance.published:
+        schedule_static_export()
+        schedule_related_refresh(RELATED_CONTENT_TYPES[sender])
+
+
+@receiver(pre_save, sender=Comment)
+def remember_previous_comment_state(sender, instance, raw=False, **kwargs):
+    """Record the stored approval and target so a change refreshes the right counts"""
+    instance._previous_comment_state = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_comment_state = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list('is_approved', 'newsletter_id', 'podcast_episode_id')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_counts_on_save(sender, instance, raw=False, **kwargs):
+    """Keep approved_comment_count in step when a comment is approved, rejected or moved"""
+    if raw:
+        return
+    previous = getattr(instance, '_previous_comment_state', None)
+    targets = []
+    if instance.is_approved:
+        targets.append((instance.newsletter_id, instance.podcast_episode_id))
+    if previous is not None and previous[0]:
+        targets.append(previous[1:])
+    # Pending comments (every new public submission) leave the counts alone
+    refresh_comment_counts(targets)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_counts_on_delete(sender, instance, **kwargs):
+    """Keep approved_comment_count in step with deleted comments"""
+    if instance.is_approved:
+        refresh_comment_counts([(instance.newsletter_id, instance.podcast_episode_id)])
+
+
+# Models served by the cached public endpoints (see core.cache)
+CACHED_CONTENT_MODELS = (Newsletter, PodcastEpisode, Category, Tag, Archive, TextWidget, LocalizedElement)
+
+
+def bump_content_version_on_change(sender, **kwargs):
+    """Invalidate cached API responses built from the changed model"""
+    # After commit, so a concurrent reader cannot cache the old rows under the new version
+    transaction.on_commit(lambda: bump_content_version(sender))
+
+
+def bump_content_version_on_tags_change(sender, instance, action, reverse, model, **kwargs):
+    """Invalidate cached responses when content is (un)tagged"""
+    if not action.startswith('post_'):
+        return
+    changed_model = model if reverse else type(instance)
+    transaction.on_commit(lambda: bump_content_version(changed_model))
+
+
+for content_model in CACHED_CONTENT_MODELS:
+    post_save.connect(bump_content_version_on_change, sender=content_model, dispatch_uid=f'bump-version-save-{content_model.__name__}')
+    post_delete.connect(bump_content_version_on_change, sender=content_model, dispatch_uid=f'bump-version-delete-{content_model.__name__}')
+
+for tagged_model in (Newsletter, PodcastEpisode):
+    m2m_changed.connect(bump_content_version_on_tags_change, sender=tagged_model.tags.through, dispatch_uid=f'bump-version-tags-{tagged_model.__name__}')
+
+
+@receiver(m2m_changed, sender=Newsletter.tags.through)
+@receiver(m2m_changed, sender=PodcastEpisode.tags.through)
+def refresh_related_on_tags_change(sender, instance, action, reverse, **kwargs):
+    """Re-score related items when published content is (un)tagged"""
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # Tag side: any tagged content may be affected
+        for content_model, content_type in RELATED_CONTENT_TYPES.items():
+            if sender is content_model.tags.through:
+                schedule_related_refresh(content_type)
+    elif instance.published:
+        schedule_related_refresh(RELATED_CONTENT_TYPES[type(instance)])
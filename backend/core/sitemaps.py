@@ -0,0 +1,117 @@
+"""
+Sitemaps of every published newsletter and podcast episode page
+
+``sitemap.xml`` is an index pointing at paged sitemaps per section
+(``sitemap-newsletters-1.xml`` ...), each holding up to SITEMAP_PAGE_SIZE
+URLs. A page is streamed from ``values_list('slug', 'updated_at')`` with
+``.iterator()``, so rows are never all loaded into memory, and the bytes
+are cached under the section's content version: the cached page stays
+valid until content of that section changes.
+"""
+import hashlib
+from xml.sax.saxutils import escape
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.urls import reverse
+from .cache import get_content_versions
+from .models import Newsletter, PodcastEpisode
+from .podcast_feed import episode_link
+from .utils.email import build_frontend_view_url
+
+CONTENT_TYPE = 'application/xml; charset=utf-8'
+CACHE_KEY_PREFIX = 'sitemap'
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# section -> (model, frontend URL of a slug)
+SECTIONS = {
+    'newsletters': (Newsletter, build_frontend_view_url),
+    'podcasts': (PodcastEpisode, episode_link),
+}
+
+
+def get_page_size():
+    # The sitemap protocol allows at most 50,000 URLs per file
+    return min(getattr(settings, 'SITEMAP_PAGE_SIZE', 10000), 50000)
+
+
+def _lastmod(value):
+    return value.isoformat(timespec='seconds') if value else None
+
+
+def sitemap_cache_key(name, models):
+    """
+    Return the cache key of a sitemap file under the current versions of
+    its models, or None if the versions cannot be read
+    """
+    versions = get_content_versions(models)
+    if versions is None:
+        return None
+    digest = hashlib.sha256(f"{name}|{sorted(versions.items())}".encode()).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{digest}"
+
+
+def render_index(request):
+    """
+    Render the sitemap index listing every page of every section
+
+    Args:
+        request: Request used to build absolute sitemap URLs
+
+    Returns:
+        The index XML as bytes
+    """
+    size = get_page_size()
+    parts = [XML_DECLARATION, f'<sitemapindex xmlns="{SITEMAP_NS}">\n']
+    for section, (model, _) in SECTIONS.items():
+        stats = model.objects.filter(published=True).aggregate(total=Count('id'), latest=Max('updated_at'))
+        pages = max(1, -(-stats['total'] // size))
+        lastmod = _lastmod(stats['latest'])
+        for page in range(1, pages + 1):
+            loc = request.build_absolute_uri(reverse('core:sitemap_page', kwargs={'section': section, 'page': page}))
+            parts.append(f'<sitemap><loc>{escape(loc)}</loc>')
+            if lastmod:
+                parts.append(f'<lastmod>{lastmod}</lastmod>')
+            parts.append('</sitemap>\n')
+    parts.append('</sitemapindex>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+def page_queryset(section, page):
+    """Return the (slug, updated_at) rows of one sitemap page"""
+    model, _ = SECTIONS[section]
+    size = get_page_size()
+    start = (page - 1) * size
+    return (
+        model.objects.filter(published=True)
+        .order_by('id')
+        .values_list('slug', 'updated_at')[start:start + size]
+    )
+
+
+def stream_page(section, page):
+    """
+    Yield the XML of one sitemap page in chunks, one <url> per row
+
+    Args:
+        section: Key of SECTIONS
+        page: 1-based page number
+    """
+    _, url_for = SECTIONS[section]
+    yield f'{XML_DECLARATION}<urlset xmlns="{SITEMAP_NS}">\n'.encode('utf-8')
+    for slug, updated_at in page_queryset(section, page).iterator(chunk_size=2000):
+        entry = f'<url><loc>{escape(url_for(slug))}</loc>'
+        if updated_at:
+            entry += f'<lastmod>{_lastmod(updated_at)}</lastmod>'
+        yield f'{entry}</url>\n'.encode('utf-8')
+    yield b'</urlset>\n'
+
+
+def cache_stream(chunks, key):
+    """Pass chunks through and cache their concatenation once the stream completes"""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, b''.join(parts), getattr(settings, 'SITEMAP_CACHE_TIMEOUT', 86400))
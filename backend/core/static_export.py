@@ -0,0 +1,184 @@
+"""
+Static JSON snapshot of the public API
+
+Every public read endpoint is rendered through its real view and written
+under ``STATIC_EXPORT_ROOT/static-api/`` so a CDN, nginx or WhiteNoise
+(``WHITENOISE_ROOT``) can serve reads without reaching Django:
+
+* ``newsletters/index.json`` - first list page
+* ``newsletters/category-<slug>_language-<lang>_page-<n>.json`` - list pages
+  per filter combination, query params sorted by name
+* ``newsletters/<slug>/index.json`` - detail
+* ``categories/index.json``, ``tags/...``, ``archives/...``, ``text-widgets/...``
+
+Each file is replaced atomically (temp file + os.replace), so readers see
+either the old or the new version, and files of content that no longer
+exists are removed at the end of a run.
+"""
+import json
+import os
+import tempfile
+from urllib.parse import parse_qsl, urlparse
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from .models import Category
+from .queries import newsletter_queryset, podcast_episode_queryset
+
+EXPORT_DIR = 'static-api'
+API_PREFIX = '/api/'
+LIST_LANGUAGES = (None, 'english', 'spanish', 'both')
+SCHEDULED_KEY = 'static-export:scheduled'
+
+# list endpoint -> (queryset of published content, detail endpoint)
+CONTENT_ENDPOINTS = {
+    'core:newsletter_list': (newsletter_queryset, 'core:newsletter_detail'),
+    'core:podcast_episodes_list': (podcast_episode_queryset, 'core:podcast_episodes_detail'),
+}
+TAXONOMY_ENDPOINTS = ('core:category_list', 'core:tag_list', 'core:archive_list', 'core:text_widget_list')
+
+
+def export_path(url_path, params=None):
+    """
+    Return the snapshot file path, relative to STATIC_EXPORT_ROOT, of an API request
+
+    Args:
+        url_path: Request path, e.g. '/api/newsletters/'
+        params: Query params; page_size and page=1 are ignored
+    """
+    params = {
+        key: value for key, value in (params or {}).items()
+        if key != 'page_size' and not (key == 'page' and str(value) == '1')
+    }
+    directory = url_path[len(API_PREFIX):].strip('/')
+    name = '_'.join(f"{key}-{value}" for key, value in sorted(params.items())) or 'index'
+    return os.path.join(EXPORT_DIR, directory, f"{name}.json")
+
+
+def write_atomic(path, content):
+    """Write bytes to path via a temp file in the same directory and os.replace"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class StaticExporter:
+    """Render public API responses and write them below a root directory"""
+
+    def __init__(self, root=None):
+        self.root = root or settings.STATIC_EXPORT_ROOT
+        base = urlparse(getattr(settings, 'BASE_URL', '') or 'http://localhost')
+        self.factory = RequestFactory(**{
+            'HTTP_HOST': base.netloc or 'localhost',
+            'wsgi.url_scheme': base.scheme or 'http',
+        })
+        self.written = set()
+
+    def render(self, url_path, params=None):
+        """Render one GET request through the view its path resolves to"""
+        request = self.factory.get(url_path, params or {})
+        match = resolve(url_path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def export(self, url_path, params=None):
+        """Render a request and write it; returns the response or None if not 200"""
+        response = self.render(url_path, params)
+        if response.status_code != 200:
+            return None
+        relative = export_path(url_path, params)
+        write_atomic(os.path.join(self.root, relative), response.content)
+        self.written.add(relative)
+        return response
+
+    def export_pages(self, url_path, params=None):
+        """Export every page of a list by following its next links"""
+        filters = dict(params or {})
+        params = dict(filters)
+        while True:
+            response = self.export(url_path, params)
+            if response is None:
+                return
+            # Parse the bytes: a response cache hit carries no .data
+            data = json.loads(response.content)
+            next_link = data.get('next') if isinstance(data, dict) else None
+            if not next_link:
+                return
+            # Keep the list's filters even if the link does not carry them
+            params = {**filters, **dict(parse_qsl(urlparse(next_link).query))}
+
+    def export_content(self, list_name, queryset_fn, detail_name):
+        """Export list pages for every category/language combination and each detail"""
+        url_path = reverse(list_name)
+        category_slugs = [None] + list(
+            Category.objects.filter(is_active=True).values_list('slug', flat=True)
+        )
+        for category in category_slugs:
+            for language in LIST_LANGUAGES:
+                params = {key: value for key, value in (('category', category), ('language', language)) if value}
+                self.export_pages(url_path, params)
+        for slug in queryset_fn().values_list('slug', flat=True).iterator():
+            self.export(reverse(detail_name, kwargs={'slug': slug}))
+
+    def remove_stale(self):
+        """Delete snapshot files that were not written by this run"""
+        removed = 0
+        top = os.path.join(self.root, EXPORT_DIR)
+        for directory, _, files in os.walk(top, topdown=False):
+            for name in files:
+                path = os.path.join(directory, name)
+                if os.path.relpath(path, self.root) not in self.written:
+                    os.unlink(path)
+                    removed += 1
+            if directory != top and not os.listdir(directory):
+                os.rmdir(directory)
+        return removed
+
+    def run(self):
+        """Export every public endpoint; returns (files written, stale files removed)"""
+        for list_name, (queryset_fn, detail_name) in CONTENT_ENDPOINTS.items():
+            self.export_content(list_name, queryset_fn, detail_name)
+        for name in TAXONOMY_ENDPOINTS:
+            self.export_pages(reverse(name))
+        return len(self.written), self.remove_stale()
+
+
+def export_static_api(root=None):
+    """
+    Write a full static snapshot of the public API
+
+    Args:
+        root: Target directory (default: settings.STATIC_EXPORT_ROOT)
+
+    Returns:
+        Tuple of (files written, stale files removed)
+    """
+    cache.delete(SCHEDULED_KEY)
+    return StaticExporter(root).run()
+
+
+def schedule_static_export():
+    """
+    Queue a snapshot export after the current transaction commits
+
+    Saves within STATIC_EXPORT_DELAY seconds of each other share one export.
+    """
+    if not getattr(settings, 'STATIC_EXPORT_ON_PUBLISH', False):
+        return
+    delay = getattr(settings, 'STATIC_EXPORT_DELAY', 30)
+    if not cache.add(SCHEDULED_KEY, 1, delay * 2):
+        return
+    from .tasks import export_static_api_task
+    transaction.on_commit(lambda: export_static_api_task.apply_async(countdown=delay))
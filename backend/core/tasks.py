@@ -2,22 +2,181 @@ from celery import shared_task
 from django.utils import timezone
 from django.conf import settings
 from django.template.loader import render_to_string
-from .models import Newsletter, EmailSignup, EmailLog
+from django.core.cache import cache
+from .models import Newsletter, EmailSignup, EmailLog, RenderedEmail
 from .email_providers.factory import get_email_provider
 from .utils.email import html_to_text, build_unsub_url, build_view_url, convert_markdown_to_html
+from .utils.locks import newsletter_send_lock
+from .webhooks import drain_webhook_events
+from .comment_pipeline import drain_comment_submissions
+from .static_export import export_static_api
+from .related import refresh_related_content
+from datetime import timedelta
 import time
 import os
 
 
+def store_rendered_email(newsletter, html):
+    """
+    Store the browser version of a rendered newsletter and warm its cache entry
+
+    Args:
+        newsletter: Newsletter instance
+        html: Rendered email HTML containing the __UNSUB__ placeholder
+
+    Returns:
+        RenderedEmail instance
+    """
+    web_html = html.replace("__UNSUB__", settings.PUBLIC_FRONTEND_URL)
+    rendered = RenderedEmail.store(newsletter, web_html)
+    cache.set(
+        RenderedEmail.cache_key(newsletter.slug),
+        (rendered.version, bytes(rendered.html_gzip)),
+        getattr(settings, 'RENDERED_EMAIL_CACHE_TIMEOUT', None)
+    )
+    return rendered
+
+
+def get_newsletter_body(newsletter):
+    """
+    Return the rendered email body for a send, rendering it at most once
+
+    The HTML keeps an __UNSUB__ placeholder that is replaced per recipient.
+    The result is cached by send_key and updated_at, so a pre-warmed send
+    starts without rendering while an edit made after the pre-warm is
+    rendered afresh. Nothing is made public here; the browser version is
+    stored once the send completes.
+
+    Args:
+        newsletter: Newsletter instance
+
+    Returns:
+        Tuple of (html, text)
+    """
+    cache_key = f"newsletter-body:{newsletter.send_key}:{newsletter.updated_at.timestamp()}"
+    body = cache.get(cache_key)
+    if body is not None:
+        return body
+
+    # Convert content to HTML if needed
+    if newsletter.content:
+        html_body = convert_markdown_to_html(newsletter.content)
+    else:
+        html_body = ""
+
+    # Render base HTML template with placeholder for unsubscribe
+    html = render_to_string(
+        "email/newsletter.html",
+        {
+            "subject": newsletter.subject,
+            "preheader": newsletter.preheader,
+            "content_html": html_body,
+            "UNSUB": "__UNSUB__",
+            "VIEW_URL": build_view_url(newsletter),
+            "now": timezone.now().year
+        },
+    )
+
+    # Create plain text version
+    text = html_to_text(html)
+
+    body = (html, text)
+    cache.set(cache_key, body, getattr(settings, 'SEND_CACHE_TIMEOUT', 86400))
+    return body
+
+
+def get_audience():
+    """Return the queryset of recipients eligible for newsletters"""
+    return EmailSignup.objects.filter(
+        is_subscribed=True,
+        bounce=False,
+        is_active=True
+    )
+
+
+def materialize_recipient_snapshot(newsletter, chunk_size: int = 1000):
+    """
+    Create a queued EmailLog row for every current recipient of a newsletter
+
+    Existing rows are left untouched, so the snapshot is idempotent and a
+    resumed send never mails the same recipient twice.
+
+    Args:
+        newsletter: Newsletter instance
+        chunk_size: Number of rows inserted per statement
+
+    Returns:
+        Number of recipients in the audience
+    """
+    total = 0
+    chunk = []
+    for recipient_id in get_audience().values_list('id', flat=True).iterator(chunk_size=chunk_size):
+        chunk.append(EmailLog(newsletter=newsletter, recipient_id=recipient_id, status='queued'))
+        if len(chunk) >= chunk_size:
+            EmailLog.objects.bulk_create(chunk, ignore_conflicts=True)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        EmailLog.objects.bulk_create(chunk, ignore_conflicts=True)
+        total += len(chunk)
+    return total
+
+
+def _unsub_cache_key(recipient_id):
+    return f"unsub-url:{recipient_id}"
+
+
+def warm_unsubscribe_urls(newsletter, chunk_size: int = 1000):
+    """
+    Precompute signed unsubscribe URLs for the queued recipients of a newsletter
+
+    Args:
+        newsletter: Newsletter instance
+        chunk_size: Number of cache entries written per round trip
+
+    Returns:
+        Number of URLs cached
+    """
+    timeout = getattr(settings, 'SEND_CACHE_TIMEOUT', 86400)
+    recipient_ids = EmailLog.objects.filter(
+        newsletter=newsletter, status='queued'
+    ).values_list('recipient_id', flat=True)
+
+    total = 0
+    urls = {}
+    for recipient_id in recipient_ids.iterator(chunk_size=chunk_size):
+        urls[_unsub_cache_key(recipient_id)] = build_unsub_url(EmailSignup(id=recipient_id))
+        if len(urls) >= chunk_size:
+            cache.set_many(urls, timeout)
+            total += len(urls)
+            urls = {}
+    if urls:
+        cache.set_many(urls, timeout)
+        total += len(urls)
+    return total
+
+
+def _get_unsubscribe_urls(recipients):
+    """Return unsubscribe URLs for a batch of recipients, using warmed entries"""
+    cached = cache.get_many([_unsub_cache_key(recipient.id) for recipient in recipients])
+    return {
+        recipient.id: cached.get(_unsub_cache_key(recipient.id)) or build_unsub_url(recipient)
+        for recipient in recipients
+    }
+
+
 @shared_task(bind=True, max_retries=3, default_retry_delay=30)
-def send_newsletter_task(self, send_key: str, batch_size: int = None):
+def send_newsletter_task(self, send_key: str, batch_size: int = None, scheduled_for: str = None):
     """
     Send newsletter to all subscribed recipients
 
     Args:
         send_key: Newsletter send key for idempotency
         batch_size: Number of emails to send per batch (defaults to settings.BATCH_SIZE)
+        scheduled_for: ISO timestamp of the schedule this run was queued for;
+            the run is skipped if the newsletter was rescheduled since
     """
+    lock = None
     try:
         # Use settings batch size if not provided
         if batch_size is None:
@@ -35,60 +194,71 @@ def send_newsletter_task(self, send_key: str, batch_size: int = None):
             print(f"Newsletter {send_key} already sent at {newsletter.sent_at}")
             return
 
+        # Skip stale scheduled runs
+        if scheduled_for is not None:
+            current = newsletter.scheduled_send_at.isoformat() if newsletter.scheduled_send_at else None
+            if current != scheduled_for:
+                print(f"Newsletter {send_key} was rescheduled, skipping run for {scheduled_for}")
+                return
+
+        # Only one coordinator may walk the audience of a newsletter
+        lock = newsletter_send_lock(send_key)
+        if not lock.acquire():
+            lock = None
+            print(f"Newsletter {send_key} is already being sent by another worker")
+            return
+
+        # A previous coordinator may have finished while we waited
+        newsletter.refresh_from_db(fields=['sent_at'])
+        if newsletter.sent_at:
+            print(f"Newsletter {send_key} already sent at {newsletter.sent_at}")
+            return
+
         # Get email provider
         provider = get_email_provider()
 
-        # Get all subscribed, non-bounced recipients
-        recipients = EmailSignup.objects.filter(
-            is_subscribed=True,
-            bounce=False,
-            is_active=True
-        )
+        # Rendered once (or taken from the pre-warm cache)
+        html, text = get_newsletter_body(newsletter)
 
-        total_recipients = recipients.count()
+        # Snapshot the audience as queued log rows (no-op if pre-warmed)
+        total_recipients = materialize_recipient_snapshot(newsletter)
         print(f"Starting to send newsletter '{newsletter.title}' to {total_recipients} recipients")
 
-        # Convert content to HTML if needed
-        if newsletter.content:
-            html_body = convert_markdown_to_html(newsletter.content)
-        else:
-            html_body = ""
-
-        # Build view URL
-        view_url = build_view_url(newsletter)
-        
-        # Render base HTML template with placeholder for unsubscribe
-        html = render_to_string(
-            "email/newsletter.html",
-            {
-                "subject": newsletter.subject, 
-                "preheader": newsletter.preheader, 
-                "content_html": html_body, 
-                "UNSUB": "__UNSUB__", 
-                "VIEW_URL": view_url,
-                "now": timezone.now().year
-            },
-        )
-        
-        # Create plain text version
-        text = html_to_text(html)
-
         sent_count = 0
         failed_count = 0
+        batch_number = 0
+        last_id = 0
 
-        # Process in batches
-        for i in range(0, total_recipients, batch_size):
-            batch = recipients[i:i + batch_size]
+        # Process queued rows in batches, keyed on id so progress never shifts the window
+        while True:
+            batch = list(
+                EmailLog.objects.filter(
+                    newsletter=newsletter,
+                    status='queued',
+                    id__gt=last_id,
+                    recipient__is_subscribed=True,
+                    recipient__bounce=False,
+                    recipient__is_active=True,
+                ).select_related('recipient').order_by('id')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+            batch_number += 1
 
-            for recipient in batch:
-                try:
-                    # Check if already logged (avoid duplicates)
-                    if EmailLog.objects.filter(newsletter=newsletter, recipient=recipient).exists():
-                        continue
+            unsub_urls = _get_unsubscribe_urls([log.recipient for log in batch])
+
+            for log in batch:
+                recipient = log.recipient
 
+                # Renew the lease; stop if another coordinator took over
+                if not lock.keep_alive():
+                    print(f"Lost send lock for newsletter {send_key}, stopping")
+                    return
+
+                try:
                     # Replace unsubscribe placeholder with user-specific URL
-                    unsub = build_unsub_url(recipient)
-                    per_user_html = html.replace("__UNSUB__", unsub)
+                    per_user_html = html.replace("__UNSUB__", unsub_urls[recipient.id])
 
                     # Send email
                     msg_id = provider.send(
@@ -100,9 +270,7 @@ def send_newsletter_task(self, send_key: str, batch_size: int = None):
                     )
                     
                     # Log success
-                    EmailLog.objects.create(
-                        newsletter=newsletter,
-                        recipient=recipient,
+                    EmailLog.objects.filter(pk=log.pk).update(
                         status="sent",
                         provider_message_id=msg_id
                     )
@@ -110,9 +278,7 @@ def send_newsletter_task(self, send_key: str, batch_size: int = None):
 
                 except Exception as e:
                     # Log failure
-                    EmailLog.objects.create(
-                        newsletter=newsletter,
-                        recipient=recipient,
+                    EmailLog.objects.filter(pk=log.pk).update(
                         status="failed",
                         error=str(e)
                     )
@@ -120,16 +286,23 @@ def send_newsletter_task(self, send_key: str, batch_size: int = None):
                     print(f"Failed to send to {recipient.email}: {e}")
 
             # Progress update
-            print(f"Processed batch {i//batch_size + 1}: {sent_count} sent, {failed_count} failed")
+            print(f"Processed batch {batch_number}: {sent_count} sent, {failed_count} failed")
 
             # Rate limiting - sleep between batches to be friendly with provider limits
-            if i + batch_size < total_recipients:
+            if len(batch) == batch_size:
                 time.sleep(getattr(settings, "RATE_SLEEP_SEC", 0.5))
 
+        # Recipients who left the audience after the snapshot are not mailed
+        EmailLog.objects.filter(newsletter=newsletter, status='queued').delete()
+
         # Mark newsletter as sent
         newsletter.sent_at = timezone.now()
         newsletter.save()
 
+        # Publish the browser version of exactly what was mailed, so
+        # "view in browser" never re-renders
+        store_rendered_email(newsletter, html)
+
         print(f"Newsletter sending completed: {sent_count} sent, {failed_count} failed")
 
     except Exception as e:
@@ -137,6 +310,81 @@ def send_newsletter_task(self, send_key: str, batch_size: int = None):
         # Retry the task
         raise self.retry(exc=e)
 
+    finally:
+        if lock is not None:
+            lock.release()
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def prewarm_newsletter_send(self, send_key: str):
+    """
+    Prepare a scheduled send so dispatch starts at full throughput
+
+    Renders and caches the email body, materializes the recipient snapshot,
+    precomputes unsubscribe URLs and opens the provider connection, then
+    queues send_newsletter_task for the scheduled time.
+
+    Args:
+        send_key: Newsletter send key
+    """
+    try:
+        try:
+            newsletter = Newsletter.objects.get(send_key=send_key)
+        except Newsletter.DoesNotExist:
+            print(f"Newsletter with send_key {send_key} not found")
+            return
+
+        if newsletter.sent_at or not newsletter.scheduled_send_at:
+            print(f"Newsletter {send_key} is not awaiting a scheduled send")
+            return
+
+        get_newsletter_body(newsletter)
+        total_recipients = materialize_recipient_snapshot(newsletter)
+        warm_unsubscribe_urls(newsletter)
+        get_email_provider().warm_up()
+
+        send_newsletter_task.apply_async(
+            args=[send_key],
+            kwargs={'scheduled_for': newsletter.scheduled_send_at.isoformat()},
+            eta=newsletter.scheduled_send_at,
+        )
+        print(f"Pre-warmed newsletter {send_key} for {total_recipients} recipients, "
+              f"sending at {newsletter.scheduled_send_at}")
+
+    except Exception as e:
+        print(f"Newsletter pre-warm failed: {e}")
+        raise self.retry(exc=e)
+
+
+@shared_task(ignore_result=True)
+def dispatch_scheduled_newsletters():
+    """
+    Start the pre-warm phase of scheduled sends that are close to their send time
+
+    Runs from Celery beat. Each newsletter is claimed with a conditional
+    UPDATE on prewarmed_at so overlapping beat ticks never queue it twice.
+    """
+    now = timezone.now()
+    lead = timedelta(seconds=getattr(settings, 'SEND_PREWARM_LEAD_SEC', 300))
+
+    due = Newsletter.objects.filter(
+        published=True,
+        sent_at__isnull=True,
+        prewarmed_at__isnull=True,
+        scheduled_send_at__isnull=False,
+        scheduled_send_at__lte=now + lead,
+    ).values_list('id', 'send_key')
+
+    queued = 0
+    for newsletter_id, send_key in due:
+        claimed = Newsletter.objects.filter(
+            id=newsletter_id, prewarmed_at__isnull=True
+        ).update(prewarmed_at=now)
+        if claimed:
+            prewarm_newsletter_send.delay(send_key)
+            queued += 1
+    return queued
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=30)
 def send_test_newsletter_task(self, newsletter_id: int, test_email: str):
@@ -209,4 +457,64 @@ def send_test_newsletter_task(self, newsletter_id: int, test_email: str):
 
     except Exception as e:
         print(f"Test newsletter sending failed: {e}")
-        raise self.retry(exc=e) 
\ No newline at end of file
+        raise self.retry(exc=e)
+
+
+@shared_task(ignore_result=True)
+def process_webhook_events(batch_size: int = None):
+    """
+    Drain queued provider webhook events and apply them in batches
+
+    Args:
+        batch_size: Number of events per batch (defaults to settings.WEBHOOK_BATCH_SIZE)
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, 'WEBHOOK_BATCH_SIZE', 500)
+
+    processed = drain_webhook_events(batch_size=batch_size)
+    if processed:
+        print(f"Processed {processed} webhook events")
+    return processed
+
+
+@shared_task(ignore_result=True)
+def process_comment_queue(batch_size: int = None):
+    """
+    Drain queued comment submissions into pending comments (see core.comment_pipeline)
+
+    Args:
+        batch_size: Number of submissions per batch (defaults to settings.COMMENT_BATCH_SIZE)
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, 'COMMENT_BATCH_SIZE', 500)
+
+    stats = drain_comment_submissions(batch_size=batch_size)
+    if stats:
+        print(f"Processed comment submissions: {stats}")
+    return stats
+
+
+@shared_task(ignore_result=True)
+def refresh_related_content_task(content_type: str = None):
+    """
+    Recompute previous/next and related items (see core.related)
+
+    Args:
+        content_type: 'newsletter' or 'podcast'; both when omitted
+    """
+    changed = refresh_related_content([content_type] if content_type else None)
+    if changed:
+        print(f"Updated {changed} related content rows")
+    return changed
+
+
+@shared_task(ignore_result=True)
+def export_static_api_task():
+    """
+    Rewrite the static JSON snapshot of the public API (see core.static_export)
+
+    Queued by schedule_static_export when published content changes.
+    """
+    written, removed = export_static_api()
+    print(f"Exported {written} static API files ({removed} stale removed)")
+    return written
@@ -1,9 +1,13 @@
-from django.test import TestCase
+import time
+from unittest import mock
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.contrib.auth.models import User
-from .models import Newsletter, PodcastEpisode, EmailSignup
+from .models import Newsletter, PodcastEpisode, EmailSignup, RenderedEmail, Tag, LocalizedElement, Category
+from .rollups import refresh_category_counts
 
 
 class NewsletterAPITest(APITestCase):
@@ -293,6 +297,198 @@ class HealthCheckAPITest(APITestCase):
             self.assertIn(endpoint, endpoints)
 
 
+class NewsletterEmailViewTest(APITestCase):
+    """Test cases for the stored view-in-browser email endpoint"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.newsletter = Newsletter.objects.create(
+            title="Sent Newsletter",
+            slug="sent-newsletter",
+            content="Content",
+            excerpt="Excerpt",
+            published=True,
+            sent_at=timezone.now()
+        )
+        self.url = reverse('core:newsletter_email_view', kwargs={'slug': 'sent-newsletter'})
+    
+    def test_unsent_newsletter_redirects_to_frontend(self):
+        """Test newsletters without a stored rendering redirect to the frontend"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertTrue(response['Location'].endswith('/sent-newsletter'))
+    
+    def test_rendering_of_unsent_newsletter_is_not_served(self):
+        """Test a rendering stored before the send (e.g. a cancelled send) stays private"""
+        self.newsletter.sent_at = None
+        self.newsletter.save()
+        RenderedEmail.store(self.newsletter, "<html><body>Draft</body></html>")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+
+    def test_stored_rendering_is_served_with_cache_headers(self):
+        """Test the stored HTML is served compressed with long-lived caching"""
+        rendered = RenderedEmail.store(self.newsletter, "<html><body>Hello readers</body></html>")
+        
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response.content, bytes(rendered.html_gzip))
+        self.assertEqual(response['ETag'], f'"{rendered.version}"')
+        self.assertIn('max-age=', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+        
+        response = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', response)
+        self.assertIn(b'Hello readers', response.content)
+    
+    def test_matching_etag_returns_not_modified(self):
+        """Test revalidation with the current ETag returns 304"""
+        rendered = RenderedEmail.store(self.newsletter, "<html><body>Hello readers</body></html>")
+        
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{rendered.version}"')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_store_is_idempotent_per_version(self):
+        """Test storing the same HTML twice keeps a single row"""
+        RenderedEmail.store(self.newsletter, "<p>Same</p>")
+        RenderedEmail.store(self.newsletter, "<p>Same</p>")
+        self.assertEqual(self.newsletter.rendered_emails.count(), 1)
+
+
+class UnavailableVersionsTest(APITestCase):
+    """Test responses when content versions cannot be read (DummyCache)"""
+
+    def setUp(self):
+        self.newsletter = Newsletter.objects.create(
+            title="Uncached Newsletter", slug="uncached-newsletter", content="Content", published=True
+        )
+        self.url = reverse('core:newsletter_list')
+
+    def test_etag_follows_the_body(self):
+        """Test a stale ETag is not answered with 304 when versions are unavailable"""
+        first = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', first)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        self.newsletter.title = "Renamed Newsletter"
+        self.newsletter.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['title'], "Renamed Newsletter")
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'response-cache-test'}})
+class ResponseCacheTest(APITestCase):
+    """Test cases for the versioned response cache on public read endpoints"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.newsletter = Newsletter.objects.create(
+            title="Cached Newsletter",
+            slug="cached-newsletter",
+            content="Content",
+            excerpt="Excerpt",
+            published=True
+        )
+        self.url = reverse('core:newsletter_list')
+
+    def test_repeat_request_is_served_without_queries(self):
+        """Test a cache hit skips the database and returns identical bytes"""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+
+    def test_save_invalidates_cached_response(self):
+        """Test saving content is visible on the next request"""
+        self.client.get(self.url)
+        self.newsletter.title = "Renamed Newsletter"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newsletter.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()['results'][0]['title'], "Renamed Newsletter")
+
+    def test_tagging_invalidates_cached_response(self):
+        """Test m2m tag changes bump the content version"""
+        self.client.get(self.url)
+        tag = Tag.objects.create(
+            name=LocalizedElement.objects.create(english="Science", spanish="Ciencia"),
+            slug="science"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newsletter.tags.add(tag)
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.json()['results'][0]['tags']), 1)
+
+    def test_podcast_publish_refreshes_category_count(self):
+        """Test the embedded category count covering podcasts is not served stale"""
+        category = Category.objects.create(
+            name=LocalizedElement.objects.create(english="Science", spanish="Ciencia"),
+            slug="science"
+        )
+        self.newsletter.category = category
+        self.newsletter.save()
+        self.assertEqual(self.client.get(self.url).json()['results'][0]['category']['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PodcastEpisode.objects.create(title="Episode", slug="episode", description="D", published=True, category=category)
+        self.assertEqual(self.client.get(self.url).json()['results'][0]['category']['count'], 2)
+
+    def test_matching_etag_returns_304_without_queries(self):
+        """Test If-None-Match revalidation skips the database and the body"""
+        first = self.client.get(self.url)
+        self.assertIn('ETag', first)
+        self.assertIn('Last-Modified', first)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since_returns_304(self):
+        """Test Last-Modified revalidation"""
+        first = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_when_content_changes(self):
+        """Test a stale ETag gets the new body"""
+        first = self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newsletter.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_count_update_moves_validators(self):
+        """Test stored counts written by UPDATE change the ETag and Last-Modified"""
+        category = Category.objects.create(
+            name=LocalizedElement.objects.create(english="Science", spanish="Ciencia"),
+            slug="science"
+        )
+        url = reverse('core:category_list')
+        first = self.client.get(url)
+        with mock.patch('core.cache.time.time', return_value=time.time() + 60), \
+                self.captureOnCommitCallbacks(execute=True):
+            refresh_category_counts([category.id])
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=first['ETag'], HTTP_IF_MODIFIED_SINCE=first['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, 200)
+
+    def test_query_parameters_are_part_of_the_key(self):
+        """Test different filters are cached separately"""
+        self.client.get(self.url)
+        response = self.client.get(self.url, {'language': 'spanish'})
+        self.assertEqual(response.json()['count'], 0)
+
+
 class APIMethodRestrictionsTest(APITestCase):
     """Test that endpoints only allow appropriate HTTP methods"""
     
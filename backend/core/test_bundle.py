@@ -0,0 +1,132 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from .models import LocalizedElement, Category, Tag, TextWidget, Newsletter, PodcastEpisode
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class BundleAPITest(APITestCase):
+    """Test cases for the /api/bundle/ endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(
+            name=LocalizedElement.objects.create(english="Science", spanish="Ciencia"),
+            slug="science"
+        )
+        Category.objects.create(
+            name=LocalizedElement.objects.create(english="Hidden", spanish="Oculta"),
+            slug="hidden",
+            is_active=False
+        )
+        cls.tags = [
+            Tag.objects.create(
+                name=LocalizedElement.objects.create(english=f"Tag {i}", spanish=f"Etiqueta {i}"),
+                slug=f"tag-{i}"
+            )
+            for i in range(3)
+        ]
+        for i in range(4):
+            newsletter = Newsletter.objects.create(
+                title=f"Newsletter {i}",
+                slug=f"newsletter-{i}",
+                content="Content",
+                excerpt="Excerpt",
+                published=True,
+                published_at=timezone.now() - timezone.timedelta(days=i),
+                category=cls.category
+            )
+            newsletter.tags.set(cls.tags[:i])
+            episode = PodcastEpisode.objects.create(
+                title=f"Episode {i}",
+                slug=f"episode-{i}",
+                description="Description",
+                published=True,
+                publish_date=(timezone.now() - timezone.timedelta(days=i)).date(),
+                category=cls.category
+            )
+            episode.tags.set(cls.tags[i:])
+        TextWidget.objects.create(
+            title=LocalizedElement.objects.create(english="About", spanish="Acerca"),
+            content=LocalizedElement.objects.create(english="Text", spanish="Texto")
+        )
+        cls.url = reverse('core:bundle')
+
+    def test_returns_every_collection_by_default(self):
+        """Test all collections are present with the expected shapes"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(
+            set(data),
+            {'newsletters', 'podcasts', 'categories', 'tags', 'archives', 'text_widgets'}
+        )
+        self.assertEqual([item['slug'] for item in data['categories']], ['science'])
+        self.assertEqual(len(data['tags']), 3)
+        self.assertEqual(len(data['text_widgets']), 1)
+        self.assertTrue(data['archives'])
+        self.assertTrue(all(item['count'] > 0 for item in data['archives']))
+
+    def test_content_matches_list_endpoints(self):
+        """Test newsletters and podcasts serialize exactly as their list endpoints"""
+        data = self.client.get(self.url, {'page_size': 3}).json()
+        listed = self.client.get(reverse('core:newsletter_list'), {'pagination': 'cursor', 'page_size': 3}).json()
+        self.assertEqual(data['newsletters']['results'], listed['results'])
+        listed = self.client.get(reverse('core:podcast_episodes_list'), {'pagination': 'cursor', 'page_size': 3}).json()
+        self.assertEqual(data['podcasts']['results'], listed['results'])
+
+    def test_next_link_continues_on_list_endpoint(self):
+        """Test the next cursor link returns the remaining items"""
+        data = self.client.get(self.url, {'include': 'newsletters', 'page_size': 3}).json()
+        self.assertEqual(set(data), {'newsletters'})
+        next_link = data['newsletters']['next']
+        self.assertTrue(next_link.startswith(reverse('core:newsletter_list')))
+
+        remaining = self.client.get(next_link).json()
+        self.assertEqual([item['slug'] for item in remaining['results']], ['newsletter-3'])
+
+    def test_fixed_query_count(self):
+        """Test the bundle shares category and tag queries across collections"""
+        # 2 content pages, 2 tag link lookups, categories, tags, archives
+        # and text widgets
+        with self.assertNumQueries(8):
+            response = self.client.get(self.url, {'page_size': 10})
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_collection_is_rejected(self):
+        """Test an unknown include name returns 400"""
+        response = self.client.get(self.url, {'include': 'newsletters,secrets'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('include', response.json())
+
+    def test_fields_are_projected_per_collection(self):
+        """Test ?fields= may mix fields of different collections"""
+        response = self.client.get(
+            self.url, {'include': 'newsletters,podcasts', 'fields': 'id,title,episode_number'}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(set(data['newsletters']['results'][0]), {'id', 'title'})
+        self.assertEqual(set(data['podcasts']['results'][0]), {'id', 'title', 'episode_number'})
+
+        response = self.client.get(self.url, {'include': 'newsletters,podcasts', 'fields': 'id,secret'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.json())
+
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_cached_until_an_included_model_changes(self):
+        """Test the combined payload is cached under every included model's version"""
+        cache.clear()
+        params = {'include': 'tags'}
+        self.client.get(self.url, params)
+        with self.assertNumQueries(0):
+            self.client.get(self.url, params)
+
+        self.tags[0].slug = 'renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tags[0].save()
+        data = self.client.get(self.url, params).json()
+        self.assertIn('renamed', [tag['slug'] for tag in data['tags']])
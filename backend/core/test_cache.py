@@ -0,0 +1,78 @@
+import threading
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from .cache import get_or_compute
+from .cache_backends import FailSafeRedisCache
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'stampede-test'}})
+class GetOrComputeTest(TestCase):
+    """Test cases for the stampede-protected cache helper"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_value_is_computed_once_and_cached(self):
+        """Test a hit does not call compute again"""
+        compute = mock.Mock(return_value=42)
+        self.assertEqual(get_or_compute('answer', compute, 60), 42)
+        self.assertEqual(get_or_compute('answer', compute, 60), 42)
+        compute.assert_called_once()
+
+    def test_cached_none_is_a_hit(self):
+        """Test None is a valid cached value"""
+        compute = mock.Mock(return_value=None)
+        get_or_compute('nothing', compute, 60)
+        get_or_compute('nothing', compute, 60)
+        compute.assert_called_once()
+
+    def test_waiters_use_the_lock_holders_result(self):
+        """Test callers that miss while another computes do not compute themselves"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_compute():
+            calls.append('slow')
+            started.set()
+            release.wait(2)
+            return 'fresh'
+
+        worker = threading.Thread(target=get_or_compute, args=('report', slow_compute, 60))
+        worker.start()
+        started.wait(2)
+
+        fallback = mock.Mock(return_value='duplicate')
+        threading.Timer(0.1, release.set).start()
+        self.assertEqual(get_or_compute('report', fallback, 60, wait_timeout=2), 'fresh')
+        worker.join()
+        fallback.assert_not_called()
+        self.assertEqual(calls, ['slow'])
+
+
+class FailSafeRedisCacheTest(TestCase):
+    """Test cases for the Redis cache fallback"""
+
+    def setUp(self):
+        # Nothing listens on port 1, so every call fails to connect
+        self.cache = FailSafeRedisCache('redis://127.0.0.1:1/0', {
+            'OPTIONS': {'socket_connect_timeout': 0.1, 'RETRY_AFTER': 60},
+        })
+
+    def test_unreachable_redis_behaves_like_an_empty_cache(self):
+        """Test reads miss and writes are dropped instead of raising"""
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.get('key', 'default'), 'default')
+        self.assertEqual(self.cache.get_many(['a', 'b']), {})
+        self.cache.set('key', 'value')
+        self.assertTrue(self.cache.add('lock', 1))
+        with self.assertRaises(ValueError):
+            self.cache.incr('counter')
+
+    def test_back_off_skips_redis_after_an_error(self):
+        """Test no further connection attempts are made during the back-off"""
+        self.cache.get('key')
+        with mock.patch('django.core.cache.backends.redis.RedisCache.get') as mock_get:
+            self.assertIsNone(self.cache.get('key'))
+        mock_get.assert_not_called()
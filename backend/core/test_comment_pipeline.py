@@ -0,0 +1,125 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from .comment_pipeline import drain_comment_submissions, moderate_comments, normalize_comment, spam_score
+from .models import Comment, CommentSubmission, Newsletter, PodcastEpisode
+
+
+class CommentPipelineTest(TestCase):
+    """Test cases for the queued comment ingest and batch moderation"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.newsletter = Newsletter.objects.create(title="N", slug="n", content="C", published=True)
+        cls.episode = PodcastEpisode.objects.create(title="E", slug="e", description="D", published=True)
+        cls.draft = Newsletter.objects.create(title="Draft", slug="draft", content="C", published=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def submit(self, ip='10.0.0.1', **fields):
+        payload = {
+            'content': "Really enjoyed this one", 'author_name': "Reader",
+            'author_email': "reader@example.com", 'author_website': None,
+            'newsletter': self.newsletter.id, 'podcast_episode': None,
+        }
+        payload.update(fields)
+        return CommentSubmission.objects.create(payload=payload, client_ip=ip)
+
+    def test_create_endpoint_queues_and_returns_202(self):
+        """Test a valid comment is queued without creating the comment"""
+        response = self.client.post(reverse('core:comment_create'), {
+            'content': "  Great newsletter, thanks!  ", 'author_name': "Reader",
+            'author_email': "Reader@Example.com", 'newsletter': self.newsletter.id,
+        }, REMOTE_ADDR='10.0.0.9')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'queued')
+        self.assertFalse(Comment.objects.exists())
+        submission = CommentSubmission.objects.get()
+        self.assertEqual(submission.client_ip, '10.0.0.9')
+        self.assertEqual(submission.payload['newsletter'], self.newsletter.id)
+
+    def test_create_endpoint_still_validates(self):
+        """Test invalid comments are rejected on the request"""
+        response = self.client.post(reverse('core:comment_create'), {
+            'content': "Too short", 'author_name': "Reader",
+            'author_email': "reader@example.com", 'newsletter': self.newsletter.id,
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CommentSubmission.objects.exists())
+
+    def test_normalize_comment(self):
+        """Test whitespace, email and website are canonicalized"""
+        fields = normalize_comment({
+            'content': "  Nice   piece \n of  work  ", 'author_name': " Jane  Doe ",
+            'author_email': " Jane@Example.COM ", 'author_website': "example.com",
+            'newsletter': 1, 'podcast_episode': None,
+        })
+        self.assertEqual(fields['content'], "Nice piece\nof work")
+        self.assertEqual(fields['author_name'], "Jane Doe")
+        self.assertEqual(fields['author_email'], "jane@example.com")
+        self.assertEqual(fields['author_website'], "https://example.com")
+        self.assertIsNone(normalize_comment({'content': "Long enough text", 'author_name': "Jane", 'author_email': "j@x.com"}))
+
+    def test_spam_score(self):
+        """Test links, keywords, shouting and floods raise the score"""
+        fields = normalize_comment({
+            'content': "Thoughtful and kind words", 'author_name': "Reader",
+            'author_email': "r@example.com", 'newsletter': 1,
+        })
+        self.assertEqual(spam_score(fields), 0)
+        fields['content'] = "BUY NOW cheap casino bonus http://a.example http://b.example"
+        self.assertGreaterEqual(spam_score(fields), 5)
+        fields['content'] = "Thoughtful and kind words"
+        self.assertEqual(spam_score(fields, submissions_from_ip=5), 2)
+        fields['content'] = "He loaned me the book, aiding and abetting my reading"
+        self.assertEqual(spam_score(fields), 0)
+
+    def test_drain_creates_pending_comments_in_bulk(self):
+        """Test the queue becomes pending comments with one INSERT"""
+        for i in range(5):
+            self.submit(content=f"Comment number {i} here", ip=f"10.0.0.{i}")
+        self.submit(podcast_episode=self.episode.id, newsletter=None)
+        with self.assertNumQueries(8):
+            # claim batch, live newsletters, live episodes, fingerprints, insert, delete
+            # inside a savepoint and its release
+            stats = drain_comment_submissions(batch_size=100)
+        self.assertEqual((stats['created'], stats['processed']), (6, 6))
+        self.assertFalse(CommentSubmission.objects.exists())
+        self.assertEqual(Comment.objects.filter(is_approved=False).count(), 6)
+        self.assertEqual(Comment.objects.filter(podcast_episode=self.episode).count(), 1)
+
+    def test_drain_drops_duplicates_and_dead_targets_and_flags_spam(self):
+        """Test repeated and orphaned submissions are dropped and spam is kept flagged"""
+        self.submit()
+        self.submit(content="really   ENJOYED this one")  # same comment, normalized
+        self.submit(content="Click here for casino bonus http://x.example http://y.example")
+        self.submit(newsletter=self.draft.id)
+        self.submit(author_email="other@example.com", content="Different and welcome")
+
+        stats = drain_comment_submissions(batch_size=2)
+        self.assertEqual(stats, {'created': 3, 'invalid': 1, 'duplicate': 1, 'spam': 1, 'processed': 5})
+        flagged = Comment.objects.get(spam_score__gte=5)
+        self.assertFalse(flagged.is_approved)
+        self.assertIn("casino", flagged.content)
+
+        # Resubmitting an already stored comment is a duplicate too
+        self.submit()
+        self.assertEqual(drain_comment_submissions()['duplicate'], 1)
+        self.assertEqual(Comment.objects.count(), 3)
+
+    def test_moderate_comments_in_batches(self):
+        """Test batch approval and rejection update counts for every item"""
+        for i in range(3):
+            self.submit(content=f"Comment number {i} here")
+        self.submit(podcast_episode=self.episode.id, newsletter=None)
+        drain_comment_submissions()
+        ids = list(Comment.objects.values_list('id', flat=True))
+
+        self.assertEqual(moderate_comments(ids, True, batch_size=2), 4)
+        self.newsletter.refresh_from_db()
+        self.episode.refresh_from_db()
+        self.assertEqual((self.newsletter.approved_comment_count, self.episode.approved_comment_count), (3, 1))
+
+        moderate_comments(ids[:2], False)
+        self.assertEqual(Comment.objects.filter(is_approved=True).count(), 2)
@@ -5,7 +5,8 @@ from io import StringIO
 from django.test import TestCase
 from django.core.management import call_command
 from django.contrib.auth.models import User
-from .models import Newsletter, PodcastEpisode, EmailSignup
+from datetime import date
+from .models import Newsletter, PodcastEpisode, EmailSignup, Category, LocalizedElement, Archive
 
 
 class CreateAdminCommandTest(TestCase):
@@ -308,4 +309,66 @@ class RestoreDataCommandTest(TestCase):
         )
         
         output = out.getvalue()
-        self.assertIn('❌ Backup directory does not exist', output) 
\ No newline at end of file
+        self.assertIn('❌ Backup directory does not exist', output)
+
+
+class RebuildCategoryCountsCommandTest(TestCase):
+    """Test cases for rebuild_category_counts management command"""
+
+    def test_rebuild_repairs_drifted_counts(self):
+        """Test stored counts are recomputed from published content"""
+        category = Category.objects.create(
+            name=LocalizedElement.objects.create(english="News", spanish="Noticias"),
+            slug="news"
+        )
+        Newsletter.objects.create(
+            title="Published", slug="published", content="Content", excerpt="Excerpt",
+            published=True, category=category
+        )
+        Category.objects.filter(pk=category.pk).update(count=42, count_english=42, count_spanish=42)
+
+        out = StringIO()
+        call_command('rebuild_category_counts', stdout=out)
+
+        category.refresh_from_db()
+        self.assertEqual((category.count, category.count_english, category.count_spanish), (1, 1, 0))
+        self.assertIn('✅ Rebuilt counts for 1 categories', out.getvalue())
+
+
+class RebuildArchivesCommandTest(TestCase):
+    """Test cases for rebuild_archives management command"""
+
+    def test_rebuild_replaces_hand_curated_counts(self):
+        """Test archives are rebuilt from published content across both tables"""
+        for i, publish_date in enumerate([date(2024, 1, 5), date(2024, 1, 20), date(2024, 2, 1)]):
+            PodcastEpisode.objects.create(
+                title=f"Episode {i}", slug=f"episode-{i}", description="Description",
+                publish_date=publish_date, published=True
+            )
+        Archive.objects.all().delete()
+        Archive.objects.create(year=2023, month=12, count=7)
+
+        out = StringIO()
+        call_command('rebuild_archives', stdout=out)
+
+        counts = {(a.year, a.month): a.count for a in Archive.objects.all()}
+        self.assertEqual(counts, {(2023, 12): 0, (2024, 1): 2, (2024, 2): 1})
+        self.assertIn('✅ Rebuilt archives (3 created or updated)', out.getvalue())
+
+
+class BackfillDerivedTextCommandTest(TestCase):
+    """Test cases for backfill_derived_text management command"""
+
+    def test_backfill_populates_missing_fields(self):
+        """Test rows saved without derived text are filled in"""
+        episode = PodcastEpisode.objects.create(
+            title="<b>Episode</b>", slug="episode", description="Description", script="<p>One two three</p>"
+        )
+        PodcastEpisode.objects.filter(pk=episode.pk).update(title_text="", script_snippet="", word_count=0)
+
+        out = StringIO()
+        call_command('backfill_derived_text', stdout=out)
+
+        episode.refresh_from_db()
+        self.assertEqual((episode.title_text, episode.script_snippet, episode.word_count), ("Episode", "One two three", 3))
+        self.assertIn('✅ Updated derived text for 1 podcast episodes', out.getvalue())
@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from .media import RangeFile, parse_range, serve_media
+
+CONTENT = b'0123456789abcdefghij'
+
+
+class MediaServeTest(SimpleTestCase):
+    """Test cases for the production media view"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        os.makedirs(os.path.join(self.root, 'covers'))
+        for name in ('covers/plain.jpg', 'covers/cover.3f2a9c1b.jpg', 'covers/IMG_20240101.jpg'):
+            with open(os.path.join(self.root, name), 'wb') as media_file:
+                media_file.write(CONTENT)
+        settings_override = override_settings(MEDIA_ROOT=self.root, MEDIA_SERVE_MODE='', MEDIA_MAX_AGE=600)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.factory = RequestFactory()
+
+    def get(self, path, method='get', **headers):
+        response = serve_media(getattr(self.factory, method)('/media/' + path, **headers), path)
+        if response.streaming:
+            self.addCleanup(response.close)
+        return response
+
+    def body(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_full_file(self):
+        """Test a plain GET streams the file with validators and a short max-age"""
+        response = self.get('covers/plain.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Content-Length'], str(len(CONTENT)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=600')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_hashed_name_is_immutable(self):
+        """Test content-hashed file names are cached for a year"""
+        response = self.get('covers/cover.3f2a9c1b.jpg')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        # Date-stamped names are not content hashes
+        self.assertEqual(self.get('covers/IMG_20240101.jpg')['Cache-Control'], 'public, max-age=600')
+
+    def test_conditional_get(self):
+        """Test matching validators revalidate with an empty 304"""
+        response = self.get('covers/plain.jpg')
+        self.assertEqual(self.get('covers/plain.jpg', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        not_modified = self.get('covers/plain.jpg', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+    def test_byte_ranges(self):
+        """Test single byte ranges return 206 with only the requested bytes"""
+        for header, body, content_range in (
+            ('bytes=2-5', b'2345', 'bytes 2-5/20'),
+            ('bytes=15-', b'fghij', 'bytes 15-19/20'),
+            ('bytes=-3', b'hij', 'bytes 17-19/20'),
+            ('bytes=18-99', b'ij', 'bytes 18-19/20'),
+        ):
+            response = self.get('covers/plain.jpg', HTTP_RANGE=header)
+            self.assertEqual(response.status_code, 206, header)
+            self.assertEqual(response['Content-Range'], content_range)
+            self.assertEqual(response['Content-Length'], str(len(body)))
+            self.assertEqual(self.body(response), body)
+
+    def test_unsatisfiable_and_ignored_ranges(self):
+        """Test ranges past the end are 416 and multi-ranges get the whole file"""
+        response = self.get('covers/plain.jpg', HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */20')
+        self.assertEqual(self.get('covers/plain.jpg', HTTP_RANGE='bytes=0-1,4-5').status_code, 200)
+        self.assertEqual(self.get('covers/plain.jpg', HTTP_RANGE='lines=1-2').status_code, 200)
+
+    def test_if_range(self):
+        """Test a range is served only for the representation the client holds"""
+        etag = self.get('covers/plain.jpg')['ETag']
+        self.assertEqual(self.get('covers/plain.jpg', HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE=etag).status_code, 206)
+        stale = self.get('covers/plain.jpg', HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(self.body(stale), CONTENT)
+
+    def test_head(self):
+        """Test HEAD returns the headers of a GET without a body"""
+        response = self.get('covers/plain.jpg', method='head', HTTP_RANGE='bytes=0-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Length'], '4')
+        self.assertEqual(response.content, b'')
+
+    def test_range_file_supports_sendfile(self):
+        """Test the ranged file exposes its descriptor at the range start"""
+        range_file = RangeFile(os.path.join(self.root, 'covers/plain.jpg'), 5, 3)
+        self.addCleanup(range_file.close)
+        self.assertEqual(os.lseek(range_file.fileno(), 0, os.SEEK_CUR), 5)
+        self.assertEqual(range_file.read(), b'567')
+        self.assertEqual(range_file.read(), b'')
+
+    def test_missing_and_unsafe_paths(self):
+        """Test missing files, directories and traversal are 404"""
+        for path in ('covers/missing.jpg', 'covers', '../etc/passwd', '/etc/passwd'):
+            with self.assertRaises(Http404, msg=path):
+                self.get(path)
+
+    def test_x_accel_redirect(self):
+        """Test nginx offload returns only headers and the internal location"""
+        with self.settings(MEDIA_SERVE_MODE='x-accel-redirect', MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/'):
+            response = self.get('covers/cover.3f2a9c1b.jpg')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/covers/cover.3f2a9c1b.jpg')
+        self.assertEqual(response.content, b'')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_x_sendfile(self):
+        """Test X-Sendfile offload points at the absolute file path"""
+        with self.settings(MEDIA_SERVE_MODE='x-sendfile'):
+            response = self.get('covers/plain.jpg')
+        self.assertEqual(response['X-Sendfile'], os.path.join(self.root, 'covers', 'plain.jpg'))
+        self.assertEqual(response.content, b'')
+
+    def test_parse_range(self):
+        """Test Range header parsing edge cases"""
+        self.assertEqual(parse_range('bytes=0-0', 10), (0, 0))
+        self.assertIsNone(parse_range('bytes=5-2', 10))
+        self.assertIsNone(parse_range('bytes=a-b', 10))
+        self.assertIs(parse_range('bytes=-0', 10), False)
+        self.assertIs(parse_range('bytes=0-', 0), False)
@@ -3,7 +3,11 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.contrib.auth.models import User
 from datetime import date, timedelta
-from .models import Newsletter, PodcastEpisode, EmailSignup, Category, LocalizedElement
+from unittest import mock
+from django.contrib.admin.sites import site
+from .admin import CommentAdmin
+from .models import Newsletter, PodcastEpisode, EmailSignup, Category, LocalizedElement, Archive, Comment
+from .utils.text import make_snippet
 
 
 class NewsletterModelTest(TestCase):
@@ -224,4 +228,201 @@ class EmailSignupModelTest(TestCase):
     def test_default_source(self):
         """Test default source value"""
         signup = EmailSignup.objects.create(email="noSource@example.com")
-        self.assertEqual(signup.source, "website") 
\ No newline at end of file
+        self.assertEqual(signup.source, "website")
+
+
+class CategoryCountTest(TestCase):
+    """Test cases for the stored Category counts"""
+
+    def setUp(self):
+        self.news = Category.objects.create(
+            name=LocalizedElement.objects.create(english="News", spanish="Noticias"),
+            slug="news"
+        )
+        self.science = Category.objects.create(
+            name=LocalizedElement.objects.create(english="Science", spanish="Ciencia"),
+            slug="science"
+        )
+
+    def _create_newsletter(self, slug, **kwargs):
+        defaults = {'title': slug, 'content': "Content", 'excerpt': "Excerpt", 'category': self.news}
+        defaults.update(kwargs)
+        return Newsletter.objects.create(slug=slug, **defaults)
+
+    def test_counts_follow_publish_and_unpublish(self):
+        """Test counts only include published items"""
+        newsletter = self._create_newsletter("draft")
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.count, 0)
+
+        newsletter.published = True
+        newsletter.save()
+        self.news.refresh_from_db()
+        self.assertEqual((self.news.count, self.news.count_english, self.news.count_spanish), (1, 1, 0))
+
+        newsletter.published = False
+        newsletter.save()
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.count, 0)
+
+    def test_counts_break_down_by_language(self):
+        """Test per-language counts across newsletters and episodes"""
+        self._create_newsletter("english", published=True)
+        self._create_newsletter("both", published=True, available_in_spanish=True)
+        PodcastEpisode.objects.create(
+            title="Episodio", slug="episodio", description="Description", script="Script",
+            episode_number=1, published=True, category=self.news,
+            available_in_english=False, available_in_spanish=True
+        )
+        self.news.refresh_from_db()
+        self.assertEqual((self.news.count, self.news.count_english, self.news.count_spanish), (3, 2, 2))
+
+    def test_moving_category_updates_both_categories(self):
+        """Test the old and new categories are refreshed on a move"""
+        newsletter = self._create_newsletter("moving", published=True)
+        newsletter.category = self.science
+        newsletter.save()
+
+        self.news.refresh_from_db()
+        self.science.refresh_from_db()
+        self.assertEqual(self.news.count, 0)
+        self.assertEqual(self.science.count, 1)
+
+    def test_delete_updates_count(self):
+        """Test deleting a published item decrements the count"""
+        newsletter = self._create_newsletter("deleted", published=True)
+        newsletter.delete()
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.count, 0)
+
+
+class ArchiveRollupTest(TestCase):
+    """Test cases for automatically maintained archives"""
+
+    def _create_episode(self, slug, publish_date, **kwargs):
+        return PodcastEpisode.objects.create(
+            title=slug, slug=slug, description="Description", script="Script",
+            publish_date=publish_date, **kwargs
+        )
+
+    def _counts(self):
+        return {(a.year, a.month): a.count for a in Archive.objects.all()}
+
+    def test_publishing_creates_and_updates_bucket(self):
+        """Test publishing items fills their (year, month) bucket"""
+        episode = self._create_episode("draft", date(2024, 3, 10))
+        self.assertEqual(self._counts(), {})
+
+        episode.published = True
+        episode.save()
+        self._create_episode("second", date(2024, 3, 20), published=True)
+        self.assertEqual(self._counts(), {(2024, 3): 2})
+
+    def test_unpublish_move_and_delete_update_buckets(self):
+        """Test the old bucket is decremented when an item leaves it"""
+        episode = self._create_episode("moving", date(2024, 3, 10), published=True)
+        episode.publish_date = date(2024, 4, 1)
+        episode.save()
+        self.assertEqual(self._counts(), {(2024, 3): 0, (2024, 4): 1})
+
+        episode.published = False
+        episode.save()
+        self.assertEqual(self._counts()[(2024, 4)], 0)
+
+        episode.published = True
+        episode.save()
+        episode.delete()
+        self.assertEqual(self._counts()[(2024, 4)], 0)
+
+    def test_newsletters_count_by_published_month(self):
+        """Test newsletters land in the month they were published"""
+        Newsletter.objects.create(title="N", slug="n", content="Content", excerpt="Excerpt", published=True)
+        now = timezone.localtime()
+        self.assertEqual(self._counts(), {(now.year, now.month): 1})
+
+
+class DerivedTextTest(TestCase):
+    """Test cases for plain-text fields derived on save"""
+
+    def test_newsletter_derived_fields(self):
+        """Test title, excerpt snippet and reading time are stored on save"""
+        newsletter = Newsletter.objects.create(
+            title="<p>The <em>Hybrid</em> Protocol</p>",
+            slug="derived",
+            excerpt="<p>First&nbsp;paragraph</p><p>Second</p>",
+            content="<p>" + "word " * 450 + "</p>"
+        )
+        self.assertEqual(newsletter.title_text, "The Hybrid Protocol")
+        self.assertEqual(newsletter.excerpt_text, "First paragraph Second")
+        self.assertEqual(newsletter.word_count, 450)
+        self.assertEqual(newsletter.reading_time_minutes, 3)
+
+    def test_update_fields_save_refreshes_derived_fields(self):
+        """Test saving only a source field also writes the derived fields"""
+        episode = PodcastEpisode.objects.create(
+            title="Episode", slug="derived-episode", description="Description", script="<p>Old</p>"
+        )
+        episode.script = "<p>New script</p>"
+        episode.save(update_fields=['script'])
+
+        episode.refresh_from_db()
+        self.assertEqual(episode.script_snippet, "New script")
+        self.assertEqual(episode.word_count, 2)
+
+    def test_snippet_cut_on_word_boundary(self):
+        """Test snippets end on a whole word and fall back to a hard cut"""
+        self.assertEqual(make_snippet("hello wonderful world", 14), "hello…")
+        self.assertEqual(make_snippet("hello wonderful world", 16), "hello wonderful…")
+        self.assertEqual(make_snippet("hello wonderful world", 21), "hello wonderful world")
+        self.assertEqual(make_snippet("supercalifragilistic", 6), "super…")
+
+
+class CommentCountTest(TestCase):
+    """Test cases for the stored approved_comment_count"""
+
+    def setUp(self):
+        self.newsletter = Newsletter.objects.create(title="N", slug="n", content="C", published=True)
+        self.episode = PodcastEpisode.objects.create(title="E", slug="e", description="D", published=True)
+
+    def _comment(self, **kwargs):
+        defaults = {'content': "Great episode, thanks", 'author_name': "Reader", 'author_email': "reader@example.com"}
+        defaults.update(kwargs)
+        return Comment.objects.create(**defaults)
+
+    def counts(self):
+        self.newsletter.refresh_from_db()
+        self.episode.refresh_from_db()
+        return self.newsletter.approved_comment_count, self.episode.approved_comment_count
+
+    def test_only_approved_comments_count(self):
+        """Test pending comments leave the count alone until approved"""
+        comment = self._comment(newsletter=self.newsletter)
+        self._comment(podcast_episode=self.episode, is_approved=True)
+        self.assertEqual(self.counts(), (0, 1))
+
+        comment.is_approved = True
+        comment.save()
+        self.assertEqual(self.counts(), (1, 1))
+
+        comment.is_approved = False
+        comment.save()
+        self.assertEqual(self.counts(), (0, 1))
+
+    def test_delete_updates_count(self):
+        """Test deleting an approved comment decrements the count"""
+        comment = self._comment(newsletter=self.newsletter, is_approved=True)
+        comment.delete()
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_admin_actions_update_counts_in_bulk(self):
+        """Test approve/reject admin actions refresh every affected item"""
+        for _ in range(2):
+            self._comment(newsletter=self.newsletter)
+        self._comment(podcast_episode=self.episode)
+        comment_admin = CommentAdmin(Comment, site)
+        with mock.patch.object(comment_admin, 'message_user'):
+            comment_admin.approve_comments(None, Comment.objects.filter(is_approved=False))
+            self.assertEqual(self.counts(), (2, 1))
+
+            comment_admin.reject_comments(None, Comment.objects.filter(newsletter=self.newsletter))
+            self.assertEqual(self.counts(), (0, 1))
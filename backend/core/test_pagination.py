@@ -1,8 +1,10 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.utils import timezone
-from core.models import Newsletter, PodcastEpisode
+from datetime import timedelta
+from core.models import Newsletter, PodcastEpisode, Comment
 from core.serializers import NewsletterListSerializer, PodcastEpisodeListSerializer
+from core.pagination import encode_cursor
 import json
 
 
@@ -375,4 +377,141 @@ class PaginationTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertEqual(data['count'], 3)  # 3 Spanish newsletters
-        self.assertEqual(len(data['results']), 3) 
\ No newline at end of file
+        self.assertEqual(len(data['results']), 3) 
+
+class CursorPaginationTestCase(TestCase):
+    """Test keyset (cursor) pagination for newsletters and podcasts"""
+
+    def setUp(self):
+        # Several items share a date so the id tie-breaker is exercised
+        published_at = timezone.now()
+        for i in range(9):
+            Newsletter.objects.create(
+                title=f"Newsletter {i+1}",
+                slug=f"newsletter-{i+1}",
+                excerpt="Excerpt",
+                content="Content",
+                published=True,
+                published_at=published_at - timedelta(days=i // 3)
+            )
+            PodcastEpisode.objects.create(
+                title=f"Podcast {i+1}",
+                slug=f"podcast-{i+1}",
+                description="Description",
+                publish_date=(published_at - timedelta(days=i // 3)).date(),
+                published=True
+            )
+
+    def _walk(self, url):
+        """Follow next links and return every slug in order"""
+        slugs = []
+        path = url.split('?')[0]
+        while url:
+            data = self.client.get(url).json()
+            self.assertNotIn('count', data)
+            slugs.extend(item['slug'] for item in data['results'])
+            url = f"{path}{data['next']}" if data['next'] else None
+        return slugs
+
+    def test_cursor_walk_returns_every_item_once_in_order(self):
+        """Test following next cursors visits all items newest first"""
+        for path, model, date_field in [
+            ('/api/newsletters/', Newsletter, 'published_at'),
+            ('/api/podcast-episodes/', PodcastEpisode, 'publish_date'),
+        ]:
+            with self.subTest(path=path):
+                expected = list(
+                    model.objects.order_by(f'-{date_field}', '-id').values_list('slug', flat=True)
+                )
+                self.assertEqual(self._walk(f'{path}?pagination=cursor&page_size=2'), expected)
+
+    def test_previous_cursor_returns_prior_page(self):
+        """Test the previous link walks back to the page before"""
+        first = self.client.get('/api/newsletters/?pagination=cursor&page_size=4').json()
+        self.assertIsNone(first['previous'])
+        second = self.client.get(f"/api/newsletters/{first['next']}").json()
+        back = self.client.get(f"/api/newsletters/{second['previous']}").json()
+        self.assertEqual(back['results'], first['results'])
+
+    def test_include_count_and_page_size_cap(self):
+        """Test the optional total and the page size upper bound"""
+        with self.settings(API_MAX_PAGE_SIZE=5):
+            data = self.client.get('/api/newsletters/?pagination=cursor&page_size=100&include_count=true').json()
+            self.assertEqual(data['count'], 9)
+            self.assertEqual(len(data['results']), 5)
+
+            data = self.client.get('/api/newsletters/?page=1&page_size=100').json()
+            self.assertEqual(len(data['results']), 5)
+
+    def test_invalid_cursor_is_rejected(self):
+        """Test a malformed cursor returns 400"""
+        response = self.client.get('/api/newsletters/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+    def test_tampered_cursor_position_is_rejected(self):
+        """Test well-formed tokens with bad key values return 400 on every list"""
+        newsletter = Newsletter.objects.first()
+        comments = f'/api/comments/?content_type=newsletter&content_id={newsletter.id}&'
+        for position in (
+            ["garbage", 1],
+            ["2024-01-01T00:00:00", "abc"],
+            [None, None],
+            [{"a": 1}, 2],
+            ["2024-01-01", 1, 2],
+        ):
+            for prefix in ('/api/newsletters/?', '/api/podcast-episodes/?', comments):
+                with self.subTest(position=position, url=prefix):
+                    response = self.client.get(f'{prefix}cursor={encode_cursor(position)}')
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn('cursor', response.json())
+
+
+class CommentPaginationTestCase(TestCase):
+    """Test offset and keyset pagination of the comment list"""
+
+    def setUp(self):
+        self.newsletter = Newsletter.objects.create(title="N", slug="n", content="C", published=True)
+        created_at = timezone.now()
+        for i in range(7):
+            comment = Comment.objects.create(
+                content=f"Interesting comment {i}", author_name="Reader", author_email="reader@example.com",
+                newsletter=self.newsletter, is_approved=i != 6
+            )
+            # Pairs share a timestamp so the id tie-breaker is exercised
+            Comment.objects.filter(pk=comment.pk).update(created_at=created_at - timedelta(minutes=i // 2))
+        self.url = f"/api/comments/?content_type=newsletter&content_id={self.newsletter.id}"
+
+    def test_cursor_walk_returns_every_approved_comment_once(self):
+        """Test following next cursors visits approved comments newest first"""
+        expected = list(
+            Comment.objects.filter(is_approved=True).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        ids = []
+        url = f"{self.url}&pagination=cursor&page_size=2"
+        while url:
+            data = self.client.get(url).json()
+            self.assertNotIn('count', data)
+            ids.extend(item['id'] for item in data['results'])
+            url = f"/api/comments/{data['next']}" if data['next'] else None
+        self.assertEqual(ids, expected)
+
+    def test_offset_pages_by_default(self):
+        """Test the default response keeps the count and 20 comments per page"""
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['count'], 6)
+        self.assertEqual(len(data['results']), 6)
+        self.assertIsNone(data['next'])
+
+    def test_offset_next_link_keeps_filters(self):
+        """Test following offset next links stays on the same content's comments"""
+        expected = list(
+            Comment.objects.filter(is_approved=True).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        ids = []
+        url = f"{self.url}&page_size=4"
+        while url:
+            data = self.client.get(url).json()
+            self.assertEqual(data['count'], 6)
+            ids.extend(item['id'] for item in data['results'])
+            url = f"/api/comments/{data['next']}" if data['next'] else None
+        self.assertEqual(ids, expected)
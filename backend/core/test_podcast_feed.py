@@ -0,0 +1,105 @@
+import xml.etree.ElementTree as ET
+from datetime import date
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from .models import PodcastEpisode
+from .podcast_feed import ITUNES_NS, render_feed_item
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class PodcastFeedTest(TestCase):
+    """Test cases for the podcast RSS feed built from stored item fragments"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = PodcastEpisode.objects.create(
+            title="<b>First</b> & best", slug="first", description="<p>Intro &amp; more</p>",
+            published=True, publish_date=date(2025, 1, 1), episode_number=1, duration="00:42:00",
+            audio_url="https://cdn.example.com/first.mp3", audio_size=1234
+        )
+        cls.second = PodcastEpisode.objects.create(
+            title="Second", slug="second", description="D", published=True, publish_date=date(2025, 2, 1)
+        )
+        cls.draft = PodcastEpisode.objects.create(
+            title="Draft", slug="draft", description="D", published=False, publish_date=date(2025, 3, 1)
+        )
+
+    def fetch_feed(self, **headers):
+        return self.client.get(reverse('core:podcast_feed'), **headers)
+
+    def test_item_rendered_on_create(self):
+        """Test a new episode stores its <item> with a guid built from its id"""
+        self.first.refresh_from_db()
+        item = ET.fromstring(
+            f'<rss xmlns:itunes="{ITUNES_NS}">{self.first.feed_item}</rss>'
+        ).find('item')
+        self.assertEqual(item.findtext('title'), "First & best")
+        self.assertEqual(item.findtext('guid'), f"podcast-episode-{self.first.id}")
+        self.assertEqual(item.findtext('pubDate'), "Wed, 01 Jan 2025 00:00:00 +0000")
+        self.assertEqual(item.findtext(f'{{{ITUNES_NS}}}duration'), "00:42:00")
+        self.assertEqual(item.find('enclosure').attrib, {
+            'url': "https://cdn.example.com/first.mp3", 'length': '1234', 'type': 'audio/mpeg'
+        })
+
+    def test_item_rendered_from_string_date(self):
+        """Test an unsaved string publish_date is parsed before rendering"""
+        episode = PodcastEpisode.objects.create(
+            title="Later", slug="later", description="D", published=True, publish_date="2025-12-31"
+        )
+        self.assertIn("<pubDate>Wed, 31 Dec 2025 00:00:00 +0000</pubDate>", episode.feed_item)
+
+    def test_feed_lists_published_episodes_newest_first(self):
+        """Test the feed is valid RSS holding only published episodes"""
+        response = self.fetch_feed()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/rss+xml; charset=utf-8')
+        channel = ET.fromstring(response.content).find('channel')
+        self.assertEqual(
+            [item.findtext('link').rsplit('/', 1)[1] for item in channel.findall('item')],
+            ['second', 'first']
+        )
+
+    def test_feed_does_not_render_items(self):
+        """Test serving the feed only concatenates stored fragments"""
+        with mock.patch('core.models.render_feed_item') as render:
+            self.assertEqual(self.fetch_feed().status_code, 200)
+        render.assert_not_called()
+
+    def test_save_rerenders_only_that_episode(self):
+        """Test saving one episode re-renders its fragment and no other"""
+        with mock.patch('core.models.render_feed_item', wraps=render_feed_item) as render:
+            self.second.title = "Second, renamed"
+            self.second.save()
+        render.assert_called_once_with(self.second)
+        self.assertIn("Second, renamed", PodcastEpisode.objects.get(id=self.second.id).feed_item)
+        self.assertIn(b"Second, renamed", self.fetch_feed().content)
+
+    def test_update_fields_rerender_only_for_feed_sources(self):
+        """Test partial saves re-render only when an item source field is saved"""
+        with mock.patch('core.models.render_feed_item', wraps=render_feed_item) as render:
+            self.second.published = False
+            self.second.save(update_fields=['published'])
+            render.assert_not_called()
+
+            self.second.duration = "01:00:00"
+            self.second.save(update_fields=['duration'])
+            render.assert_called_once()
+        self.assertIn("01:00:00", PodcastEpisode.objects.get(id=self.second.id).feed_item)
+
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_conditional_get(self):
+        """Test the feed carries ETag/Last-Modified and revalidates with a 304"""
+        cache.clear()
+        response = self.fetch_feed()
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(0):
+            not_modified = self.fetch_feed(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.save()
+        self.assertNotEqual(self.fetch_feed(HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
@@ -0,0 +1,284 @@
+import re
+from datetime import timedelta
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from .models import LocalizedElement, Category, Tag, TextWidget, Newsletter, PodcastEpisode, Comment, EmailSignup
+from .tasks import get_audience
+from .related import refresh_related_content
+from .pagination import encode_cursor
+
+
+class QueryCountTest(TestCase):
+    """
+    Test that API endpoints run a fixed number of queries regardless of page size
+
+    The test cache is a DummyCache, so every request misses the response
+    cache and is served without version-derived validators.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories = [
+            Category.objects.create(
+                name=LocalizedElement.objects.create(english=f"Category {i}", spanish=f"Categoría {i}"),
+                slug=f"category-{i}"
+            )
+            for i in range(3)
+        ]
+        cls.tags = [
+            Tag.objects.create(
+                name=LocalizedElement.objects.create(english=f"Tag {i}", spanish=f"Etiqueta {i}"),
+                slug=f"tag-{i}"
+            )
+            for i in range(4)
+        ]
+        for i in range(12):
+            newsletter = Newsletter.objects.create(
+                title=f"Newsletter {i}",
+                slug=f"newsletter-{i}",
+                content=f"Content {i}",
+                excerpt=f"Excerpt {i}",
+                published=True,
+                published_at=timezone.now(),
+                category=cls.categories[i % 3]
+            )
+            newsletter.tags.set(cls.tags[:(i % 4) + 1])
+
+            episode = PodcastEpisode.objects.create(
+                title=f"Episode {i}",
+                slug=f"episode-{i}",
+                description=f"Description {i}",
+                script=f"Script {i}",
+                episode_number=i + 1,
+                published=True,
+                category=cls.categories[i % 3]
+            )
+            episode.tags.set(cls.tags[:(i % 4) + 1])
+
+        for i in range(3):
+            TextWidget.objects.create(
+                title=LocalizedElement.objects.create(english=f"Widget {i}", spanish=f"Widget {i}"),
+                content=LocalizedElement.objects.create(english=f"Body {i}", spanish=f"Cuerpo {i}"),
+                order=i
+            )
+        refresh_related_content()
+
+    def assertConstantQueries(self, url, num, page_sizes=(2, 10)):
+        """Assert a list endpoint issues `num` queries for every page size"""
+        for page_size in page_sizes:
+            with self.subTest(page_size=page_size), self.assertNumQueries(num):
+                response = self.client.get(url, {'page_size': page_size})
+                self.assertEqual(response.status_code, 200)
+
+    def test_newsletter_list_queries(self):
+        """Test newsletter list: count, rows and tags"""
+        self.assertConstantQueries(reverse('core:newsletter_list'), 3)
+
+    def test_podcast_episode_list_queries(self):
+        """Test podcast list: count, rows and tags"""
+        self.assertConstantQueries(reverse('core:podcast_episodes_list'), 3)
+
+    def test_newsletter_detail_queries(self):
+        """Test newsletter detail: row, tags, related row and related items"""
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('core:newsletter_detail', kwargs={'slug': 'newsletter-5'}))
+        self.assertEqual(len(response.json()['tags']), 2)
+
+    def test_podcast_episode_detail_queries(self):
+        """Test podcast detail: row, tags, related row and related items"""
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('core:podcast_episodes_detail', kwargs={'slug': 'episode-3'}))
+        data = response.json()
+        self.assertEqual(len(data['tags']), 4)
+        self.assertEqual(data['category']['count'], 8)
+
+    def test_taxonomy_list_queries(self):
+        """Test category, tag and text widget lists"""
+        for name, num in [('core:category_list', 2), ('core:tag_list', 2), ('core:text_widget_list', 1)]:
+            with self.subTest(endpoint=name), self.assertNumQueries(num):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+
+
+class SparseFieldsetTest(TestCase):
+    """Test ?fields= limits both the output and the selected columns"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(
+            name=LocalizedElement.objects.create(english="Science", spanish="Ciencia"),
+            slug="science"
+        )
+        Newsletter.objects.create(
+            title="Newsletter", slug="newsletter", content="<p>Full body</p>" * 100,
+            excerpt="Excerpt", published=True, category=category
+        )
+        PodcastEpisode.objects.create(
+            title="Episode", slug="episode", description="Description",
+            script="<p>Transcript</p>" * 100, published=True, category=category
+        )
+
+    def _get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        return response.json(), sql
+
+    def test_fields_limit_output_and_columns(self):
+        """Test only the requested fields are serialized and selected"""
+        data, sql = self._get(reverse('core:newsletter_list'), {'fields': 'id,title'})
+        self.assertEqual(data['results'], [{'id': data['results'][0]['id'], 'title': 'Newsletter'}])
+        self.assertNotIn('"excerpt"', sql)
+        self.assertNotIn('core_newsletter_tags', sql)
+        self.assertNotIn('core_category', sql)
+
+    def test_detail_defers_content_unless_requested(self):
+        """Test the large content column is only loaded when asked for"""
+        url = reverse('core:newsletter_detail', kwargs={'slug': 'newsletter'})
+        data, sql = self._get(url, {'fields': 'title,category'})
+        self.assertEqual(set(data), {'title', 'category'})
+        self.assertEqual(data['category']['slug'], 'science')
+        self.assertNotIn('"content"', sql)
+
+        data, sql = self._get(url, {'fields': 'content'})
+        self.assertIn('Full body', data['content'])
+
+    def test_podcast_list_never_loads_full_script(self):
+        """Test the list serves the stored snippet instead of the script"""
+        data, sql = self._get(reverse('core:podcast_episodes_list'), {})
+        snippet = data['results'][0]['script_snippet']
+        self.assertTrue(snippet.startswith('Transcript Transcript'))
+        self.assertTrue(snippet.endswith('…'))
+        self.assertIn('"core_podcastepisode"."script_snippet"', sql)
+        self.assertNotIn('"core_podcastepisode"."script",', sql)
+
+    def test_unknown_field_is_rejected(self):
+        """Test an unknown field name returns 400"""
+        response = self.client.get(reverse('core:newsletter_list'), {'fields': 'title,secret'})
+        self.assertEqual(response.status_code, 400)
+
+
+class IndexUsageTest(TestCase):
+    """
+    Test the hot query shapes are served by indexes on a large dataset
+
+    Every query the public endpoints (and the send audience) issue against
+    the big tables is run through EXPLAIN; a sequential scan of one of
+    them fails the test.
+    """
+    LARGE_TABLES = ('core_newsletter', 'core_podcastepisode', 'core_comment', 'core_emailsignup')
+    ROWS = 2000
+    # The exact total of offset pagination counts most of the table, which
+    # the planner rightly does with a scan; cursor pagination skips it
+    ALLOWED_SCANS = re.compile(
+        r'SELECT COUNT\(\*\) AS "__count" FROM "(core_newsletter|core_podcastepisode)" WHERE "\1"\."published"'
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories = [
+            Category.objects.create(
+                name=LocalizedElement.objects.create(english=f"Category {i}", spanish=f"Categoría {i}"),
+                slug=f"category-{i}"
+            )
+            for i in range(20)
+        ]
+        now = timezone.now()
+        Newsletter.objects.bulk_create([
+            Newsletter(
+                title=f"Newsletter {i}", slug=f"newsletter-{i}", send_key=f"key-{i}",
+                content="Content", excerpt="Excerpt", category=cls.categories[i % 20],
+                published=i % 5 != 0, published_at=now - timedelta(hours=i) if i % 5 else None,
+                available_in_spanish=i % 10 == 1
+            )
+            for i in range(cls.ROWS)
+        ])
+        PodcastEpisode.objects.bulk_create([
+            PodcastEpisode(
+                title=f"Episode {i}", slug=f"episode-{i}", description="Description",
+                script="Script", category=cls.categories[i % 20], published=i % 5 != 0,
+                publish_date=(now - timedelta(days=i)).date(), available_in_spanish=i % 10 == 1
+            )
+            for i in range(cls.ROWS)
+        ])
+        cls.newsletter = Newsletter.objects.get(slug='newsletter-1')
+        cls.episode = PodcastEpisode.objects.get(slug='episode-1')
+        newsletter_ids = list(Newsletter.objects.values_list('id', flat=True))
+        episode_ids = list(PodcastEpisode.objects.values_list('id', flat=True))
+        Comment.objects.bulk_create([
+            Comment(
+                content="Comment", author_name="Reader", author_email=f"reader{i}@example.com",
+                is_approved=i % 3 != 0,
+                newsletter_id=newsletter_ids[i % cls.ROWS] if i % 2 else None,
+                podcast_episode_id=None if i % 2 else episode_ids[i % cls.ROWS]
+            )
+            for i in range(cls.ROWS * 2)
+        ])
+        EmailSignup.objects.bulk_create([
+            EmailSignup(
+                email=f"user{i}@example.com", email_normalized=f"user{i}@example.com",
+                is_subscribed=i % 7 != 0, bounce=i % 11 == 0
+            )
+            for i in range(cls.ROWS)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def explain(self, sql):
+        prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+    def assertNoSequentialScans(self, sql):
+        plan = self.explain(sql)
+        for table in self.LARGE_TABLES:
+            if connection.vendor == 'sqlite':
+                # "SCAN table" without "USING ... INDEX" reads every row
+                sequential = re.search(rf'\bSCAN {table}\b(?! USING)', plan)
+            else:
+                sequential = re.search(rf'Seq Scan on {table}\b', plan)
+            self.assertIsNone(sequential, f"Sequential scan of {table}:\n{sql}\n{plan}")
+
+    def assertRequestUsesIndexes(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        selects = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        for sql in selects:
+            if not self.ALLOWED_SCANS.fullmatch(sql):
+                self.assertNoSequentialScans(sql)
+
+    def test_content_lists(self):
+        """Test newsletter and podcast lists with each filter and pagination mode"""
+        for name in ('core:newsletter_list', 'core:podcast_episodes_list'):
+            url = reverse(name)
+            self.assertRequestUsesIndexes(url)
+            self.assertRequestUsesIndexes(url, {'page': 40})
+            self.assertRequestUsesIndexes(url, {'pagination': 'cursor'})
+            self.assertRequestUsesIndexes(url, {'category': 'category-3'})
+            self.assertRequestUsesIndexes(url, {'language': 'spanish'})
+
+    def test_content_details(self):
+        """Test detail lookups by slug"""
+        self.assertRequestUsesIndexes(reverse('core:newsletter_detail', kwargs={'slug': 'newsletter-1'}))
+        self.assertRequestUsesIndexes(reverse('core:podcast_episodes_detail', kwargs={'slug': 'episode-1'}))
+
+    def test_comment_lists(self):
+        """Test approved comments of one newsletter or episode"""
+        url = reverse('core:comment_list')
+        self.assertRequestUsesIndexes(url, {'content_type': 'newsletter', 'content_id': self.newsletter.id})
+        self.assertRequestUsesIndexes(url, {'content_type': 'podcast', 'content_id': self.episode.id})
+        self.assertRequestUsesIndexes(url, {
+            'content_type': 'newsletter', 'content_id': self.newsletter.id,
+            'cursor': encode_cursor([timezone.now().isoformat(), 1]),
+        })
+
+    def test_send_audience(self):
+        """Test the audience query used to snapshot recipients"""
+        self.assertNoSequentialScans(str(get_audience().values_list('id', flat=True).query))
@@ -0,0 +1,133 @@
+from datetime import date, timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from .models import LocalizedElement, Category, Tag, PodcastEpisode, Newsletter, RelatedContent
+from .related import refresh_related_content, schedule_related_refresh
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class RelatedContentTest(TestCase):
+    """Test cases for precomputed previous/next and related items"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.science = Category.objects.create(
+            name=LocalizedElement.objects.create(english="Science", spanish="Ciencia"),
+            slug="science"
+        )
+        cls.ai, cls.robots = [
+            Tag.objects.create(name=LocalizedElement.objects.create(english=name, spanish=name), slug=name.lower())
+            for name in ("AI", "Robots")
+        ]
+        start = date(2025, 1, 1)
+        cls.episodes = [
+            PodcastEpisode.objects.create(
+                title=f"Episode {i}", slug=f"episode-{i}", description="D",
+                published=True, publish_date=start + timedelta(days=i)
+            )
+            for i in range(5)
+        ]
+        first, second, third, fourth, _ = cls.episodes
+        first.tags.set([cls.ai, cls.robots])
+        second.tags.set([cls.ai])
+        third.category = cls.science
+        third.save()
+        fourth.tags.set([cls.ai, cls.robots])
+        fourth.category = cls.science
+        fourth.save()
+        cls.draft = PodcastEpisode.objects.create(
+            title="Draft", slug="draft", description="D", published=False, publish_date=start
+        )
+        cls.draft.tags.set([cls.ai, cls.robots])
+
+    def row(self, episode):
+        return RelatedContent.objects.get(content_type='podcast', object_id=episode.id)
+
+    def test_neighbours_follow_publication_order(self):
+        """Test previous/next are the adjacent published episodes by date"""
+        refresh_related_content(['podcast'])
+        first, second, *_, last = self.episodes
+        self.assertEqual((self.row(first).previous_id, self.row(first).next_id), (None, second.id))
+        self.assertEqual(self.row(second).previous_id, first.id)
+        self.assertIsNone(self.row(last).next_id)
+        self.assertFalse(RelatedContent.objects.filter(object_id=self.draft.id, content_type='podcast').exists())
+
+    def test_related_ranked_by_tag_and_category_overlap(self):
+        """Test shared tags outweigh a shared category and drafts never appear"""
+        refresh_related_content(['podcast'])
+        first, second, third, fourth, fifth = self.episodes
+        # fourth: 2 shared tags with first (4), 1 tag with second (2), category with third (1)
+        self.assertEqual(self.row(fourth).related_ids, [first.id, second.id, third.id])
+        # second: one shared tag with both first and fourth, the newer one wins the tie
+        self.assertEqual(self.row(second).related_ids, [fourth.id, first.id])
+        self.assertEqual(self.row(fifth).related_ids, [])
+
+    @override_settings(RELATED_CONTENT_COUNT=1)
+    def test_related_count_setting(self):
+        """Test RELATED_CONTENT_COUNT caps the related list"""
+        refresh_related_content(['podcast'])
+        self.assertEqual(self.row(self.episodes[3]).related_ids, [self.episodes[0].id])
+
+    def test_refresh_only_writes_changes(self):
+        """Test a second refresh is a no-op and unpublishing updates only affected rows"""
+        self.assertEqual(refresh_related_content(['podcast']), 5)
+        self.assertEqual(refresh_related_content(['podcast']), 0)
+
+        PodcastEpisode.objects.filter(id=self.episodes[4].id).update(published=False)
+        # the removed row, and the new last episode losing its next
+        self.assertEqual(refresh_related_content(['podcast']), 2)
+        self.assertIsNone(self.row(self.episodes[3]).next_id)
+
+    def test_detail_embeds_related_content(self):
+        """Test the detail response carries previous, next and related summaries"""
+        refresh_related_content(['podcast'])
+        first, second, *_ = self.episodes
+        response = self.client.get(reverse('core:podcast_episodes_detail', kwargs={'slug': second.slug}))
+        related = response.json()['related_content']
+        self.assertEqual(related['previous']['slug'], first.slug)
+        self.assertEqual(related['next']['slug'], 'episode-2')
+        self.assertEqual(related['next']['publish_date'], '2025-01-03')
+        self.assertEqual([item['slug'] for item in related['related']], ['episode-3', 'episode-0'])
+
+    def test_detail_without_computed_row(self):
+        """Test content not yet processed returns empty related content"""
+        newsletter = Newsletter.objects.create(title="New", slug="new", content="C", published=True)
+        response = self.client.get(reverse('core:newsletter_detail', kwargs={'slug': newsletter.slug}))
+        self.assertEqual(response.json()['related_content'], {'previous': None, 'next': None, 'related': []})
+
+
+@override_settings(CACHES=LOCMEM_CACHE, RELATED_CONTENT_DELAY=10)
+class ScheduleRelatedRefreshTest(TestCase):
+    """Test content changes queue one debounced related content refresh"""
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('core.tasks.refresh_related_content_task.apply_async')
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_publish_and_tagging_queue_one_refresh(self):
+        """Test saves and tag changes in a burst queue a single refresh per type"""
+        tag = Tag.objects.create(name=LocalizedElement.objects.create(english="AI", spanish="IA"), slug="ai")
+        with self.captureOnCommitCallbacks(execute=True):
+            newsletter = Newsletter.objects.create(title="Live", slug="live", content="C", published=True)
+            newsletter.tags.add(tag)
+        self.apply_async.assert_called_once_with(args=['newsletter'], countdown=10)
+
+    def test_draft_changes_do_not_refresh(self):
+        """Test drafts do not queue a refresh"""
+        with self.captureOnCommitCallbacks(execute=True):
+            Newsletter.objects.create(title="Draft", slug="draft", content="C", published=False)
+        self.apply_async.assert_not_called()
+
+    def test_runs_inline_when_queueing_fails(self):
+        """Test a broker outage falls back to refreshing in-process"""
+        self.apply_async.side_effect = ConnectionError("broker down")
+        Newsletter.objects.create(title="Live", slug="live", content="C", published=True)
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule_related_refresh('newsletter')
+        self.assertTrue(RelatedContent.objects.filter(content_type='newsletter').exists())
@@ -0,0 +1,48 @@
+import datetime
+import decimal
+import io
+import uuid
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from .renderers import ORJSONParser, ORJSONRenderer
+
+
+class ORJSONRendererTest(TestCase):
+    """Test cases for the orjson renderer and parser"""
+
+    def test_output_matches_drf_json_renderer(self):
+        """Test the rendered bytes are identical to DRF's stdlib renderer"""
+        data = {
+            'published_at': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2024, 5, 1, 12, 30),
+            'offset': datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+            'publish_date': datetime.date(2024, 5, 1),
+            'duration': datetime.time(0, 30, 0, 500000),
+            'send_key': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'price': decimal.Decimal('9.90'),
+            'label': gettext_lazy('Newsletter'),
+            'content': '<p>Hola “mundo” — ñ</p>\u2028<p>line</p>\u2029',
+            'tags': [{'id': 1, 'slug': 'science'}],
+            'empty': None,
+            'flag': True,
+            1: 'integer key',
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_falls_back_to_stdlib(self):
+        """Test indent requests use the stdlib renderer"""
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=2'
+        self.assertEqual(
+            ORJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type)
+        )
+
+    def test_parser_reads_json_and_rejects_invalid_input(self):
+        """Test request bodies are parsed and malformed JSON raises ParseError"""
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO(b'{"email": "a@example.com"}')), {'email': 'a@example.com'})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"email": '))
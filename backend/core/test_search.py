@@ -0,0 +1,91 @@
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from .models import Newsletter, PodcastEpisode
+from .search import _highlight, search_content
+
+
+class SearchFallbackTest(APITestCase):
+    """Test cases for search on non-PostgreSQL databases (icontains fallback)"""
+
+    def setUp(self):
+        self.title_match = Newsletter.objects.create(
+            title="<p>Quantum computing explained</p>",
+            slug="quantum-computing",
+            content="<p>An introduction.</p>",
+            excerpt="Basics",
+            published=True,
+            published_at=timezone.now()
+        )
+        self.body_match = Newsletter.objects.create(
+            title="Weekly digest",
+            slug="weekly-digest",
+            content="<p>This week we touch on <strong>quantum</strong> hardware &amp; more.</p>",
+            excerpt="News",
+            published=True,
+            published_at=timezone.now()
+        )
+        Newsletter.objects.create(
+            title="Quantum draft",
+            slug="quantum-draft",
+            content="Unpublished",
+            excerpt="Draft",
+            published=False
+        )
+        self.episode = PodcastEpisode.objects.create(
+            title="Episode about AI",
+            slug="episode-ai",
+            description="Talk",
+            script="<p>We discuss quantum networks at length.</p>",
+            publish_date=timezone.now().date(),
+            published=True
+        )
+        self.url = reverse('core:search')
+
+    def test_title_matches_rank_first(self):
+        """Test a title match outranks body matches"""
+        results = search_content('quantum')
+        self.assertEqual(results[0]['slug'], 'quantum-computing')
+        self.assertEqual(results[0]['title'], 'Quantum computing explained')
+        self.assertEqual(
+            {(item['type'], item['slug']) for item in results},
+            {('newsletter', 'quantum-computing'), ('newsletter', 'weekly-digest'), ('podcast', 'episode-ai')}
+        )
+
+    def test_snippet_highlights_matches_without_markup(self):
+        """Test snippets are plain text with the matched terms marked"""
+        result = next(item for item in search_content('quantum') if item['slug'] == 'weekly-digest')
+        self.assertIn('<mark>quantum</mark> hardware', result['snippet'])
+        self.assertNotIn('<strong>', result['snippet'])
+        self.assertIn('&amp;', result['snippet'])
+
+    def test_highlight_is_a_single_pass(self):
+        """Test terms never match inside marks or entities added for other terms"""
+        snippet = _highlight("Bookmark the Q&A <here>", ['mark', 'amp', 'lt', 'q'])
+        self.assertEqual(snippet, "Book<mark>mark</mark> the <mark>Q</mark>&amp;A &lt;here&gt;")
+
+    def test_unpublished_content_is_excluded(self):
+        """Test drafts never appear in results"""
+        slugs = [item['slug'] for item in search_content('quantum')]
+        self.assertNotIn('quantum-draft', slugs)
+
+    def test_type_filter_and_all_terms_required(self):
+        """Test type restricts the models and every term must match"""
+        results = search_content('quantum networks', types=['podcast', 'unknown'])
+        self.assertEqual([item['slug'] for item in results], ['episode-ai'])
+        self.assertEqual(search_content('quantum networks', types=['newsletter']), [])
+
+    def test_endpoint_returns_ranked_results(self):
+        """Test the endpoint returns results limited by page_size"""
+        response = self.client.get(self.url, {'q': 'quantum', 'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['query'], 'quantum')
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['results'][0]['slug'], 'quantum-computing')
+
+    def test_endpoint_requires_query(self):
+        """Test a missing or blank q is rejected"""
+        response = self.client.get(self.url, {'q': '  '})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('q', response.json())
@@ -25,10 +25,11 @@ class NewsletterSerializerTest(TestCase):
         """Test NewsletterSerializer includes all required fields"""
         serializer = NewsletterSerializer(self.newsletter)
         expected_fields = {
-            'id', 'title', 'slug', 'subject', 'preheader', 'content', 'excerpt', 
+            'id', 'title', 'title_text', 'slug', 'subject', 'preheader', 'content', 'excerpt', 
+            'excerpt_text', 'word_count', 'reading_time_minutes',
             'featured_image', 'featured_image_url', 'status', 'published', 'sent_at', 'available_in_english', 
             'available_in_spanish', 'available_languages', 'is_multilingual', 'created_at', 
-            'updated_at', 'published_at', 'category', 'tags'
+            'updated_at', 'published_at', 'category', 'tags', 'approved_comment_count', 'related_content'
         }
         self.assertEqual(set(serializer.data.keys()), expected_fields)
     
@@ -36,9 +37,11 @@ class NewsletterSerializerTest(TestCase):
         """Test NewsletterListSerializer includes minimal fields"""
         serializer = NewsletterListSerializer(self.newsletter)
         expected_fields = {
-            'id', 'title', 'slug', 'subject', 'preheader', 'excerpt', 
+            'id', 'title', 'title_text', 'slug', 'subject', 'preheader', 'excerpt', 
+            'excerpt_text', 'reading_time_minutes',
             'featured_image_url', 'status', 'published_at', 'sent_at', 'available_in_english', 
-            'available_in_spanish', 'available_languages', 'is_multilingual', 'category', 'tags'
+            'available_in_spanish', 'available_languages', 'is_multilingual', 'category', 'tags',
+            'approved_comment_count'
         }
         self.assertEqual(set(serializer.data.keys()), expected_fields)
     
@@ -88,12 +91,13 @@ class PodcastEpisodeSerializerTest(TestCase):
         """Test PodcastEpisodeSerializer includes all required fields"""
         serializer = PodcastEpisodeSerializer(self.episode)
         expected_fields = {
-            'id', 'title', 'slug', 'description', 'script', 
+            'id', 'title', 'title_text', 'slug', 'description', 'script', 
+            'word_count', 'reading_time_minutes',
             'publish_date', 'episode_number', 'duration', 
             'facebook_url', 'youtube_url', 'spotify_url',
             'cover_image', 'cover_image_url', 'published', 'available_in_english', 
             'available_in_spanish', 'available_languages', 'is_multilingual',
-            'created_at', 'updated_at', 'category', 'tags'
+            'created_at', 'updated_at', 'category', 'tags', 'approved_comment_count', 'related_content'
         }
         self.assertEqual(set(serializer.data.keys()), expected_fields)
     
@@ -101,10 +105,11 @@ class PodcastEpisodeSerializerTest(TestCase):
         """Test PodcastEpisodeListSerializer includes minimal fields + script_snippet"""
         serializer = PodcastEpisodeListSerializer(self.episode)
         expected_fields = {
-            'id', 'title', 'slug', 'description', 'publish_date',
+            'id', 'title', 'title_text', 'slug', 'description', 'publish_date',
             'episode_number', 'duration', 'facebook_url', 'youtube_url', 
-            'spotify_url', 'cover_image_url', 'script_snippet', 'available_in_english', 
-            'available_in_spanish', 'available_languages', 'is_multilingual', 'category', 'tags'
+            'spotify_url', 'cover_image_url', 'script_snippet', 'reading_time_minutes', 'available_in_english', 
+            'available_in_spanish', 'available_languages', 'is_multilingual', 'category', 'tags',
+            'approved_comment_count'
         }
         self.assertEqual(set(serializer.data.keys()), expected_fields)
     
@@ -120,22 +125,24 @@ class PodcastEpisodeSerializerTest(TestCase):
         self.assertEqual(data['facebook_url'], "https://example.com/facebook.mp3")
     
     def test_script_snippet_generation(self):
-        """Test script_snippet method in list serializer"""
+        """Test script_snippet stored on save is served by the list serializer"""
         serializer = PodcastEpisodeListSerializer(self.episode)
         data = serializer.data
         
-        # Should return first 200 characters + "..."
+        # Short scripts are returned whole
         expected_snippet = "This is the episode script"
         self.assertEqual(data['script_snippet'], expected_snippet)
         
-        # Test with long script
-        self.episode.script = "A" * 250
+        # Long rich-text scripts become plain text cut on a word boundary
+        self.episode.script = "<p><strong>Hello</strong> world &amp; friends</p>" * 20
         self.episode.save()
         
         serializer = PodcastEpisodeListSerializer(self.episode)
         data = serializer.data
-        self.assertEqual(len(data['script_snippet']), 203)  # 200 + "..."
-        self.assertTrue(data['script_snippet'].endswith("..."))
+        self.assertLessEqual(len(data['script_snippet']), 200)
+        self.assertTrue(data['script_snippet'].startswith("Hello world & friends Hello"))
+        self.assertTrue(data['script_snippet'].endswith("…"))
+        self.assertNotIn("<", data['script_snippet'])
     
     def test_script_snippet_with_no_script(self):
         """Test script_snippet returns empty string when no script"""
@@ -0,0 +1,89 @@
+import xml.etree.ElementTree as ET
+from datetime import date
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from .models import Newsletter, PodcastEpisode
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+NS = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
+
+@override_settings(SITEMAP_PAGE_SIZE=2, PUBLIC_FRONTEND_URL='https://example.com')
+class SitemapTest(TestCase):
+    """Test cases for the sitemap index and streamed sitemap pages"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            Newsletter.objects.create(title=f"N{i}", slug=f"newsletter-{i}", content="C", published=True)
+        Newsletter.objects.create(title="Draft", slug="draft", content="C", published=False)
+        PodcastEpisode.objects.create(
+            title="E", slug="episode", description="D", published=True, publish_date=date(2025, 1, 1)
+        )
+
+    def page_url(self, section, page):
+        return reverse('core:sitemap_page', kwargs={'section': section, 'page': page})
+
+    def locs(self, response):
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return [loc.text for loc in ET.fromstring(content).findall('.//sm:loc', NS)]
+
+    def test_index_lists_every_page(self):
+        """Test the index points at each page of each section"""
+        response = self.client.get(reverse('core:sitemap_index'))
+        self.assertEqual(response['Content-Type'], 'application/xml; charset=utf-8')
+        self.assertEqual(self.locs(response), [
+            'http://testserver/api/sitemap-newsletters-1.xml',
+            'http://testserver/api/sitemap-newsletters-2.xml',
+            'http://testserver/api/sitemap-podcasts-1.xml',
+        ])
+
+    def test_pages_stream_published_urls(self):
+        """Test pages are streamed and hold only published content"""
+        first = self.client.get(self.page_url('newsletters', 1))
+        self.assertTrue(first.streaming)
+        self.assertEqual(self.locs(first), [
+            'https://example.com/newsletter-single/newsletter-0',
+            'https://example.com/newsletter-single/newsletter-1',
+        ])
+        self.assertEqual(
+            self.locs(self.client.get(self.page_url('newsletters', 2))),
+            ['https://example.com/newsletter-single/newsletter-2']
+        )
+        self.assertEqual(
+            self.locs(self.client.get(self.page_url('podcasts', 1))),
+            ['https://example.com/podcast/episode']
+        )
+
+    def test_unknown_section_and_page(self):
+        """Test unknown sections and pages past the end return 404"""
+        self.assertEqual(self.client.get(self.page_url('comments', 1)).status_code, 404)
+        self.assertEqual(self.client.get(self.page_url('newsletters', 3)).status_code, 404)
+
+    @override_settings(CACHES=LOCMEM_CACHE)
+    def test_page_cached_until_content_changes(self):
+        """Test a streamed page is served from the cache until its section changes"""
+        cache.clear()
+        url = self.page_url('newsletters', 1)
+        streamed = self.client.get(url)
+        content = b''.join(streamed.streaming_content)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertFalse(cached.streaming)
+        self.assertEqual(cached.content, content)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=streamed['ETag']).status_code, 304)
+
+        # A podcast change leaves the newsletter pages cached
+        with self.captureOnCommitCallbacks(execute=True):
+            PodcastEpisode.objects.get(slug='episode').save()
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        newsletter = Newsletter.objects.get(slug='newsletter-0')
+        newsletter.slug = 'renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            newsletter.save()
+        self.assertIn(b'renamed', b''.join(self.client.get(url).streaming_content))
@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from .models import LocalizedElement, Category, Newsletter, PodcastEpisode
+from .static_export import export_path, export_static_api, schedule_static_export
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class StaticExportTest(TestCase):
+    """Test cases for the static JSON snapshot of the public API"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(
+            name=LocalizedElement.objects.create(english="Science", spanish="Ciencia"),
+            slug="science"
+        )
+        for i in range(8):
+            Newsletter.objects.create(
+                title=f"Newsletter {i}",
+                slug=f"newsletter-{i}",
+                content="Content",
+                excerpt="Excerpt",
+                published=True,
+                published_at=timezone.now() - timezone.timedelta(days=i),
+                category=cls.category if i < 2 else None,
+                available_in_spanish=i == 0
+            )
+        PodcastEpisode.objects.create(
+            title="Episode",
+            slug="episode",
+            description="Description",
+            published=True,
+            publish_date=timezone.now().date()
+        )
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def read(self, url_path, params=None):
+        with open(os.path.join(self.root, export_path(url_path, params)), 'rb') as f:
+            return f.read()
+
+    def test_export_path_layout(self):
+        """Test query params map to stable file names"""
+        self.assertEqual(export_path('/api/newsletters/'), 'static-api/newsletters/index.json')
+        self.assertEqual(export_path('/api/newsletters/', {'page': 1, 'page_size': 6}), 'static-api/newsletters/index.json')
+        self.assertEqual(
+            export_path('/api/newsletters/', {'page': '2', 'language': 'spanish', 'category': 'science'}),
+            'static-api/newsletters/category-science_language-spanish_page-2.json'
+        )
+        self.assertEqual(export_path('/api/newsletters/x/'), 'static-api/newsletters/x/index.json')
+
+    def test_exports_lists_details_and_taxonomies(self):
+        """Test every page, filter combination, detail and taxonomy is written"""
+        written, removed = export_static_api(self.root)
+        self.assertEqual(removed, 0)
+
+        self.assertEqual(len(json.loads(self.read('/api/newsletters/'))['results']), 6)
+        self.assertEqual(len(json.loads(self.read('/api/newsletters/', {'page': 2}))['results']), 2)
+        filtered = json.loads(self.read('/api/newsletters/', {'category': 'science', 'language': 'spanish'}))
+        self.assertEqual([item['slug'] for item in filtered['results']], ['newsletter-0'])
+        self.assertEqual(json.loads(self.read('/api/newsletters/newsletter-7/'))['slug'], 'newsletter-7')
+        self.assertEqual(json.loads(self.read('/api/podcast-episodes/episode/'))['slug'], 'episode')
+        self.assertEqual(json.loads(self.read('/api/categories/'))['results'][0]['slug'], 'science')
+        for url_path in ('/api/tags/', '/api/archives/', '/api/text-widgets/'):
+            self.read(url_path)
+
+    def test_exports_every_page_of_filtered_lists(self):
+        """Test filtered lists longer than a page keep their filters on later pages"""
+        Newsletter.objects.update(category=self.category)
+        export_static_api(self.root)
+        for params in ({'category': 'science'}, {'language': 'english'}, {'category': 'science', 'language': 'english'}):
+            page = json.loads(self.read('/api/newsletters/', {**params, 'page': 2}))
+            self.assertEqual(
+                [item['slug'] for item in page['results']], ['newsletter-6', 'newsletter-7'], params
+            )
+            self.assertEqual(
+                self.read('/api/newsletters/', {**params, 'page': 2}),
+                self.client.get('/api/newsletters/', {**params, 'page': 2}).content
+            )
+
+    def test_files_match_live_responses(self):
+        """Test snapshot files hold the same bytes the API serves"""
+        export_static_api(self.root)
+        for url_path, params in (
+            ('/api/newsletters/', {'page': 2}),
+            ('/api/newsletters/newsletter-1/', None),
+            ('/api/categories/', None),
+        ):
+            self.assertEqual(self.read(url_path, params), self.client.get(url_path, params or {}).content)
+
+    def test_removes_stale_files_and_leaves_no_temp_files(self):
+        """Test unpublished content disappears from the snapshot on the next run"""
+        export_static_api(self.root)
+        Newsletter.objects.filter(slug__in=['newsletter-6', 'newsletter-7']).update(published=False)
+
+        _, removed = export_static_api(self.root)
+        self.assertEqual(removed, 4)  # two details and the second page of the full and English lists
+        self.assertFalse(os.path.exists(os.path.join(self.root, export_path('/api/newsletters/newsletter-7/'))))
+        self.assertFalse(os.path.exists(os.path.join(self.root, export_path('/api/newsletters/', {'page': 2}))))
+        leftovers = [
+            name for _, _, files in os.walk(self.root) for name in files if name.startswith('.tmp-')
+        ]
+        self.assertEqual(leftovers, [])
+
+    def test_command_reports_files(self):
+        """Test the export_static_api management command"""
+        out = StringIO()
+        call_command('export_static_api', root=self.root, stdout=out)
+        self.assertIn('✅ Exported', out.getvalue())
+        self.read('/api/newsletters/')
+
+
+@override_settings(CACHES=LOCMEM_CACHE, STATIC_EXPORT_ON_PUBLISH=True, STATIC_EXPORT_DELAY=30)
+class ScheduleStaticExportTest(TestCase):
+    """Test publishing content queues one debounced snapshot export"""
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('core.tasks.export_static_api_task.apply_async')
+        self.apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_publish_queues_one_export_after_commit(self):
+        """Test a burst of saves of published content queues a single export"""
+        with self.captureOnCommitCallbacks(execute=True):
+            newsletter = Newsletter.objects.create(title="Live", slug="live", content="C", published=True)
+            newsletter.title = "Live again"
+            newsletter.save()
+        self.apply_async.assert_called_once_with(countdown=30)
+
+    def test_draft_saves_do_not_export(self):
+        """Test drafts never trigger an export"""
+        with self.captureOnCommitCallbacks(execute=True):
+            Newsletter.objects.create(title="Draft", slug="draft", content="C", published=False)
+        self.apply_async.assert_not_called()
+
+    def test_disabled_by_default(self):
+        """Test nothing is queued unless STATIC_EXPORT_ON_PUBLISH is set"""
+        with self.settings(STATIC_EXPORT_ON_PUBLISH=False), self.captureOnCommitCallbacks(execute=True):
+            schedule_static_export()
+        self.apply_async.assert_not_called()
@@ -0,0 +1,204 @@
+import os
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from .models import Newsletter, EmailSignup, EmailLog
+from .tasks import send_newsletter_task, prewarm_newsletter_send, dispatch_scheduled_newsletters, get_newsletter_body
+from .utils.locks import LeaseLock
+
+
+class LeaseLockTest(TestCase):
+    """Test cases for the Redis lease lock"""
+
+    def setUp(self):
+        self.client = mock.MagicMock()
+        self.lock = LeaseLock('newsletter-send:abc', ttl=30, client=self.client)
+
+    def test_acquire_sets_key_with_nx_and_ttl(self):
+        """Test acquire only succeeds when the key is absent"""
+        self.client.set.return_value = True
+        self.assertTrue(self.lock.acquire())
+        self.client.set.assert_called_once_with('lock:newsletter-send:abc', self.lock.token, nx=True, px=30000)
+
+        self.client.set.return_value = None
+        other = LeaseLock('newsletter-send:abc', ttl=30, client=self.client)
+        self.assertFalse(other.acquire())
+
+    def test_keep_alive_renews_only_after_a_third_of_the_lease(self):
+        """Test keep_alive avoids a Redis round trip on every call"""
+        self.client.set.return_value = True
+        self.client.eval.return_value = 1
+        self.lock.acquire()
+
+        self.assertTrue(self.lock.keep_alive())
+        self.client.eval.assert_not_called()
+
+        with mock.patch('core.utils.locks.time.monotonic', return_value=self.lock._last_renewal + 11):
+            self.assertTrue(self.lock.keep_alive())
+        self.client.eval.assert_called_once()
+
+    def test_lost_lease_is_reported(self):
+        """Test heartbeat returns False once another holder took over"""
+        self.client.set.return_value = True
+        self.client.eval.return_value = 0
+        self.lock.acquire()
+        self.assertFalse(self.lock.heartbeat())
+
+
+class SendNewsletterLockTest(TestCase):
+    """Test that only one coordinator sends a newsletter"""
+
+    def setUp(self):
+        self.newsletter = Newsletter.objects.create(
+            title="Locked Newsletter",
+            slug="locked-newsletter",
+            subject="Subject",
+            content="Content",
+            excerpt="Excerpt",
+            published=True
+        )
+        EmailSignup.objects.create(email='reader@example.com')
+
+    @mock.patch('core.tasks.get_email_provider')
+    @mock.patch('core.tasks.newsletter_send_lock')
+    def test_task_exits_when_lock_is_held(self, mock_lock_factory, mock_provider):
+        """Test a second coordinator does no work while the lock is held"""
+        mock_lock_factory.return_value.acquire.return_value = False
+
+        send_newsletter_task(self.newsletter.send_key)
+
+        mock_provider.assert_not_called()
+        mock_lock_factory.return_value.release.assert_not_called()
+        self.assertEqual(EmailLog.objects.count(), 0)
+        self.newsletter.refresh_from_db()
+        self.assertIsNone(self.newsletter.sent_at)
+
+
+@override_settings(RATE_SLEEP_SEC=0)
+@mock.patch.dict(os.environ, {'EMAIL_FROM': 'hello@example.com'})
+class SendNewsletterTaskTest(TestCase):
+    """Test cases for sending from the recipient snapshot"""
+
+    def setUp(self):
+        self.newsletter = Newsletter.objects.create(
+            title="Weekly Newsletter",
+            slug="weekly-newsletter",
+            subject="Weekly",
+            content="Hello **readers**",
+            excerpt="Excerpt",
+            published=True
+        )
+        self.readers = [EmailSignup.objects.create(email=f'reader{i}@example.com') for i in range(3)]
+        EmailSignup.objects.create(email='gone@example.com', is_subscribed=False)
+
+        lock_patcher = mock.patch('core.tasks.newsletter_send_lock')
+        self.mock_lock = lock_patcher.start().return_value
+        self.mock_lock.acquire.return_value = True
+        self.mock_lock.keep_alive.return_value = True
+        self.addCleanup(lock_patcher.stop)
+
+        provider_patcher = mock.patch('core.tasks.get_email_provider')
+        self.provider = provider_patcher.start().return_value
+        self.provider.send.side_effect = lambda **kwargs: f"msg-{kwargs['to']}"
+        self.addCleanup(provider_patcher.stop)
+
+    def test_send_mails_each_subscriber_once(self):
+        """Test every subscriber is mailed once with a personal unsubscribe link"""
+        send_newsletter_task(self.newsletter.send_key, batch_size=2)
+
+        self.assertEqual(self.provider.send.call_count, 3)
+        for call in self.provider.send.call_args_list:
+            self.assertNotIn('__UNSUB__', call.kwargs['html'])
+            self.assertIn('/api/unsubscribe/?t=', call.kwargs['html'])
+
+        logs = EmailLog.objects.filter(newsletter=self.newsletter)
+        self.assertEqual(logs.count(), 3)
+        self.assertEqual(set(logs.values_list('status', flat=True)), {'sent'})
+        self.newsletter.refresh_from_db()
+        self.assertIsNotNone(self.newsletter.sent_at)
+        self.assertIn("readers", self.newsletter.rendered_emails.get().html)
+        self.mock_lock.release.assert_called_once()
+
+    def test_resumed_send_skips_already_logged_recipients(self):
+        """Test recipients with an existing log row are not mailed again"""
+        EmailLog.objects.create(newsletter=self.newsletter, recipient=self.readers[0], status='sent')
+
+        send_newsletter_task(self.newsletter.send_key)
+
+        self.assertEqual(self.provider.send.call_count, 2)
+
+    def test_stale_scheduled_run_is_skipped(self):
+        """Test a run queued for an old schedule does nothing"""
+        self.newsletter.scheduled_send_at = timezone.now() + timedelta(hours=1)
+        self.newsletter.save()
+
+        send_newsletter_task(self.newsletter.send_key, scheduled_for='2020-01-01T00:00:00+00:00')
+
+        self.provider.send.assert_not_called()
+
+
+class ScheduledSendTest(TestCase):
+    """Test cases for scheduled sends and the pre-warm phase"""
+
+    def setUp(self):
+        self.newsletter = Newsletter.objects.create(
+            title="Scheduled Newsletter",
+            slug="scheduled-newsletter",
+            subject="Scheduled",
+            content="Content",
+            excerpt="Excerpt",
+            published=True,
+            scheduled_send_at=timezone.now() + timedelta(minutes=3)
+        )
+        EmailSignup.objects.create(email='reader@example.com')
+
+    @mock.patch('core.tasks.prewarm_newsletter_send.delay')
+    def test_dispatch_claims_due_newsletters_once(self, mock_delay):
+        """Test newsletters inside the pre-warm window are queued exactly once"""
+        Newsletter.objects.create(
+            title="Later",
+            slug="later",
+            content="Content",
+            excerpt="Excerpt",
+            published=True,
+            scheduled_send_at=timezone.now() + timedelta(days=1)
+        )
+
+        self.assertEqual(dispatch_scheduled_newsletters(), 1)
+        self.assertEqual(dispatch_scheduled_newsletters(), 0)
+        mock_delay.assert_called_once_with(self.newsletter.send_key)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    @mock.patch('core.tasks.send_newsletter_task.apply_async')
+    @mock.patch('core.tasks.get_email_provider')
+    def test_edit_after_prewarm_is_sent(self, mock_provider, mock_apply_async):
+        """Test the cached body is not reused once the newsletter changes"""
+        prewarm_newsletter_send(self.newsletter.send_key)
+        html, _ = get_newsletter_body(Newsletter.objects.get(id=self.newsletter.id))
+        self.assertNotIn("Corrected", html)
+
+        self.newsletter.content = "Corrected content"
+        self.newsletter.save()
+        html, _ = get_newsletter_body(Newsletter.objects.get(id=self.newsletter.id))
+        self.assertIn("Corrected content", html)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    @mock.patch('core.tasks.send_newsletter_task.apply_async')
+    @mock.patch('core.tasks.get_email_provider')
+    def test_prewarm_prepares_send_and_schedules_dispatch(self, mock_provider, mock_apply_async):
+        """Test pre-warm snapshots recipients, warms caches and queues the send"""
+        prewarm_newsletter_send(self.newsletter.send_key)
+
+        self.assertEqual(
+            list(EmailLog.objects.filter(newsletter=self.newsletter).values_list('status', flat=True)),
+            ['queued']
+        )
+        # Nothing becomes public before the send
+        self.assertFalse(self.newsletter.rendered_emails.exists())
+        mock_provider.return_value.warm_up.assert_called_once()
+        mock_apply_async.assert_called_once_with(
+            args=[self.newsletter.send_key],
+            kwargs={'scheduled_for': self.newsletter.scheduled_send_at.isoformat()},
+            eta=self.newsletter.scheduled_send_at,
+        )
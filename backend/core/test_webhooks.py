@@ -0,0 +1,143 @@
+import json
+import os
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from .models import Newsletter, EmailSignup, EmailLog, WebhookEvent
+from .webhooks import apply_postmark_events, drain_webhook_events, reconcile_email_logs
+
+
+class PostmarkWebhookViewTest(TestCase):
+    """Test cases for the Postmark webhook endpoint"""
+
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ, {'POSTMARK_WEBHOOK_TOKEN': 'secret-token'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse('core:postmark_webhook', kwargs={'token': 'secret-token'})
+        self.signup = EmailSignup.objects.create(email='reader@example.com')
+
+    def test_webhook_rejects_invalid_token(self):
+        """Test that an invalid token is rejected"""
+        url = reverse('core:postmark_webhook', kwargs={'token': 'wrong'})
+        response = self.client.post(url, data='{}', content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(WebhookEvent.objects.count(), 0)
+
+    def test_webhook_queues_event_without_applying_it(self):
+        """Test that the webhook only queues the raw payload"""
+        payload = json.dumps({'RecordType': 'Bounce', 'Email': 'reader@example.com'})
+        response = self.client.post(self.url, data=payload, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+        self.assertEqual(WebhookEvent.objects.get().payload, payload)
+
+        self.signup.refresh_from_db()
+        self.assertFalse(self.signup.bounce)
+
+
+class PostmarkEventProcessingTest(TestCase):
+    """Test cases for batched webhook event processing"""
+
+    def setUp(self):
+        self.bounced = EmailSignup.objects.create(email='Bounced@Example.com')
+        self.complainer = EmailSignup.objects.create(email='complainer@example.com')
+        self.reader = EmailSignup.objects.create(email='reader@example.com')
+        self.newsletter = Newsletter.objects.create(
+            title="Sent Newsletter",
+            slug="sent-newsletter",
+            content="Content",
+            excerpt="Excerpt",
+            published=True
+        )
+        self.log = EmailLog.objects.create(
+            newsletter=self.newsletter,
+            recipient=self.reader,
+            status='sent',
+            provider_message_id='msg-1'
+        )
+
+    def test_email_normalized_is_set_on_save(self):
+        """Test that the normalized email column is maintained"""
+        self.assertEqual(self.bounced.email_normalized, 'bounced@example.com')
+
+    def test_bounce_and_spam_events_update_signups(self):
+        """Test bounces and complaints are matched case-insensitively"""
+        stats = apply_postmark_events([
+            {'RecordType': 'Bounce', 'Email': 'BOUNCED@example.com'},
+            {'RecordType': 'Bounce', 'Email': 'bounced@example.com'},
+            {'RecordType': 'SpamComplaint', 'Email': 'Complainer@example.com'},
+        ])
+
+        self.assertEqual(stats['bounced'], 1)
+        self.assertEqual(stats['complained'], 1)
+
+        self.bounced.refresh_from_db()
+        self.complainer.refresh_from_db()
+        self.reader.refresh_from_db()
+        self.assertTrue(self.bounced.bounce)
+        self.assertFalse(self.bounced.is_subscribed)
+        self.assertFalse(self.complainer.bounce)
+        self.assertFalse(self.complainer.is_subscribed)
+        self.assertTrue(self.reader.is_subscribed)
+
+    def test_delivery_and_open_events_update_email_log(self):
+        """Test delivery and open events are linked by provider message ID"""
+        apply_postmark_events([
+            {'RecordType': 'Delivery', 'MessageID': 'msg-1', 'DeliveredAt': '2025-01-02T10:00:00Z'},
+            {'RecordType': 'Open', 'MessageID': 'msg-1', 'ReceivedAt': '2025-01-02T12:00:00Z'},
+            {'RecordType': 'Open', 'MessageID': 'msg-1', 'ReceivedAt': '2025-01-02T11:00:00Z'},
+            {'RecordType': 'Delivery', 'MessageID': 'unknown', 'DeliveredAt': '2025-01-02T10:00:00Z'},
+        ])
+
+        self.log.refresh_from_db()
+        self.assertEqual(self.log.status, 'delivered')
+        self.assertEqual(self.log.delivered_at.isoformat(), '2025-01-02T10:00:00+00:00')
+        self.assertEqual(self.log.opened_at.isoformat(), '2025-01-02T11:00:00+00:00')
+
+    def test_bounce_event_marks_email_log_bounced(self):
+        """Test a bounce wins over a delivery for the same message"""
+        apply_postmark_events([
+            {'RecordType': 'Delivery', 'MessageID': 'msg-1', 'DeliveredAt': '2025-01-02T10:00:00Z'},
+            {'RecordType': 'Bounce', 'MessageID': 'msg-1', 'Email': 'reader@example.com'},
+        ])
+
+        self.log.refresh_from_db()
+        self.assertEqual(self.log.status, 'bounced')
+
+    def test_reconcile_uses_one_statement_per_batch(self):
+        """Test bulk reconciliation issues a single UPDATE"""
+        other = EmailLog.objects.create(
+            newsletter=self.newsletter,
+            recipient=self.bounced,
+            status='bounced',
+            provider_message_id='msg-2'
+        )
+
+        with self.assertNumQueries(1):
+            updated = reconcile_email_logs({
+                'msg-1': {'status': 'delivered'},
+                'msg-2': {'status': 'delivered'},
+            })
+
+        self.assertEqual(updated, 2)
+        self.log.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.log.status, 'delivered')
+        self.assertEqual(other.status, 'bounced')
+
+    def test_drain_consumes_queue_and_skips_invalid_payloads(self):
+        """Test draining the queue applies events and empties it"""
+        WebhookEvent.objects.create(payload=json.dumps({'RecordType': 'Bounce', 'Email': 'bounced@example.com'}))
+        WebhookEvent.objects.create(payload='not json')
+        WebhookEvent.objects.create(payload=json.dumps({'RecordType': 'Delivery', 'MessageID': 'msg-1'}))
+
+        processed = drain_webhook_events(batch_size=2)
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(WebhookEvent.objects.count(), 0)
+        self.bounced.refresh_from_db()
+        self.log.refresh_from_db()
+        self.assertTrue(self.bounced.bounce)
+        self.assertIsNotNone(self.log.delivered_at)
@@ -19,8 +19,19 @@ urlpatterns = [
     
     # Simplified podcast endpoints (as requested)
     path('podcast/', views.PodcastEpisodeListView.as_view(), name='podcast_list'),
+    path('podcast/feed.xml', views.PodcastFeedView.as_view(), name='podcast_feed'),
     path('podcast/<slug:slug>/', views.PodcastEpisodeDetailView.as_view(), name='podcast_detail'),
     
+    # Sitemaps of the frontend pages
+    path('sitemap.xml', views.sitemap_index, name='sitemap_index'),
+    path('sitemap-<str:section>-<int:page>.xml', views.sitemap_page, name='sitemap_page'),
+    
+    # Several collections in one response
+    path('bundle/', views.BundleView.as_view(), name='bundle'),
+    
+    # Full-text search
+    path('search/', views.SearchView.as_view(), name='search'),
+    
     # Email signup endpoint
     path('email-signup/', views.EmailSignupCreateView.as_view(), name='email_signup'),
     
@@ -39,5 +50,6 @@ urlpatterns = [
     # Newsletter sending endpoints
     path('unsubscribe/', views.unsubscribe, name='unsubscribe'),
     path('newsletters/<int:newsletter_id>/send-test/', views.send_test_newsletter, name='send_test_newsletter'),
+    path('newsletters/<slug:slug>/email/', views.newsletter_email_view, name='newsletter_email_view'),
     path('api/webhooks/postmark/<str:token>/', views.postmark_webhook, name='postmark_webhook'),
 ]
\ No newline at end of file
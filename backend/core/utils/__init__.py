@@ -5,9 +5,11 @@ from .email import (
     build_unsubscribe_url,
     build_unsub_url,
     build_view_url,
+    build_frontend_view_url,
     verify_unsubscribe_token,
     render_newsletter_email
 )
+from .text import plain_text, make_snippet, count_words, reading_time_minutes
 
 __all__ = [
     'convert_markdown_to_html',
@@ -16,6 +18,11 @@ __all__ = [
     'build_unsubscribe_url',
     'build_unsub_url',
     'build_view_url',
+    'build_frontend_view_url',
     'verify_unsubscribe_token',
-    'render_newsletter_email'
+    'render_newsletter_email',
+    'plain_text',
+    'make_snippet',
+    'count_words',
+    'reading_time_minutes'
 ] 
\ No newline at end of file
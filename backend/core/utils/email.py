@@ -59,7 +59,7 @@ def build_unsub_url(recipient) -> str:
         Unsubscribe URL
     """
     token = dumps({'rid': recipient.id})  # no expiry for compliance
-    return f"{settings.BASE_URL}{reverse('unsubscribe')}?t={token}"
+    return f"{settings.BASE_URL}{reverse('core:unsubscribe')}?t={token}"
 
 
 def build_unsubscribe_url(recipient_id: int) -> str:
@@ -98,15 +98,32 @@ def build_view_url(newsletter) -> str:
     """
     Build view in browser URL for newsletter
     
+    The link points at the stored rendering of the sent email, which falls
+    back to the frontend page until a rendering exists.
+    
     Args:
         newsletter: Newsletter instance
         
     Returns:
         View URL
     """
+    path = reverse('core:newsletter_email_view', kwargs={'slug': newsletter.slug})
+    return f"{settings.BASE_URL}{path}"
+
+
+def build_frontend_view_url(slug: str) -> str:
+    """
+    Build the frontend URL of a newsletter page
+    
+    Args:
+        slug: Newsletter slug
+        
+    Returns:
+        Frontend URL
+    """
     base = settings.PUBLIC_FRONTEND_URL.rstrip("/")
     path = settings.NEWSLETTER_VIEW_PATH.strip("/")
-    return f"{base}/{path}/{newsletter.slug}"
+    return f"{base}/{path}/{slug}"
 
 
 def render_newsletter_email(newsletter, recipient) -> tuple[str, str]:
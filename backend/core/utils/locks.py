@@ -0,0 +1,128 @@
+import time
+import uuid
+import redis
+from django.conf import settings
+
+
+# Only the holder of the lease (matching token) may extend or release it
+_EXTEND_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_redis_client = None
+
+
+def get_redis_client():
+    """
+    Return a process-wide Redis client for REDIS_URL
+
+    Returns:
+        redis.Redis instance backed by a shared connection pool
+    """
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+class LeaseLock:
+    """
+    Lease-based distributed lock stored in Redis
+
+    The lock is a key holding a random token with a TTL. The holder must
+    renew the lease (heartbeat) before it expires; if the holder dies, the
+    key expires and the next caller of acquire() takes the lock over.
+    """
+
+    def __init__(self, name: str, ttl: float = 300, client=None):
+        """
+        Args:
+            name: Lock name (e.g. the newsletter send key)
+            ttl: Lease duration in seconds
+            client: Redis client (defaults to the shared REDIS_URL client)
+        """
+        self.key = f"lock:{name}"
+        self.ttl = ttl
+        self.token = uuid.uuid4().hex
+        self.client = client or get_redis_client()
+        self._last_renewal = None
+
+    @property
+    def ttl_ms(self) -> int:
+        return int(self.ttl * 1000)
+
+    def acquire(self) -> bool:
+        """
+        Try to take the lease
+
+        Returns:
+            True if this instance now holds the lock
+        """
+        acquired = bool(self.client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        if acquired:
+            self._last_renewal = time.monotonic()
+        return acquired
+
+    def heartbeat(self) -> bool:
+        """
+        Renew the lease
+
+        Returns:
+            False if the lease was lost (expired and possibly taken over)
+        """
+        renewed = bool(self.client.eval(_EXTEND_SCRIPT, 1, self.key, self.token, self.ttl_ms))
+        if renewed:
+            self._last_renewal = time.monotonic()
+        return renewed
+
+    def keep_alive(self) -> bool:
+        """
+        Renew the lease once a third of it has elapsed; cheap to call often
+
+        Returns:
+            False if the lease was lost
+        """
+        if self._last_renewal is None:
+            return False
+        if time.monotonic() - self._last_renewal < self.ttl / 3:
+            return True
+        return self.heartbeat()
+
+    def release(self) -> bool:
+        """
+        Give up the lease if this instance still holds it
+
+        Returns:
+            True if the lock was released by this call
+        """
+        self._last_renewal = None
+        return bool(self.client.eval(_RELEASE_SCRIPT, 1, self.key, self.token))
+
+    def is_locked(self) -> bool:
+        """Return True if any holder currently owns the lease"""
+        return bool(self.client.exists(self.key))
+
+
+def newsletter_send_lock(send_key: str, client=None) -> LeaseLock:
+    """
+    Build the lock that guards the send coordinator of one newsletter
+
+    Args:
+        send_key: Newsletter send key
+        client: Optional Redis client
+
+    Returns:
+        LeaseLock instance
+    """
+    ttl = getattr(settings, 'SEND_LOCK_TTL_SEC', 300)
+    return LeaseLock(f"newsletter-send:{send_key}", ttl=ttl, client=client)
@@ -0,0 +1,62 @@
+import math
+import re
+from html import unescape
+from django.utils.html import strip_tags
+
+WORDS_PER_MINUTE = 200
+
+# Tags that end a visual line; replaced by a space so words don't merge
+_BLOCK_BREAK_RE = re.compile(r'<\s*(br|/p|/div|/li|/h[1-6]|/blockquote|/tr)\b[^>]*>', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def plain_text(html: str) -> str:
+    """
+    Convert rich-text HTML to a single line of plain text
+
+    Args:
+        html: HTML content (e.g. from a CKEditor field)
+
+    Returns:
+        Text with tags removed, entities decoded and whitespace collapsed
+    """
+    if not html:
+        return ''
+    text = strip_tags(_BLOCK_BREAK_RE.sub(' ', html))
+    return _WHITESPACE_RE.sub(' ', unescape(text)).strip()
+
+
+def make_snippet(text: str, length: int) -> str:
+    """
+    Truncate plain text to at most `length` characters on a word boundary
+
+    Args:
+        text: Plain text
+        length: Maximum length including the trailing ellipsis
+
+    Returns:
+        The text, or a truncated copy ending in "…"
+    """
+    if len(text) <= length:
+        return text
+    limit = max(length - 1, 0)  # room for the ellipsis
+    head = text[:limit]
+    if not text[limit].isspace():
+        # Drop the partial last word; a single word longer than the limit
+        # is cut mid-word
+        boundary = max(head.rfind(' '), head.rfind('\n'), head.rfind('\t'))
+        if boundary > 0:
+            head = head[:boundary]
+    return head.rstrip() + '…'
+
+
+def count_words(text: str) -> int:
+    """Return the number of words in plain text"""
+    return len(text.split())
+
+
+def reading_time_minutes(word_count: int) -> int:
+    """Return the estimated reading time in whole minutes (0 for empty text)"""
+    if not word_count:
+        return 0
+    return max(1, math.ceil(word_count / WORDS_PER_MINUTE))
@@ -2,14 +2,22 @@ from rest_framework import generics, status, serializers
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAdminUser
-from django.http import JsonResponse, HttpResponse, HttpResponseForbidden
+from django.http import (
+    JsonResponse, HttpResponse, HttpResponseForbidden, HttpResponseRedirect, StreamingHttpResponse, Http404
+)
 from django.shortcuts import render, get_object_or_404
 from django.conf import settings
 from django.core.signing import SignatureExpired, BadSignature
+from django.views import View
 from django.views.decorators.csrf import csrf_exempt
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers, quote_etag
 import os
+import gzip
 import json
-from .models import Newsletter, PodcastEpisode, EmailSignup, Category, Tag, Archive, TextWidget
+from .models import (
+    Newsletter, PodcastEpisode, EmailSignup, Category, Tag, Archive, TextWidget,
+    WebhookEvent, RenderedEmail, LocalizedElement, RelatedContent
+)
 from .serializers import (
     NewsletterSerializer, NewsletterListSerializer,
     PodcastEpisodeSerializer, PodcastEpisodeListSerializer,
@@ -23,152 +31,72 @@ from django.utils import timezone
 from datetime import timedelta
 from .serializers import CommentSerializer, CommentCreateSerializer
 from .models import Comment
-from .utils.email import verify_unsubscribe_token
+from .utils.email import verify_unsubscribe_token, build_frontend_view_url
 from .tasks import send_test_newsletter_task
+from .cache import CachedResponseMixin
+from .fieldsets import SparseFieldsetViewMixin
+from .pagination import ContentListPaginationMixin, get_page_size
+from .search import search_content
+from .podcast_feed import CONTENT_TYPE as FEED_CONTENT_TYPE, build_feed
+from . import sitemaps
+from .bundle import BUNDLE_COLLECTIONS, requested_collections, build_bundle
+from .queries import (
+    newsletter_queryset, podcast_episode_queryset,
+    category_queryset, tag_queryset, text_widget_queryset, archive_queryset, filter_content
+)
 
+# Models each cached response is built from; a change to any of them
+# invalidates it. Each content type includes the other because the
+# embedded category count covers both and is written without signals.
+NEWSLETTER_CACHE_MODELS = (Newsletter, PodcastEpisode, Category, Tag, LocalizedElement)
+PODCAST_CACHE_MODELS = (PodcastEpisode, Newsletter, Category, Tag, LocalizedElement)
+# Detail responses also embed previous/next and related items
+NEWSLETTER_DETAIL_CACHE_MODELS = NEWSLETTER_CACHE_MODELS + (RelatedContent,)
+PODCAST_DETAIL_CACHE_MODELS = PODCAST_CACHE_MODELS + (RelatedContent,)
 
-class NewsletterListView(generics.ListAPIView):
+
+class NewsletterListView(CachedResponseMixin, SparseFieldsetViewMixin, ContentListPaginationMixin, generics.ListAPIView):
     """List all published newsletter articles with optional language filtering"""
+    cache_models = NEWSLETTER_CACHE_MODELS
     serializer_class = NewsletterListSerializer
-    pagination_class = None  # We'll handle pagination manually
+    pagination_class = None  # Offset or cursor pagination from ContentListPaginationMixin
+    cursor_ordering = ('published_at', 'id')
+    required_columns = ('published_at',)
     
     def get_queryset(self):
-        queryset = Newsletter.objects.filter(published=True)
-        
-        # Filter by category if specified
-        category_slug = self.request.query_params.get('category', '').strip()
-        if category_slug:
-            queryset = queryset.filter(category__slug=category_slug)
-        
-        # Filter by language if specified
-        language = self.request.query_params.get('language', '').lower()
-        if language == 'english':
-            queryset = queryset.filter(available_in_english=True)
-        elif language == 'spanish':
-            queryset = queryset.filter(available_in_spanish=True)
-        elif language == 'both':
-            queryset = queryset.filter(available_in_english=True, available_in_spanish=True)
-        
-        return queryset
-    
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        
-        # Get pagination parameters with validation
-        try:
-            page = max(1, int(request.query_params.get('page', 1)))
-        except (ValueError, TypeError):
-            page = 1
-            
-        try:
-            page_size = max(1, int(request.query_params.get('page_size', 6)))
-        except (ValueError, TypeError):
-            page_size = 6
-        
-        # Calculate pagination
-        total_count = queryset.count()
-        start = (page - 1) * page_size
-        end = start + page_size
-        
-        # Ensure start is not negative
-        if start < 0:
-            start = 0
-            end = page_size
-        
-        # Get paginated data
-        paginated_queryset = queryset[start:end]
-        
-        # Serialize the data
-        serializer = self.get_serializer(paginated_queryset, many=True)
-        
-        # Return paginated response
-        return Response({
-            'count': total_count,
-            'next': f"?page={page + 1}&page_size={page_size}" if end < total_count else None,
-            'previous': f"?page={page - 1}&page_size={page_size}" if page > 1 else None,
-            'results': serializer.data
-        })
+        return filter_content(newsletter_queryset(), self.request.query_params)
 
 
-class NewsletterDetailView(generics.RetrieveAPIView):
+class NewsletterDetailView(CachedResponseMixin, SparseFieldsetViewMixin, generics.RetrieveAPIView):
     """Retrieve a single newsletter article by slug"""
+    cache_models = NEWSLETTER_DETAIL_CACHE_MODELS
     serializer_class = NewsletterSerializer
     lookup_field = 'slug'
     
     def get_queryset(self):
-        return Newsletter.objects.filter(published=True)
+        return newsletter_queryset()
 
 
-class PodcastEpisodeListView(generics.ListAPIView):
+class PodcastEpisodeListView(CachedResponseMixin, SparseFieldsetViewMixin, ContentListPaginationMixin, generics.ListAPIView):
     """List all published podcast episodes with optional language filtering"""
+    cache_models = PODCAST_CACHE_MODELS
     serializer_class = PodcastEpisodeListSerializer
-    pagination_class = None  # We'll handle pagination manually
+    pagination_class = None  # Offset or cursor pagination from ContentListPaginationMixin
+    cursor_ordering = ('publish_date', 'id')
+    required_columns = ('publish_date',)
     
     def get_queryset(self):
-        queryset = PodcastEpisode.objects.filter(published=True)
-        
-        # Filter by category if specified
-        category_slug = self.request.query_params.get('category', '').strip()
-        if category_slug:
-            queryset = queryset.filter(category__slug=category_slug)
-        
-        # Filter by language if specified
-        language = self.request.query_params.get('language', '').lower()
-        if language == 'english':
-            queryset = queryset.filter(available_in_english=True)
-        elif language == 'spanish':
-            queryset = queryset.filter(available_in_spanish=True)
-        elif language == 'both':
-            queryset = queryset.filter(available_in_english=True, available_in_spanish=True)
-        
-        return queryset
-    
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        
-        # Get pagination parameters with validation
-        try:
-            page = max(1, int(request.query_params.get('page', 1)))
-        except (ValueError, TypeError):
-            page = 1
-            
-        try:
-            page_size = max(1, int(request.query_params.get('page_size', 6)))
-        except (ValueError, TypeError):
-            page_size = 6
-        
-        # Calculate pagination
-        total_count = queryset.count()
-        start = (page - 1) * page_size
-        end = start + page_size
-        
-        # Ensure start is not negative
-        if start < 0:
-            start = 0
-            end = page_size
-        
-        # Get paginated data
-        paginated_queryset = queryset[start:end]
-        
-        # Serialize the data
-        serializer = self.get_serializer(paginated_queryset, many=True)
-        
-        # Return paginated response
-        return Response({
-            'count': total_count,
-            'next': f"?page={page + 1}&page_size={page_size}" if end < total_count else None,
-            'previous': f"?page={page - 1}&page_size={page_size}" if page > 1 else None,
-            'results': serializer.data
-        })
+        return filter_content(podcast_episode_queryset(), self.request.query_params)
 
 
-class PodcastEpisodeDetailView(generics.RetrieveAPIView):
+class PodcastEpisodeDetailView(CachedResponseMixin, SparseFieldsetViewMixin, generics.RetrieveAPIView):
     """Retrieve a single podcast episode by slug"""
+    cache_models = PODCAST_DETAIL_CACHE_MODELS
     serializer_class = PodcastEpisodeSerializer
     lookup_field = 'slug'
     
     def get_queryset(self):
-        return PodcastEpisode.objects.filter(published=True)
+        return podcast_episode_queryset()
 
 
 class EmailSignupCreateView(generics.CreateAPIView):
@@ -202,42 +130,124 @@ class EmailSignupCreateView(generics.CreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CategoryListView(generics.ListAPIView):
+class SearchView(CachedResponseMixin, generics.GenericAPIView):
+    """
+    Full-text search across published newsletters and podcast episodes
+
+    Query params: q (required), language (english/spanish), type
+    (comma-separated newsletter,podcast) and page_size as the result limit.
+    """
+    cache_models = (Newsletter, PodcastEpisode)
+    
+    def get(self, request):
+        query_text = request.query_params.get('q', '').strip()
+        if not query_text:
+            return Response({'q': ['This parameter is required.']}, status=status.HTTP_400_BAD_REQUEST)
+        
+        language = request.query_params.get('language', 'english').lower()
+        types = [kind.strip() for kind in request.query_params.get('type', '').split(',') if kind.strip()]
+        results = search_content(query_text, language=language, types=types or None, limit=get_page_size(request))
+        return Response({'query': query_text, 'count': len(results), 'results': results})
+
+
+class PodcastFeedView(CachedResponseMixin, View):
+    """
+    RSS/iTunes feed of published podcast episodes
+
+    Put together from the <item> fragments stored on each episode, so a
+    cache miss is a single indexed query and no rendering.
+    """
+    cache_models = (PodcastEpisode,)
+    
+    def get(self, request):
+        items = (
+            PodcastEpisode.objects.filter(published=True)
+            .order_by('-publish_date', '-id')
+            .values_list('feed_item', flat=True)
+        )
+        return HttpResponse(build_feed(items.iterator()), content_type=FEED_CONTENT_TYPE)
+
+
+class CategoryListView(CachedResponseMixin, generics.ListAPIView):
     """List all active categories"""
+    cache_models = (Category, LocalizedElement, Newsletter, PodcastEpisode)
     serializer_class = CategorySerializer
     
     def get_queryset(self):
-        return Category.objects.filter(is_active=True)
+        return category_queryset().filter(is_active=True)
 
 
-class TagListView(generics.ListAPIView):
+class TagListView(CachedResponseMixin, generics.ListAPIView):
     """List all active tags"""
+    cache_models = (Tag, LocalizedElement)
     serializer_class = TagSerializer
     
     def get_queryset(self):
-        return Tag.objects.filter(is_active=True)
+        return tag_queryset().filter(is_active=True)
 
 
-class ArchiveListView(generics.ListAPIView):
-    """List all active archives"""
+class ArchiveListView(CachedResponseMixin, generics.ListAPIView):
+    """List all active archives that contain published content"""
+    cache_models = (Archive, Newsletter, PodcastEpisode)
     serializer_class = ArchiveSerializer
     
     def get_queryset(self):
-        return Archive.objects.filter(is_active=True)
+        return archive_queryset()
 
 
-class TextWidgetListView(generics.ListAPIView):
+class TextWidgetListView(CachedResponseMixin, generics.ListAPIView):
     """List all active text widgets"""
+    cache_models = (TextWidget, LocalizedElement)
     serializer_class = TextWidgetSerializer
     pagination_class = None
     
     def get_queryset(self):
-        return TextWidget.objects.filter(is_active=True).order_by('order')
+        return text_widget_queryset().filter(is_active=True).order_by('order')
+
+
+class BundleView(CachedResponseMixin, generics.GenericAPIView):
+    """
+    Several public collections in one response (see core.bundle)
+
+    Query params: include (comma-separated collections, default all),
+    plus page_size, category and language for newsletters and podcasts.
+    """
+    collection_views = {
+        'newsletters': NewsletterListView,
+        'podcasts': PodcastEpisodeListView,
+        'categories': CategoryListView,
+        'tags': TagListView,
+        'archives': ArchiveListView,
+        'text_widgets': TextWidgetListView,
+    }
+    
+    @property
+    def cache_models(self):
+        """Union of the cache models of every collection in the bundle, primary first"""
+        names = self.request.GET.get('include', '').split(',')
+        names = [name.strip() for name in names if name.strip() in self.collection_views] or BUNDLE_COLLECTIONS
+        models = []
+        for name in names:
+            for model in self.collection_views[name].cache_models:
+                if model not in models:
+                    models.append(model)
+        return tuple(models)
+    
+    def get(self, request):
+        return Response(build_bundle(request, requested_collections(request)))
+
 
+class CommentListView(ContentListPaginationMixin, generics.ListAPIView):
+    """
+    List approved comments for a specific podcast or newsletter
 
-class CommentListView(generics.ListAPIView):
-    """List comments for a specific podcast or newsletter"""
+    Offset pages by default; pagination=cursor walks (created_at, id)
+    keysets over the per-item approved comment index.
+    """
     serializer_class = CommentSerializer
+    pagination_class = None  # Offset or cursor pagination from ContentListPaginationMixin
+    cursor_ordering = ('created_at', 'id')
+    default_page_size = 20
     
     def get_queryset(self):
         """Get approved comments for the specified content"""
@@ -256,34 +266,47 @@ class CommentListView(generics.ListAPIView):
         else:
             return Comment.objects.none()
         
-        return queryset.order_by('-created_at')
+        return queryset.order_by('-created_at', '-id')
 
 
 class CommentCreateView(generics.CreateAPIView):
-    """Create a new comment with rate limiting and security"""
+    """
+    Accept a new comment with rate limiting and security
+
+    The validated comment is queued and acknowledged with 202; the
+    process_comment_queue task creates it (see core.comment_pipeline).
+    """
     serializer_class = CommentCreateSerializer
     throttle_classes = [AnonRateThrottle, UserRateThrottle]
     
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(
+            {'status': 'queued', 'message': 'Thanks! Your comment will appear once it has been approved.'},
+            status=status.HTTP_202_ACCEPTED
+        )
+    
     def perform_create(self, serializer):
         """Create comment with additional security checks"""
         # Rate limiting check (additional to DRF throttling)
         client_ip = self.get_client_ip()
         cache_key = f"comment_rate_limit:{client_ip}"
         
-        # Check if user has commented recently (max 1 comment per 5 minutes)
-        recent_comments = cache.get(cache_key, 0)
-        if recent_comments >= 1:
+        # Max 1 comment per 5 minutes; add() is atomic in the shared cache so
+        # concurrent requests on different workers cannot both pass
+        if not cache.add(cache_key, 1, 300):
             raise serializers.ValidationError(
                 "You can only submit one comment every 5 minutes. Please wait before submitting another comment."
             )
         
-        # Create the comment
-        comment = serializer.save()
-        
-        # Update rate limiting cache
-        cache.set(cache_key, recent_comments + 1, 300)  # 5 minutes
-        
-        return comment
+        # Queue the comment, releasing the slot if that fails
+        try:
+            return serializer.save(client_ip=client_ip)
+        except Exception:
+            cache.delete(cache_key)
+            raise
     
     def get_client_ip(self):
         """Get client IP address for rate limiting"""
@@ -315,6 +338,10 @@ def api_info(request):
             'newsletter_detail': '/api/newsletters/{slug}/',
             'podcast_episodes': '/api/podcast-episodes/',
             'podcast_detail': '/api/podcast-episodes/{slug}/',
+            'podcast_feed': '/api/podcast/feed.xml',
+            'sitemap': '/api/sitemap.xml',
+            'search': '/api/search/?q={query}',
+            'bundle': '/api/bundle/?include={collections}',
             'email_signup': '/api/email-signup/',
             'health': '/api/health/',
             'media_debug': '/api/media-debug/',
@@ -390,6 +417,102 @@ def unsubscribe(request):
         }, status=400)
 
 
+def newsletter_email_view(request, slug):
+    """
+    Serve the stored browser version of a sent newsletter email
+
+    The compressed HTML is served straight from the cache (or the stored
+    RenderedEmail row) without re-rendering. Newsletters that have not
+    been sent yet redirect to their frontend page.
+    """
+    cache_key = RenderedEmail.cache_key(slug)
+    cached = cache.get(cache_key)
+    
+    if cached is None:
+        rendered = RenderedEmail.objects.filter(
+            newsletter__slug=slug, newsletter__sent_at__isnull=False
+        ).only('version', 'html_gzip').first()
+        if rendered is None:
+            return HttpResponseRedirect(build_frontend_view_url(slug))
+        cached = (rendered.version, bytes(rendered.html_gzip))
+        cache.set(cache_key, cached, settings.RENDERED_EMAIL_CACHE_TIMEOUT)
+    
+    version, html_gzip = cached
+    etag = f'"{version}"'
+    
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = HttpResponse(html_gzip, content_type='text/html; charset=utf-8')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(html_gzip), content_type='text/html; charset=utf-8')
+    
+    response['ETag'] = etag
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, max_age=settings.RENDERED_EMAIL_MAX_AGE)
+    return response
+
+
+def _sitemap_response(response, etag):
+    if etag:
+        response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.SITEMAP_MAX_AGE)
+    return response
+
+
+def _sitemap_etag(cache_key):
+    # No versions (cache unreachable): no ETag that could outlive a change
+    return quote_etag(cache_key.rsplit(':', 1)[1][:32]) if cache_key else None
+
+
+def sitemap_index(request):
+    """Sitemap index pointing at the paged newsletter and podcast sitemaps"""
+    cache_key = sitemaps.sitemap_cache_key(
+        f"index|{request.get_host()}", [model for model, _ in sitemaps.SECTIONS.values()]
+    )
+    etag = _sitemap_etag(cache_key)
+    response = get_conditional_response(request, etag=etag) if etag else None
+    if response is None:
+        content = cache.get(cache_key) if cache_key else None
+        if content is None:
+            content = sitemaps.render_index(request)
+            if cache_key:
+                cache.set(cache_key, content, settings.SITEMAP_CACHE_TIMEOUT)
+        response = HttpResponse(content, content_type=sitemaps.CONTENT_TYPE)
+    return _sitemap_response(response, etag)
+
+
+def sitemap_page(request, section, page):
+    """
+    One page of a section's sitemap
+
+    Served from the cache until the section's content version changes;
+    on a miss the page is streamed row by row and cached once complete.
+    """
+    if section not in sitemaps.SECTIONS or page < 1:
+        raise Http404("Unknown sitemap")
+    model, _ = sitemaps.SECTIONS[section]
+    cache_key = sitemaps.sitemap_cache_key(f"{section}|{page}", [model])
+    etag = _sitemap_etag(cache_key)
+    if etag:
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return _sitemap_response(response, etag)
+
+        content = cache.get(cache_key)
+        if content is not None:
+            return _sitemap_response(HttpResponse(content, content_type=sitemaps.CONTENT_TYPE), etag)
+    if page > 1 and not sitemaps.page_queryset(section, page).exists():
+        raise Http404("Sitemap page out of range")
+    chunks = sitemaps.stream_page(section, page)
+    response = StreamingHttpResponse(
+        sitemaps.cache_stream(chunks, cache_key) if cache_key else chunks,
+        content_type=sitemaps.CONTENT_TYPE
+    )
+    return _sitemap_response(response, etag)
+
+
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def send_test_newsletter(request, newsletter_id):
@@ -423,7 +546,10 @@ def send_test_newsletter(request, newsletter_id):
 @csrf_exempt
 def postmark_webhook(request, token: str):
     """
-    Handle Postmark webhook for bounces and other events
+    Accept Postmark webhook events (bounces, spam complaints, deliveries, opens)
+
+    The raw payload is queued and acknowledged immediately; the
+    process_webhook_events task applies queued events in batches.
     """
     if token != os.environ.get("POSTMARK_WEBHOOK_TOKEN"):
         return HttpResponseForbidden("Invalid token")
@@ -432,29 +558,12 @@ def postmark_webhook(request, token: str):
         return JsonResponse({"ok": True})
 
     try:
-        payload = json.loads(request.body.decode("utf-8"))
-        
-        # Handle bounces
-        if payload.get("RecordType") == "Bounce":
-            email = payload.get("Email")
-            if email:
-                EmailSignup.objects.filter(email__iexact=email).update(
-                    bounce=True, 
-                    is_subscribed=False
-                )
-                print(f"Marked {email} as bounced and unsubscribed")
-        
-        # Handle spam complaints
-        elif payload.get("RecordType") == "SpamComplaint":
-            email = payload.get("Email")
-            if email:
-                EmailSignup.objects.filter(email__iexact=email).update(
-                    is_subscribed=False
-                )
-                print(f"Marked {email} as unsubscribed due to spam complaint")
-        
+        WebhookEvent.objects.create(
+            provider='postmark',
+            payload=request.body.decode("utf-8")
+        )
         return JsonResponse({"ok": True})
         
     except Exception as e:
         print(f"Webhook error: {e}")
-        return JsonResponse({"error": str(e)}, status=500)
\ No newline at end of file
+        return JsonResponse({"error": str(e)}, status=500)
@@ -0,0 +1,210 @@
+import json
+from django.db import transaction
+from django.db.models import Case, When, Value, F, Q, CharField, DateTimeField
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import EmailSignup, EmailLog, WebhookEvent, normalize_email
+
+
+# Maximum number of CASE branches sent in a single UPDATE statement
+UPDATE_CHUNK_SIZE = 500
+
+# Higher values win when several events for one message land in a batch
+STATUS_PRECEDENCE = {'delivered': 0, 'bounced': 1}
+
+
+def _parse_timestamp(value):
+    """Parse a provider timestamp, falling back to the current time"""
+    if value:
+        try:
+            parsed = parse_datetime(value)
+        except ValueError:
+            parsed = None
+        if parsed is not None:
+            return parsed
+    return timezone.now()
+
+
+def _merge_message_event(messages, message_id, status=None, **timestamps):
+    """Fold one provider event into the per-message reconciliation record"""
+    record = messages.setdefault(message_id, {})
+    if status and STATUS_PRECEDENCE[status] > STATUS_PRECEDENCE.get(record.get('status'), -1):
+        record['status'] = status
+    for field_name, value in timestamps.items():
+        current = record.get(field_name)
+        if current is None or value < current:
+            record[field_name] = value
+
+
+def collect_postmark_events(payloads):
+    """
+    Parse and dedupe raw Postmark webhook payloads
+
+    Args:
+        payloads: Iterable of raw JSON strings (or already decoded dicts)
+
+    Returns:
+        Dict with the sets of bounced and complained emails and a
+        reconciliation record per provider message ID
+    """
+    events = {
+        'bounced': set(),
+        'complained': set(),
+        'messages': {},
+    }
+
+    for payload in payloads:
+        if isinstance(payload, (str, bytes)):
+            try:
+                payload = json.loads(payload)
+            except ValueError:
+                continue
+        if not isinstance(payload, dict):
+            continue
+
+        record_type = payload.get("RecordType")
+        message_id = payload.get("MessageID")
+
+        if record_type == "Bounce":
+            email = normalize_email(payload.get("Email"))
+            if email:
+                events['bounced'].add(email)
+            if message_id:
+                _merge_message_event(events['messages'], message_id, status='bounced')
+        elif record_type == "SpamComplaint":
+            email = normalize_email(payload.get("Email"))
+            if email:
+                events['complained'].add(email)
+        elif record_type == "Delivery" and message_id:
+            _merge_message_event(
+                events['messages'], message_id,
+                status='delivered',
+                delivered_at=_parse_timestamp(payload.get("DeliveredAt"))
+            )
+        elif record_type == "Open" and message_id:
+            # An open implies the message was delivered
+            _merge_message_event(
+                events['messages'], message_id,
+                status='delivered',
+                opened_at=_parse_timestamp(payload.get("ReceivedAt"))
+            )
+
+    return events
+
+
+def reconcile_email_logs(messages):
+    """
+    Apply provider delivery status to EmailLog rows in bulk
+
+    Each chunk of messages is applied with a single UPDATE matched on the
+    indexed provider_message_id column. A bounced log is never downgraded
+    to delivered, and delivery/open timestamps are only set once.
+
+    Args:
+        messages: Dict mapping provider message ID to a record with an
+            optional 'status' ('delivered' or 'bounced') and optional
+            'delivered_at'/'opened_at' datetimes
+
+    Returns:
+        Number of EmailLog rows updated
+    """
+    updated = 0
+    items = list(messages.items())
+    for start in range(0, len(items), UPDATE_CHUNK_SIZE):
+        chunk = items[start:start + UPDATE_CHUNK_SIZE]
+
+        status_whens = []
+        timestamp_whens = {'delivered_at': [], 'opened_at': []}
+        for message_id, record in chunk:
+            status = record.get('status')
+            if status == 'bounced':
+                status_whens.append(When(provider_message_id=message_id, then=Value(status)))
+            elif status:
+                status_whens.append(When(
+                    Q(provider_message_id=message_id) & ~Q(status='bounced'),
+                    then=Value(status)
+                ))
+            for field_name, whens in timestamp_whens.items():
+                if record.get(field_name):
+                    whens.append(When(
+                        provider_message_id=message_id,
+                        **{f"{field_name}__isnull": True},
+                        then=Value(record[field_name])
+                    ))
+
+        changes = {}
+        if status_whens:
+            changes['status'] = Case(*status_whens, default=F('status'), output_field=CharField())
+        for field_name, whens in timestamp_whens.items():
+            if whens:
+                changes[field_name] = Case(*whens, default=F(field_name), output_field=DateTimeField())
+        if not changes:
+            continue
+
+        updated += EmailLog.objects.filter(
+            provider_message_id__in=[message_id for message_id, _ in chunk]
+        ).update(**changes)
+    return updated
+
+
+def apply_postmark_events(payloads):
+    """
+    Apply a batch of Postmark webhook payloads with set-based updates
+
+    Args:
+        payloads: Iterable of raw JSON strings (or decoded dicts)
+
+    Returns:
+        Dict with the number of rows touched per event kind
+    """
+    events = collect_postmark_events(payloads)
+    stats = {'bounced': 0, 'complained': 0, 'email_logs': 0}
+
+    if events['bounced']:
+        stats['bounced'] = EmailSignup.objects.filter(
+            email_normalized__in=events['bounced']
+        ).update(bounce=True, is_subscribed=False)
+
+    complained = events['complained'] - events['bounced']
+    if complained:
+        stats['complained'] = EmailSignup.objects.filter(
+            email_normalized__in=complained
+        ).update(is_subscribed=False)
+
+    if events['messages']:
+        stats['email_logs'] = reconcile_email_logs(events['messages'])
+
+    return stats
+
+
+def drain_webhook_events(batch_size=500, provider='postmark'):
+    """
+    Process queued webhook events in batches until the queue is empty
+
+    Args:
+        batch_size: Number of queued events claimed per transaction
+        provider: Provider whose events should be processed
+
+    Returns:
+        Total number of queued events consumed
+    """
+    processed = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                WebhookEvent.objects.select_for_update(skip_locked=True)
+                .filter(provider=provider)
+                .order_by('id')
+                .values_list('id', 'payload')[:batch_size]
+            )
+            if not batch:
+                break
+
+            apply_postmark_events(payload for _, payload in batch)
+            WebhookEvent.objects.filter(id__in=[event_id for event_id, _ in batch]).delete()
+
+        processed += len(batch)
+        if len(batch) < batch_size:
+            break
+
+    return processed
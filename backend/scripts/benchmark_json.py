@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Benchmark JSON rendering of newsletter list/detail payloads
+
+Compares DRF's stdlib JSONRenderer with core.renderers.ORJSONRenderer on
+pages shaped like the real API output (CKEditor HTML content, datetimes,
+nested category and tags). Nothing touches the database.
+
+Usage:
+    python scripts/benchmark_json.py [--items 20] [--content-kb 40] [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+# Add the project directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'thehybridprotocol.settings')
+import django
+django.setup()
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from core.renderers import ORJSONRenderer, orjson
+
+
+PARAGRAPH = (
+    '<p>La <strong>inteligencia artificial</strong> está cambiando cómo trabajamos — '
+    'and how we think about <em>“hybrid”</em> teams. '
+    '<a href="https://example.com/articulo?id=42&amp;ref=newsletter">Leer más</a></p>\n'
+)
+
+
+def build_newsletter(index, content_kb):
+    """Return a dict shaped like NewsletterSerializer output"""
+    content = PARAGRAPH * max(1, (content_kb * 1024) // len(PARAGRAPH))
+    published_at = timezone.now() - timedelta(days=index, microseconds=index * 1234)
+    return {
+        'id': index,
+        'title': f'Newsletter {index}: La semana en tecnología',
+        'slug': f'newsletter-{index}',
+        'subject': 'Weekly digest',
+        'preheader': 'What changed this week',
+        'content': content,
+        'excerpt': PARAGRAPH,
+        'featured_image_url': f'https://example.com/media/newsletter_images/{index}.jpg',
+        'send_key': uuid.uuid4(),
+        'category': {
+            'id': 3,
+            'name_english': 'Technology',
+            'name_spanish': 'Tecnología',
+            'slug': 'technology',
+            'count': 57,
+        },
+        'tags': [
+            {'id': t, 'name_english': f'Tag {t}', 'name_spanish': f'Etiqueta {t}', 'slug': f'tag-{t}'}
+            for t in range(4)
+        ],
+        'available_in_english': True,
+        'available_in_spanish': index % 2 == 0,
+        'published': True,
+        'created_at': published_at - timedelta(hours=3),
+        'updated_at': published_at,
+        'published_at': published_at,
+    }
+
+
+def run(label, renderer, data, repeat):
+    rendered = renderer.render(data)
+    seconds = min(timeit.repeat(lambda: renderer.render(data), number=repeat, repeat=3)) / repeat
+    print(f"  {label:<16} {seconds * 1000:8.3f} ms/render   {len(rendered) / 1024:9.1f} KiB")
+    return rendered, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=20, help='Newsletters per list page')
+    parser.add_argument('--content-kb', type=int, default=40, help='Approximate HTML content size per newsletter')
+    parser.add_argument('--repeat', type=int, default=200, help='Renders per timing run')
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("❌ orjson is not installed; ORJSONRenderer would fall back to the stdlib renderer")
+        return 1
+
+    newsletters = [build_newsletter(i, args.content_kb) for i in range(args.items)]
+    payloads = {
+        'detail': newsletters[0],
+        f'list ({args.items} items)': {
+            'count': 240,
+            'next': '?page=2&page_size=%d' % args.items,
+            'previous': None,
+            'results': newsletters,
+        },
+    }
+
+    for name, data in payloads.items():
+        print(f"🔄 {name}")
+        stdlib_bytes, stdlib_time = run('JSONRenderer', JSONRenderer(), data, args.repeat)
+        orjson_bytes, orjson_time = run('ORJSONRenderer', ORJSONRenderer(), data, args.repeat)
+        identical = '✅ identical output' if stdlib_bytes == orjson_bytes else '❌ output differs'
+        print(f"  speed-up {stdlib_time / orjson_time:5.1f}x   {identical}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
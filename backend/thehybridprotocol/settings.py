@@ -201,12 +201,34 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core.renderers.ORJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
+# Upper bound for page_size on the content list endpoints
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=50, cast=int)
+# How long cursor-mode totals (include_count=true) are cached, in seconds
+API_COUNT_CACHE_TIMEOUT = config('API_COUNT_CACHE_TIMEOUT', default=60, cast=int)
+# Lifetime of cached public API responses; entries are invalidated on content
+# changes via version counters, this only bounds how long stale versions linger
+API_RESPONSE_CACHE_TIMEOUT = config('API_RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+# Related items embedded in detail responses, and how long content changes
+# are batched before they are recomputed in the background
+RELATED_CONTENT_COUNT = config('RELATED_CONTENT_COUNT', default=4, cast=int)
+RELATED_CONTENT_DELAY = config('RELATED_CONTENT_DELAY', default=10, cast=int)
+# Static JSON snapshot of the public API (manage.py export_static_api)
+STATIC_EXPORT_ROOT = config('STATIC_EXPORT_ROOT', default=os.path.join(BASE_DIR, 'static_export'))
+# Re-export automatically when published content changes, at most once per delay window
+STATIC_EXPORT_ON_PUBLISH = config('STATIC_EXPORT_ON_PUBLISH', default=False, cast=bool)
+STATIC_EXPORT_DELAY = config('STATIC_EXPORT_DELAY', default=30, cast=int)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS', 
@@ -336,14 +358,56 @@ else:
     CSRF_COOKIE_SECURE = False
     SESSION_COOKIE_SECURE = False
 
+# Redis (Celery broker, distributed locks)
+REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+
+# Shared cache (DRF throttles, comment rate limit, API response cache).
+# Set CACHE_REDIS_URL to an empty string to use a per-process memory cache.
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default=REDIS_URL)
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache_backends.FailSafeRedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': config('CACHE_KEY_PREFIX', default='thp'),
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'max_connections': config('CACHE_MAX_CONNECTIONS', default=50, cast=int),
+                'socket_connect_timeout': 0.5,
+                'socket_timeout': 0.5,
+                'RETRY_AFTER': 5,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Celery Configuration
-CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=config('REDIS_URL', default='redis://localhost:6379/0'))
-CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default=config('REDIS_URL', default='redis://localhost:6379/0'))
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL)
+CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default=REDIS_URL)
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_ENABLE_UTC = True
+CELERY_BEAT_SCHEDULE = {
+    'process-webhook-events': {
+        'task': 'core.tasks.process_webhook_events',
+        'schedule': config('WEBHOOK_DRAIN_INTERVAL_SEC', default=10.0, cast=float),
+    },
+    'process-comment-queue': {
+        'task': 'core.tasks.process_comment_queue',
+        'schedule': config('COMMENT_DRAIN_INTERVAL_SEC', default=15.0, cast=float),
+    },
+    'dispatch-scheduled-newsletters': {
+        'task': 'core.tasks.dispatch_scheduled_newsletters',
+        'schedule': config('SCHEDULED_SEND_DISPATCH_INTERVAL_SEC', default=60.0, cast=float),
+    },
+}
 
 # Email Configuration
 EMAIL_PROVIDER = config('EMAIL_PROVIDER', default='postmark')
@@ -352,8 +416,36 @@ EMAIL_FROM = config('EMAIL_FROM', default='hello@thehybridprotocol.com')
 PUBLIC_FRONTEND_URL = config('PUBLIC_FRONTEND_URL', default='http://localhost:3000')
 BASE_URL = config('BASE_URL', default='')
 NEWSLETTER_VIEW_PATH = config('NEWSLETTER_VIEW_PATH', default='/newsletter-single')
+RENDERED_EMAIL_MAX_AGE = config('RENDERED_EMAIL_MAX_AGE', default=604800, cast=int)  # browser/CDN cache lifetime
+RENDERED_EMAIL_CACHE_TIMEOUT = config('RENDERED_EMAIL_CACHE_TIMEOUT', default=86400, cast=int)
+
+# Podcast RSS feed (core.podcast_feed)
+PODCAST_VIEW_PATH = config('PODCAST_VIEW_PATH', default='/podcast')
+PODCAST_FEED_TITLE = config('PODCAST_FEED_TITLE', default='The Hybrid Protocol')
+PODCAST_FEED_DESCRIPTION = config('PODCAST_FEED_DESCRIPTION', default='The Hybrid Protocol podcast')
+PODCAST_FEED_AUTHOR = config('PODCAST_FEED_AUTHOR', default='The Hybrid Protocol')
+PODCAST_FEED_OWNER_EMAIL = config('PODCAST_FEED_OWNER_EMAIL', default=EMAIL_FROM)
+PODCAST_FEED_LANGUAGE = config('PODCAST_FEED_LANGUAGE', default='en')
+PODCAST_FEED_CATEGORY = config('PODCAST_FEED_CATEGORY', default='Technology')
+PODCAST_FEED_IMAGE = config('PODCAST_FEED_IMAGE', default='')  # absolute URL or path of the show artwork
+
+# Sitemaps (core.sitemaps); pages are cached until their content changes
+SITEMAP_PAGE_SIZE = config('SITEMAP_PAGE_SIZE', default=10000, cast=int)
+SITEMAP_CACHE_TIMEOUT = config('SITEMAP_CACHE_TIMEOUT', default=86400, cast=int)
+SITEMAP_MAX_AGE = config('SITEMAP_MAX_AGE', default=3600, cast=int)  # browser/CDN cache lifetime
+
+# Media serving in production (core.media); hashed file names are cached for a year
+MEDIA_MAX_AGE = config('MEDIA_MAX_AGE', default=3600, cast=int)
+MEDIA_SERVE_MODE = config('MEDIA_SERVE_MODE', default='')  # '', 'x-accel-redirect' (nginx) or 'x-sendfile'
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')  # nginx internal location
 BATCH_SIZE = config('BATCH_SIZE', default=500, cast=int)
 RATE_SLEEP_SEC = config('RATE_SLEEP_SEC', default=0.5, cast=float)
+SEND_LOCK_TTL_SEC = config('SEND_LOCK_TTL_SEC', default=300, cast=int)  # lease renewed while sending
+SEND_PREWARM_LEAD_SEC = config('SEND_PREWARM_LEAD_SEC', default=300, cast=int)  # pre-warm this long before a scheduled send
+SEND_CACHE_TIMEOUT = config('SEND_CACHE_TIMEOUT', default=86400, cast=int)  # rendered body / unsubscribe URL cache
 POSTMARK_WEBHOOK_TOKEN = config('POSTMARK_WEBHOOK_TOKEN', default='')
+WEBHOOK_BATCH_SIZE = config('WEBHOOK_BATCH_SIZE', default=500, cast=int)
+COMMENT_BATCH_SIZE = config('COMMENT_BATCH_SIZE', default=500, cast=int)
+COMMENT_SPAM_THRESHOLD = config('COMMENT_SPAM_THRESHOLD', default=5, cast=int)  # pending comments scoring this or more are flagged as likely spam
 
 
@@ -18,7 +18,7 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-from django.views.static import serve
+from core.media import serve_media
 from django.views.decorators.cache import never_cache
 
 urlpatterns = [
@@ -33,9 +33,8 @@ if settings.DEBUG:
     # In development, also serve media files the standard way
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 else:
-    # In production, serve media files manually (Railway requirement)
+    # In production, serve media files from the app (Railway requirement)
+    # with cache headers, Range support and optional front-server offload
     urlpatterns += [
-        re_path(r'^media/(?P<path>.*)$', serve, {
-            'document_root': settings.MEDIA_ROOT,
-        }),
+        re_path(r'^media/(?P<path>.*)$', serve_media),
     ]